@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Açılış süresi ölçümü: süreç başlangıcından ilk pencereye kadar geçen süre
+
+Uygulamayı (kaynaktan ya da derlenmiş EXE'den) her tekrarda yeni bir süreçte
+başlatır. Uygulama, TBB_ACILIS_OLCUMU ortam değişkeninde verilen dosyaya
+penceresi ilk göründüğü anı yazıp kapanır (bkz. main.acilis_olcumu_kur).
+--yalnizca-import ekransız ortamlar için yalnızca yorumlayıcı açılışı ile
+main modülünün yüklenmesini ölçer.
+
+    python benchmarks/acilis.py
+    python benchmarks/acilis.py --exe Dagitim\\TBB_Yanit_Sistemi.exe --tekrar 10
+    python benchmarks/acilis.py --yalnizca-import --json acilis.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, KOK)
+
+from suite import istatistik  # noqa: E402
+
+ACILIS_OLCUMU_DEGISKENI = "TBB_ACILIS_OLCUMU"
+
+
+def ilk_pencere_suresi(komut, zaman_asimi):
+    """Komutu başlat; süreç başlangıcından ilk pencereye kadar geçen süreyi (s) döndür"""
+    fd, dosya = tempfile.mkstemp(prefix="tbb_acilis_", suffix=".txt")
+    os.close(fd)
+    try:
+        ortam = dict(os.environ, **{ACILIS_OLCUMU_DEGISKENI: dosya})
+        bas = time.time()
+        subprocess.run(komut, env=ortam, cwd=KOK, timeout=zaman_asimi, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(dosya) as f:
+            icerik = f.read().strip()
+        if not icerik:
+            raise RuntimeError("Uygulama ilk pencere zamanını yazmadı")
+        return float(icerik) - bas
+    finally:
+        os.remove(dosya)
+
+
+def import_suresi(zaman_asimi):
+    """Yeni yorumlayıcıda main modülünü yüklemenin toplam süresi (s)"""
+    bas = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import main"], cwd=KOK, timeout=zaman_asimi, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - bas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--exe", help="Ölçülecek derlenmiş uygulama (verilmezse python main.py)")
+    parser.add_argument("--yalnizca-import", action="store_true",
+                        help="Pencere açmadan yalnızca main modülünün yüklenmesini ölç")
+    parser.add_argument("--tekrar", type=int, default=5)
+    parser.add_argument("--hedef", type=float, default=1.0, help="Hedef süre (s); p50 aşarsa çıkış kodu 1")
+    parser.add_argument("--zaman-asimi", type=float, default=60.0)
+    parser.add_argument("--json", help="Sonuçların yazılacağı JSON dosyası (verilmezse stdout)")
+    args = parser.parse_args(argv)
+
+    if args.yalnizca_import:
+        olcum, olc = "import", lambda: import_suresi(args.zaman_asimi)
+    else:
+        komut = [args.exe] if args.exe else [sys.executable, os.path.join(KOK, "main.py")]
+        olcum, olc = "ilk_pencere", lambda: ilk_pencere_suresi(komut, args.zaman_asimi)
+
+    # İlk çalıştırma soğuk disk / tek dosyalı EXE açma maliyetini ayrıca gösterir
+    ilk = olc()
+    sureler = [olc() for _ in range(args.tekrar)]
+
+    sonuc = {
+        'olcum': olcum,
+        'ilk_calistirma_ms': round(ilk * 1000, 1),
+        'sureler': istatistik(sureler),
+        'hedef_s': args.hedef,
+        'zaman': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'exe': args.exe,
+    }
+    metin = json.dumps(sonuc, ensure_ascii=False, indent=2)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            f.write(metin)
+    else:
+        print(metin)
+
+    p50 = sonuc['sureler']['p50_ms'] / 1000
+    durum = "hedef içinde" if p50 <= args.hedef else "HEDEF AŞILDI"
+    print(f"{olcum}: ilk {ilk * 1000:.0f} ms, p50 {p50 * 1000:.0f} ms, "
+          f"max {sonuc['sureler']['max_ms']:.0f} ms ({durum}, hedef {args.hedef * 1000:.0f} ms)", file=sys.stderr)
+    return 0 if p50 <= args.hedef else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bilgi_cikar mikro ölçümü: önceki çok geçişli sürüm ile derlenmiş desenli sürüm
+
+Gerçek boyutlu (2-6 KB) sentetik yazılar üretir ya da --klasor ile verilen
+klasördeki yazıları okur; iki sürümün ortak alanlarda aynı sonucu
+ürettiğini doğrular ve belge başına gecikmeyi (ortalama / p50 / p95,
+mikrosaniye) yazdırır. Eski sürüm sağlaması geçersiz bir kimlik seçtiyse
+yeni sürümün kimlik alanları, eski sürümün geçersiz adaylar örtülmüş metinde
+bulduğuyla; diğer tüm alanlar eski sonuçla aynı olmalıdır.
+
+    python benchmarks/bilgi_cikar_bench.py
+    python benchmarks/bilgi_cikar_bench.py --klasor gelen/ --tekrar 20
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import motor  # noqa: E402
+from kimlik_dogrulama import tckn_gecerli_mi, vkn_gecerli_mi  # noqa: E402
+from korpus import yazi_metni  # noqa: E402
+
+
+def bilgi_cikar_eski(icerik):
+    """Derlenmiş desenlerden önceki bilgi_cikar (karşılaştırma için birebir kopya)"""
+    bilgiler = {
+        'muhatap_kurum': '', 'muhatap_alt1': '', 'muhatap_alt2': '',
+        'tarih': '', 'sayi': '', 'tckn': '', 'vkn': '', 'adsoyad': ''
+    }
+
+    satirlar = icerik.split('\n')
+
+    kurum_anahtar = ['başkanlığı', 'müdürlüğü', 'dairesi', 'komutanlığı',
+                    'savcılığı', 'mahkemesi', 'kaymakamlığı', 'valiliği',
+                    'defterdarlığı', 'bakanlığı', 'kurumu', 'idaresi']
+
+    kurum_satirlari = []
+    for satir in satirlar[:15]:
+        satir_temiz = satir.strip()
+        if satir_temiz and len(satir_temiz) > 3:
+            if any(k in satir_temiz.lower() for k in kurum_anahtar):
+                kurum_satirlari.append(satir_temiz)
+
+    if len(kurum_satirlari) >= 1:
+        bilgiler['muhatap_kurum'] = kurum_satirlari[0]
+    if len(kurum_satirlari) >= 2:
+        bilgiler['muhatap_alt1'] = kurum_satirlari[1]
+    if len(kurum_satirlari) >= 3:
+        bilgiler['muhatap_alt2'] = kurum_satirlari[2]
+
+    tarih_match = re.search(r'(\d{2}[./]\d{2}[./]\d{4})', icerik)
+    if tarih_match:
+        bilgiler['tarih'] = tarih_match.group(1).replace('/', '.')
+
+    sayi_patterns = [
+        r'[Ss]ayı\s*:\s*([A-Za-z0-9\-\[\]\(\)\s\.\/]+?)(?:\n|$)',
+        r'E-\d+[-\.\d\[\]]+',
+        r'\d{5,}[-\.\d\[\]]+\s*[-–]\s*\d+',
+    ]
+    for pattern in sayi_patterns:
+        sayi_match = re.search(pattern, icerik)
+        if sayi_match:
+            sayi = sayi_match.group(0) if pattern.startswith('E-') or pattern.startswith('\\d') else sayi_match.group(1)
+            if len(sayi.strip()) > 5:
+                bilgiler['sayi'] = sayi.strip()
+                break
+
+    tckn_match = re.search(r'\b(\d{11})\b', icerik)
+    if tckn_match:
+        bilgiler['tckn'] = tckn_match.group(1)
+
+    vkn_matches = re.findall(r'\b(\d{10})\b', icerik)
+    for match in vkn_matches:
+        if match != bilgiler['tckn'][:10] if bilgiler['tckn'] else True:
+            bilgiler['vkn'] = match
+            break
+
+    if bilgiler['tckn']:
+        pattern = rf"{bilgiler['tckn']}\s*(?:T\.?C\.?\s*)?(?:Kimlik\s*)?(?:Numaralı)?\s*([A-ZÇĞİÖŞÜa-zçğıöşü]+\s+[A-ZÇĞİÖŞÜa-zçğıöşü]+)"
+        match = re.search(pattern, icerik)
+        if match:
+            bilgiler['adsoyad'] = match.group(1).strip()
+
+    if not bilgiler['adsoyad']:
+        match = re.search(r'([A-ZÇĞİÖŞÜ][a-zçğıöşü]+\s+[A-ZÇĞİÖŞÜ][A-Za-zçğıöşü]+)(?:\s+adlı|\s+isimli|\'[ıiuü]n)', icerik)
+        if match:
+            bilgiler['adsoyad'] = match.group(1).strip()
+
+    return bilgiler
+
+
+# Kimlik elemesinden etkilenen alanlar (ad soyad birincil TCKN'nin ardından alınır)
+KIMLIK_ALANLARI = ('tckn', 'vkn', 'adsoyad')
+KIMLIK_ADAYI = re.compile(r'\b\d{10,11}\b')
+
+
+def gecersizleri_ort(yazi):
+    """Sağlaması tutmayan kimlik adaylarını aynı uzunlukta harflerle ört (yeni sürümün elemesi)"""
+    def ort(eslesme):
+        kimlik = eslesme.group(0)
+        gecerli = tckn_gecerli_mi(kimlik) if len(kimlik) == 11 else vkn_gecerli_mi(kimlik)
+        return kimlik if gecerli else 'X' * len(kimlik)
+    return KIMLIK_ADAYI.sub(ort, yazi)
+
+
+def olc(islev, yazilar, tekrar):
+    """Belge başına süreleri (mikrosaniye) döndür"""
+    sureler = []
+    for _ in range(tekrar):
+        for yazi in yazilar:
+            bas = time.perf_counter()
+            islev(yazi)
+            sureler.append((time.perf_counter() - bas) * 1e6)
+    sureler.sort()
+    return sureler
+
+
+def ozet(sureler):
+    n = len(sureler)
+    return sum(sureler) / n, sureler[n // 2], sureler[min(n - 1, int(n * 0.95))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--klasor", help="Gerçek yazıların bulunduğu klasör (verilmezse sentetik)")
+    parser.add_argument("--adet", type=int, default=500, help="Sentetik yazı sayısı")
+    parser.add_argument("--tekrar", type=int, default=5)
+    parser.add_argument("--tohum", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if args.klasor:
+        yazilar = [motor.dosya_oku(d) for d in motor.klasor_tara(args.klasor)]
+    else:
+        rng = random.Random(args.tohum)
+        yazilar = [yazi_metni(rng) for _ in range(args.adet)]
+
+    def karsilastir(yazi):
+        """'ayni', 'saglama' (fark yalnızca geçersiz kimliklerin elenmesinden) ya da 'farkli'"""
+        eski, yeni = bilgi_cikar_eski(yazi), motor.bilgi_cikar(yazi)
+        # Yeni sürümün eklediği alanlar (ör. kimlikler) karşılaştırma dışı
+        yeni = {alan: yeni[alan] for alan in eski}
+        if eski == yeni:
+            return 'ayni'
+        suzulmus = bilgi_cikar_eski(gecersizleri_ort(yazi))
+        if dict(eski, **{alan: suzulmus[alan] for alan in KIMLIK_ALANLARI}) == yeni:
+            return 'saglama'
+        return 'farkli'
+
+    sonuclar = [karsilastir(y) for y in yazilar]
+    if 'farkli' in sonuclar:
+        print(f"[HATA] {sonuclar.count('farkli')} yazıda iki sürümün sonuçları farklı", file=sys.stderr)
+        return 1
+
+    ort_boyut = sum(len(y) for y in yazilar) / max(len(yazilar), 1)
+    ek = f" ({sonuclar.count('saglama')} yazıda eski sürümün geçersiz kimliği elendi)" if 'saglama' in sonuclar else ''
+    print(f"{len(yazilar)} yazı (ortalama {ort_boyut / 1024:.1f} KB), {args.tekrar} tekrar; sonuçlar aynı{ek}")
+
+    # Isınma
+    olc(bilgi_cikar_eski, yazilar[:50], 1)
+    olc(motor.bilgi_cikar, yazilar[:50], 1)
+
+    eski = ozet(olc(bilgi_cikar_eski, yazilar, args.tekrar))
+    yeni = ozet(olc(motor.bilgi_cikar, yazilar, args.tekrar))
+    print(f"{'':8}{'ort (µs)':>10}{'p50':>10}{'p95':>10}")
+    print(f"{'önce':8}{eski[0]:10.1f}{eski[1]:10.1f}{eski[2]:10.1f}")
+    print(f"{'sonra':8}{yeni[0]:10.1f}{yeni[1]:10.1f}{yeni[2]:10.1f}")
+    print(f"Hızlanma (ortalama): {eski[0] / yeni[0]:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
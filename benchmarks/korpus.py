@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sentetik TBB yazısı ve müşteri listesi üretici (ölçümler için)
+
+Yazılar bilgi_cikar'ın beklediği biçimdedir: kurum başlıkları, Sayı satırı,
+tarih, TCKN/VKN ve ad soyad. Kimlik numaraları kontrol haneleri geçerli
+üretilir; müşteri listesindeki numaralarla yazılardakiler aynı diziden
+geldiği için istenen oranda eşleşme olur.
+
+    python benchmarks/korpus.py yazilar gelen/ --adet 1000 --bicim txt docx pdf
+    python benchmarks/korpus.py musteri musteriler.csv --satir 1000000
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import motor  # noqa: E402
+
+KURUMLAR = [
+    ["GELİR İDARESİ BAŞKANLIĞI", "Ankara Vergi Dairesi Başkanlığı", "Çankaya Vergi Dairesi Müdürlüğü"],
+    ["T.C. ADALET BAKANLIĞI", "İstanbul Cumhuriyet Başsavcılığı"],
+    ["İzmir 4. İcra Dairesi"],
+    ["Sosyal Güvenlik Kurumu", "Kayseri Sosyal Güvenlik İl Müdürlüğü"],
+    ["Nevşehir Defterdarlığı", "Nevşehir Vergi Dairesi Müdürlüğü"],
+    ["Ankara 12. Asliye Hukuk Mahkemesi"],
+]
+ADLAR = ["Ahmet", "Fatma", "Mehmet", "Ayşe", "Ali", "Zeynep", "Mustafa", "Emine", "Hüseyin", "Elif"]
+SOYADLAR = ["Yılmaz", "Kaya", "Demir", "Çelik", "Öztürk", "Arslan", "Doğan", "Kılıç", "Aydın", "Şahin"]
+DOLGU = ("Yukarıda kimlik bilgileri yazılı kişi adına Bankanız nezdinde bulunan mevduat, "
+         "kredi, kiralık kasa ve her türlü hak ve alacakların tespiti ile haciz şerhi "
+         "konulması hususunda gereğinin yapılması rica olunur.")
+
+
+def tckn_tamamla(ilk9):
+    """9 haneli gövdeye TCKN kontrol hanelerini ekle"""
+    h = [int(c) for c in ilk9]
+    h10 = ((h[0] + h[2] + h[4] + h[6] + h[8]) * 7 - (h[1] + h[3] + h[5] + h[7])) % 10
+    h11 = (sum(h) + h10) % 10
+    return ilk9 + str(h10) + str(h11)
+
+
+def vkn_tamamla(ilk9):
+    """9 haneli gövdeye VKN kontrol hanesini ekle"""
+    toplam = 0
+    for i, c in enumerate(ilk9):
+        t = (int(c) + 9 - i) % 10
+        if t:
+            t = (t * 2 ** (9 - i)) % 9 or 9
+        toplam += t
+    return ilk9 + str((10 - toplam % 10) % 10)
+
+
+def musteri_tckn(i):
+    """i. müşterinin (geçerli) TCKN'si"""
+    return tckn_tamamla(str(100000000 + i * 97 % 900000000))
+
+
+def musteri_vkn(i):
+    """i. müşterinin (geçerli) VKN'si"""
+    return vkn_tamamla(f"{(i * 389) % 1000000000:09d}")
+
+
+def rastgele_ad(rng):
+    return f"{rng.choice(ADLAR)} {rng.choice(SOYADLAR)}"
+
+
+def yazi_metni(rng, musteri_sayisi=0, musteri_orani=0.3, dolgu=(6, 20)):
+    """Tek bir TBB yazısının metnini üret
+
+    musteri_orani olasılıkla kimlik, müşteri listesindeki ilk musteri_sayisi
+    kayıttan seçilir; aksi halde listede olmayan bir numara üretilir.
+    """
+    if musteri_sayisi and rng.random() < musteri_orani:
+        i = rng.randrange(musteri_sayisi)
+    else:
+        i = musteri_sayisi + rng.randrange(10 ** 7)
+
+    satirlar = ["T.C."] + rng.choice(KURUMLAR)
+    satirlar.append(f"Sayı : E-{rng.randint(10 ** 7, 10 ** 8 - 1)}-{rng.randint(100, 999)}.01-{rng.randint(10 ** 5, 10 ** 6)}")
+    satirlar.append(f"Tarih: {rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.2025")
+    satirlar.append("Konu: Bilgi ve belge talebi")
+    satirlar.append("")
+    satirlar.extend([DOLGU] * rng.randint(*dolgu))
+    ad = rastgele_ad(rng)
+    if rng.random() < 0.8:
+        satirlar.append(f"{musteri_tckn(i)} T.C. Kimlik Numaralı {ad} hakkında")
+    else:
+        satirlar.append(f"{musteri_vkn(i)} Vergi Kimlik Numaralı {ad} adlı firma hakkında")
+    satirlar.append(f"Dosya No: {rng.randint(2020, 2025)}/{rng.randint(1, 99999)} Esas, Tel: 0312 {rng.randint(1000000, 9999999)}")
+    satirlar.extend([DOLGU] * rng.randint(dolgu[0] // 2, dolgu[1] // 2))
+    return '\n'.join(satirlar)
+
+
+def txt_yaz(yol, metin):
+    with open(yol, 'w', encoding='utf-8') as f:
+        f.write(metin)
+
+
+def docx_yaz(yol, metin):
+    from docx import Document
+    doc = Document()
+    for satir in metin.split('\n'):
+        doc.add_paragraph(satir)
+    doc.save(yol)
+
+
+def pdf_yaz(yol, metin, ek_sayfa=0):
+    import fitz
+    doc = fitz.open()
+    satirlar = metin.split('\n')
+    # Sayfa başına ~45 satır; uzun satırlar kırpılmadan sarılır
+    for bas in range(0, len(satirlar), 45):
+        sayfa = doc.new_page()
+        sayfa.insert_textbox(fitz.Rect(40, 40, 555, 800), '\n'.join(satirlar[bas:bas + 45]), fontsize=8)
+    for _ in range(ek_sayfa):
+        sayfa = doc.new_page()
+        sayfa.insert_textbox(fitz.Rect(40, 40, 555, 800), (DOLGU + '\n') * 20, fontsize=8)
+    doc.save(yol)
+    doc.close()
+
+
+YAZICILAR = {'txt': txt_yaz, 'docx': docx_yaz, 'pdf': pdf_yaz}
+
+
+def kullanilabilir_bicimler(bicimler):
+    """Gerekli kütüphanesi kurulu olan biçimleri döndür"""
+    sonuc = []
+    for bicim in bicimler:
+        if bicim == 'docx' and not motor.DOCX_AVAILABLE:
+            continue
+        if bicim == 'pdf' and motor.PDF_LIB != 'fitz':
+            continue
+        sonuc.append(bicim)
+    return sonuc
+
+
+def korpus_olustur(klasor, adet, bicimler=('txt', 'docx', 'pdf'), musteri_sayisi=0,
+                   musteri_orani=0.3, tohum=42, pdf_ek_sayfa=0):
+    """Klasöre adet kadar yazı üret; üretilen dosya yollarını döndür"""
+    os.makedirs(klasor, exist_ok=True)
+    rng = random.Random(tohum)
+    bicimler = kullanilabilir_bicimler(bicimler)
+    dosyalar = []
+    for n in range(adet):
+        bicim = bicimler[n % len(bicimler)]
+        yol = os.path.join(klasor, f"yazi_{n:06d}.{bicim}")
+        metin = yazi_metni(rng, musteri_sayisi, musteri_orani)
+        if bicim == 'pdf':
+            pdf_yaz(yol, metin, pdf_ek_sayfa)
+        else:
+            YAZICILAR[bicim](yol, metin)
+        dosyalar.append(yol)
+    return dosyalar
+
+
+def musteri_listesi_olustur(yol, satir, tohum=42, ek_sutun=2):
+    """TCKN, VKN, AD_SOYAD (+ ek sütunlar) içeren müşteri listesi yaz (CSV ya da XLSX)
+
+    XLSX en fazla 1.048.575 satır alabilir; büyük listeler için CSV kullanın.
+    """
+    rng = random.Random(tohum)
+    basliklar = ['TCKN', 'VKN', 'AD_SOYAD'] + [f'EK_{k}' for k in range(ek_sutun)]
+
+    def satirlar():
+        for i in range(satir):
+            yield [musteri_tckn(i), musteri_vkn(i) if i % 3 == 0 else '', rastgele_ad(rng)] + \
+                  [f"M{i:08d}"] * ek_sutun
+
+    if yol.lower().endswith('.csv'):
+        with open(yol, 'w', encoding='utf-8', newline='') as f:
+            yazici = csv.writer(f)
+            yazici.writerow(basliklar)
+            yazici.writerows(satirlar())
+    else:
+        from openpyxl import Workbook
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(basliklar)
+        for s in satirlar():
+            ws.append(s)
+        wb.save(yol)
+    return yol
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    alt = parser.add_subparsers(dest="komut", required=True)
+
+    y = alt.add_parser("yazilar", help="Sentetik yazı klasörü üret")
+    y.add_argument("klasor")
+    y.add_argument("--adet", type=int, default=1000)
+    y.add_argument("--bicim", nargs="+", default=['txt', 'docx', 'pdf'], choices=sorted(YAZICILAR))
+    y.add_argument("--musteri-sayisi", type=int, default=10000,
+                   help="Eşleşme için kullanılan müşteri listesi boyutu")
+    y.add_argument("--musteri-orani", type=float, default=0.3)
+    y.add_argument("--pdf-ek-sayfa", type=int, default=0, help="PDF'lere eklenecek ek sayfa sayısı")
+    y.add_argument("--tohum", type=int, default=42)
+
+    m = alt.add_parser("musteri", help="Sentetik müşteri listesi üret")
+    m.add_argument("yol", help="Çıktı dosyası (.csv ya da .xlsx)")
+    m.add_argument("--satir", type=int, default=10000)
+    m.add_argument("--ek-sutun", type=int, default=2)
+    m.add_argument("--tohum", type=int, default=42)
+
+    args = parser.parse_args(argv)
+    if args.komut == "yazilar":
+        dosyalar = korpus_olustur(args.klasor, args.adet, args.bicim, args.musteri_sayisi,
+                                  args.musteri_orani, args.tohum, args.pdf_ek_sayfa)
+        print(f"{len(dosyalar)} yazı üretildi: {args.klasor}")
+    else:
+        musteri_listesi_olustur(args.yol, args.satir, args.tohum, args.ek_sutun)
+        print(f"{args.satir} satırlık müşteri listesi üretildi: {args.yol}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
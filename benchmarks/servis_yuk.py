@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yerel HTTP servisi (cli.py servis) yük testi: istek/s ve gecikme yüzdelikleri
+
+Sentetik yazı korpusu üretir, --url verilmezse aynı müşteri listesiyle boş
+bir portta servis başlatır ve --eszamanli bağlantıdan toplam --istek istek
+gönderir. --toplu N ile her istek N yazılık /toplu isteği olur. Gecikme
+isteğin gönderilmesinden yanıtın tamamen okunmasına kadar ölçülür.
+
+    python benchmarks/servis_yuk.py --istek 2000 --eszamanli 16
+    python benchmarks/servis_yuk.py --toplu 50 --istek 100 --surec -j 4
+    python benchmarks/servis_yuk.py --url http://127.0.0.1:8765 --json yuk.json
+"""
+
+import argparse
+import base64
+import http.client
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, KOK)
+
+from korpus import korpus_olustur, musteri_listesi_olustur  # noqa: E402
+from suite import istatistik  # noqa: E402
+
+
+def servis_baslat(musteri_yolu, is_sayisi, surec, zaman_asimi=120):
+    """Servisi boş bir portta başlat; (süreç, url) döndür"""
+    komut = [sys.executable, os.path.join(KOK, "cli.py"), "servis", "-m", musteri_yolu, "--port", "0",
+             "-j", str(is_sayisi)]
+    if surec:
+        komut.append("--surec")
+    islem = subprocess.Popen(komut, cwd=KOK, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                             text=True, encoding='utf-8')
+    son = time.monotonic() + zaman_asimi
+    for satir in islem.stdout:
+        if satir.startswith("Dinleniyor: "):
+            url = satir.split()[1]
+            # Sonraki çıktılar boru dolup servisi kilitlemesin diye arka planda okunur
+            threading.Thread(target=lambda: islem.stdout.read(), daemon=True).start()
+            return islem, url
+        if time.monotonic() > son:
+            break
+    islem.kill()
+    raise RuntimeError("Servis başlatılamadı")
+
+
+def govdeler(dosyalar, toplu):
+    """Dosyalardan istek gövdelerini hazırla; [(yol, JSON baytları, yazı sayısı)]"""
+    ogeler = []
+    for dosya in dosyalar:
+        with open(dosya, 'rb') as f:
+            ogeler.append({'ad': os.path.basename(dosya), 'icerik': base64.b64encode(f.read()).decode('ascii')})
+    if not toplu:
+        return [('/yazi', json.dumps(o).encode('utf-8'), 1) for o in ogeler]
+    return [('/toplu', json.dumps({'yazilar': ogeler[i:i + toplu]}).encode('utf-8'), len(ogeler[i:i + toplu]))
+            for i in range(0, len(ogeler), toplu)]
+
+
+def yuk_uygula(url, istekler, adet, eszamanli, sorgu):
+    """adet isteği eszamanli bağlantıdan sırayla gönder; (süreler, durum kodları, yazı sayısı, duvar süresi)"""
+    adres = urlsplit(url)
+    sayac = iter(range(adet))
+    kilit = threading.Lock()
+    sureler, kodlar = [], {}
+    yazi = [0]
+
+    def isci():
+        baglanti = http.client.HTTPConnection(adres.hostname, adres.port, timeout=300)
+        try:
+            while True:
+                with kilit:
+                    i = next(sayac, None)
+                if i is None:
+                    return
+                yol, govde, yazi_sayisi = istekler[i % len(istekler)]
+                bas = time.perf_counter()
+                try:
+                    baglanti.request('POST', yol + sorgu, govde, {'Content-Type': 'application/json'})
+                    yanit = baglanti.getresponse()
+                    yanit.read()
+                    kod = yanit.status
+                except (OSError, http.client.HTTPException):
+                    baglanti.close()
+                    baglanti = http.client.HTTPConnection(adres.hostname, adres.port, timeout=300)
+                    kod = 'baglanti'
+                sure = time.perf_counter() - bas
+                with kilit:
+                    kodlar[kod] = kodlar.get(kod, 0) + 1
+                    if kod == 200:
+                        sureler.append(sure)
+                        yazi[0] += yazi_sayisi
+        finally:
+            baglanti.close()
+
+    bas = time.perf_counter()
+    isciler = [threading.Thread(target=isci) for _ in range(eszamanli)]
+    for t in isciler:
+        t.start()
+    for t in isciler:
+        t.join()
+    return sureler, kodlar, yazi[0], time.perf_counter() - bas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Çalışan servis (verilmezse yerel servis başlatılır)")
+    parser.add_argument("--adet", type=int, default=200, help="Korpustaki yazı sayısı (istekler döngüyle kullanılır)")
+    parser.add_argument("--musteri", type=int, default=10000, help="Müşteri listesi satır sayısı")
+    parser.add_argument("--bicim", nargs="+", default=['txt', 'docx', 'pdf'], choices=['txt', 'docx', 'pdf'])
+    parser.add_argument("--istek", type=int, default=1000, help="Ölçülen toplam istek sayısı")
+    parser.add_argument("--isinma", type=int, default=20, help="Ölçüm öncesi ısınma isteği")
+    parser.add_argument("--eszamanli", type=int, default=8, help="Eşzamanlı bağlantı sayısı")
+    parser.add_argument("--toplu", type=int, default=0, help="İstek başına yazı (0: tek yazılık /yazi)")
+    parser.add_argument("--belgesiz", action="store_true", help="Yanıt belgesi üretme (?belge=0)")
+    parser.add_argument("-j", "--is-sayisi", type=int, default=0, help="Başlatılan servisin işçi sayısı")
+    parser.add_argument("--surec", action="store_true", help="Başlatılan serviste süreç havuzu kullan")
+    parser.add_argument("--tohum", type=int, default=42)
+    parser.add_argument("--json", help="Sonuçların yazılacağı JSON dosyası (verilmezse stdout)")
+    args = parser.parse_args(argv)
+
+    calisma = tempfile.mkdtemp(prefix="tbb_yuk_")
+    servis = None
+    try:
+        print(f"Korpus üretiliyor: {args.adet} yazı, {args.musteri} müşteri...", file=sys.stderr)
+        dosyalar = korpus_olustur(os.path.join(calisma, 'gelen'), args.adet, args.bicim, args.musteri,
+                                  tohum=args.tohum)
+        url = args.url
+        if url is None:
+            musteri_yolu = os.path.join(calisma, 'musteriler.csv')
+            musteri_listesi_olustur(musteri_yolu, args.musteri, args.tohum)
+            servis, url = servis_baslat(musteri_yolu, args.is_sayisi, args.surec)
+            print(f"Servis: {url}", file=sys.stderr)
+
+        istekler = govdeler(dosyalar, args.toplu)
+        sorgu = "?belge=0" if args.belgesiz else ""
+        yuk_uygula(url, istekler, args.isinma, args.eszamanli, sorgu)
+        sureler, kodlar, yazi, duvar = yuk_uygula(url, istekler, args.istek, args.eszamanli, sorgu)
+    finally:
+        if servis is not None:
+            servis.terminate()
+            servis.wait(10)
+        shutil.rmtree(calisma, ignore_errors=True)
+
+    ozet = istatistik(sureler, duvar)
+    sirali = sorted(sureler)
+    if sirali:
+        ozet['p99_ms'] = round(sirali[min(len(sirali) - 1, int(len(sirali) * 0.99))] * 1000, 4)
+    sonuc = {
+        'istek': ozet,
+        'yazi_s': round(yazi / duvar, 2) if duvar > 0 else None,
+        'durum_kodlari': {str(k): v for k, v in kodlar.items()},
+        'zaman': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cekirdek': os.cpu_count(),
+        'parametreler': {k: v for k, v in vars(args).items() if k != 'json'},
+    }
+    metin = json.dumps(sonuc, ensure_ascii=False, indent=2)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            f.write(metin)
+    else:
+        print(metin)
+
+    if sirali:
+        print(f"{ozet['adet']} başarılı istek, {ozet['adet_s']} istek/s, {sonuc['yazi_s']} yazı/s | "
+              f"p50 {ozet['p50_ms']:.1f} ms, p95 {ozet['p95_ms']:.1f} ms, p99 {ozet['p99_ms']:.1f} ms, "
+              f"max {ozet['max_ms']:.1f} ms | durum: {sonuc['durum_kodlari']}", file=sys.stderr)
+    return 0 if kodlar.get(200, 0) == args.istek else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
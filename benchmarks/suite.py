@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TBB Yanıt Sistemi ölçüm takımı
+
+Geçici bir klasörde sentetik yazı korpusu ve müşteri listesi üretir; her
+aşamayı (dosya_oku, bilgi_cikar, musteri_sorgula, belge_olustur, toplu_kaydet,
+rapor_olustur) ayrı ayrı ve uçtan uca ölçer. belge_olustur_docx şablonsuz
+python-docx yolunu karşılaştırma için ölçer. Sonuçlar sürümler arası
+karşılaştırma için JSON olarak yazılır.
+
+    python benchmarks/suite.py --adet 500 --musteri 100000 --json sonuc.json
+    python benchmarks/suite.py --adet 2000 --musteri 5000000 --bicim txt pdf
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import motor  # noqa: E402
+from korpus import korpus_olustur, musteri_listesi_olustur  # noqa: E402
+
+
+def istatistik(sureler, toplam=None):
+    """Süre listesinden (saniye) özet istatistik sözlüğü üret"""
+    sirali = sorted(sureler)
+    n = len(sirali)
+    toplam = sum(sirali) if toplam is None else toplam
+    if not n:
+        return {'adet': 0, 'toplam_s': round(toplam, 4)}
+    return {
+        'adet': n,
+        'toplam_s': round(toplam, 4),
+        'ort_ms': round(sum(sirali) / n * 1000, 4),
+        'p50_ms': round(sirali[n // 2] * 1000, 4),
+        'p95_ms': round(sirali[min(n - 1, int(n * 0.95))] * 1000, 4),
+        'max_ms': round(sirali[-1] * 1000, 4),
+        'adet_s': round(n / toplam, 2) if toplam > 0 else None,
+    }
+
+
+def her_biri(islev, ogeler):
+    """islev'i her öğe için çalıştır; (sonuçlar, süreler) döndür"""
+    sonuclar, sureler = [], []
+    for oge in ogeler:
+        bas = time.perf_counter()
+        sonuclar.append(islev(oge))
+        sureler.append(time.perf_counter() - bas)
+    return sonuclar, sureler
+
+
+def tek_sefer(islev):
+    """islev'i bir kez çalıştır; (sonuç, süre) döndür"""
+    bas = time.perf_counter()
+    sonuc = islev()
+    return sonuc, time.perf_counter() - bas
+
+
+def calistir(args, calisma):
+    girdi = os.path.join(calisma, 'gelen')
+    cikti = os.path.join(calisma, 'yanitlar')
+    os.makedirs(cikti, exist_ok=True)
+    musteri_yolu = os.path.join(calisma, 'musteriler.csv')
+
+    sonuc = {'asamalar': {}}
+    asamalar = sonuc['asamalar']
+
+    print(f"Korpus üretiliyor: {args.adet} yazı, {args.musteri} müşteri...", file=sys.stderr)
+    _, sure = tek_sefer(lambda: korpus_olustur(girdi, args.adet, args.bicim, args.musteri,
+                                               args.musteri_orani, args.tohum, args.pdf_ek_sayfa))
+    sonuc['korpus_uretim_s'] = round(sure, 3)
+    musteri_listesi_olustur(musteri_yolu, args.musteri, args.tohum)
+    dosyalar = motor.klasor_tara(girdi)
+
+    # Müşteri listesi yükleme: ilk açılış indeksi derler, sonrakiler derlenmiş indeksi eşler
+    musteri_listesi, sure = tek_sefer(lambda: motor.musteri_listesi_oku(musteri_yolu))
+    asamalar['musteri_listesi_yukle'] = istatistik([sure])
+    musteri_listesi.kapat()
+    musteri_listesi, sure = tek_sefer(lambda: motor.musteri_listesi_oku(musteri_yolu))
+    asamalar['musteri_listesi_yukle_indeksli'] = istatistik([sure])
+
+    # Dosya okuma, biçim bazında
+    metinler, sureler = her_biri(motor.dosya_oku, dosyalar)
+    asamalar['dosya_oku'] = istatistik(sureler)
+    for bicim in args.bicim:
+        bicim_sureleri = [s for d, s in zip(dosyalar, sureler) if d.endswith('.' + bicim)]
+        if bicim_sureleri:
+            asamalar[f'dosya_oku_{bicim}'] = istatistik(bicim_sureleri)
+
+    bilgiler, sureler = her_biri(motor.bilgi_cikar, metinler)
+    asamalar['bilgi_cikar'] = istatistik(sureler)
+
+    eslesmeler, sureler = her_biri(lambda b: motor.musteri_sorgula(musteri_listesi, b['tckn'], b['vkn']), bilgiler)
+    asamalar['musteri_sorgula'] = istatistik(sureler)
+    _, sure = tek_sefer(lambda: motor.musteri_toplu_sorgula(
+        musteri_listesi, [b['tckn'] for b in bilgiler], [b['vkn'] for b in bilgiler]))
+    asamalar['musteri_toplu_sorgula'] = istatistik([sure / max(len(bilgiler), 1)] * len(bilgiler), sure)
+    sonuc['eslesme_orani'] = round(sum(1 for m, _ in eslesmeler if m) / max(len(eslesmeler), 1), 3)
+
+    sonuclar = [motor.sonuc_olustur(d, b, musteri_listesi) for d, b in zip(dosyalar, bilgiler)]
+    bekleyenler = [s for s in sonuclar if motor.yanit_bekliyor_mu(s)]
+    yanitlar, sureler = her_biri(motor.yanit_olustur, bekleyenler)
+    asamalar['belge_olustur'] = istatistik(sureler)
+
+    # Karşılaştırma: şablonsuz python-docx yolu (belge + kaydetme baytlara)
+    def docx_belgesi(s):
+        b = s['bilgiler']
+        belge = motor.belge_olustur(b['muhatap_kurum'], b['muhatap_alt1'], b['muhatap_alt2'], b['tarih'],
+                                    b['sayi'], b['tckn'], b['vkn'], b['adsoyad'], "Müşterimiz DEĞİL")
+        belge.save(io.BytesIO())
+    _, sureler = her_biri(docx_belgesi, bekleyenler[:200])
+    asamalar['belge_olustur_docx'] = istatistik(sureler)
+
+    _, sure = tek_sefer(lambda: motor.toplu_kaydet(yanitlar, cikti))
+    asamalar['toplu_kaydet'] = istatistik([sure / max(len(yanitlar), 1)] * len(yanitlar), sure)
+    sonuc['yazilan_bayt'] = sum(os.path.getsize(os.path.join(cikti, f)) for f in os.listdir(cikti))
+
+    _, sure = tek_sefer(lambda: motor.rapor_olustur(sonuclar, os.path.join(calisma, 'rapor.xlsx')))
+    asamalar['rapor_olustur'] = istatistik([sure])
+
+    # Uçtan uca: yükleme → analiz → yanıt → kayıt → rapor (önbelleksiz, manifestosuz)
+    shutil.rmtree(cikti)
+    os.makedirs(cikti)
+
+    def uctan_uca():
+        ml = motor.musteri_listesi_oku(musteri_yolu)
+        sonuclar, _ = motor.toplu_analiz(dosyalar, ml, args.is_sayisi)
+        motor.toplu_kaydet(motor.toplu_yanit_olustur(sonuclar), cikti)
+        motor.rapor_olustur(sonuclar, os.path.join(calisma, 'rapor_uctan_uca.xlsx'))
+
+    _, sure = tek_sefer(uctan_uca)
+    asamalar['uctan_uca'] = {
+        'adet': len(dosyalar), 'toplam_s': round(sure, 4),
+        'adet_s': round(len(dosyalar) / sure, 2) if sure > 0 else None,
+    }
+    return sonuc
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--adet", type=int, default=300, help="Yazı sayısı")
+    parser.add_argument("--musteri", type=int, default=10000, help="Müşteri listesi satır sayısı (10k-5M)")
+    parser.add_argument("--musteri-orani", type=float, default=0.3, help="Müşteri olan yazı oranı")
+    parser.add_argument("--bicim", nargs="+", default=['txt', 'docx', 'pdf'], choices=['txt', 'docx', 'pdf'])
+    parser.add_argument("--pdf-ek-sayfa", type=int, default=0)
+    parser.add_argument("-j", "--is-sayisi", type=int, default=1, help="Uçtan uca analizde süreç sayısı")
+    parser.add_argument("--tohum", type=int, default=42)
+    parser.add_argument("--json", help="Sonuçların yazılacağı JSON dosyası (verilmezse stdout)")
+    parser.add_argument("--klasor", help="Korpusun üretileceği çalışma klasörü; ölçümden sonra "
+                        "silinmez (verilmezse geçici klasör kullanılır ve sonunda silinir)")
+    args = parser.parse_args(argv)
+
+    if not motor.PANDAS_AVAILABLE or not motor.DOCX_AVAILABLE:
+        print("[HATA] python-docx ve pandas gerekli", file=sys.stderr)
+        return 2
+
+    calisma = args.klasor or tempfile.mkdtemp(prefix="tbb_olcum_")
+    try:
+        sonuc = calistir(args, calisma)
+    finally:
+        if not args.klasor:
+            shutil.rmtree(calisma, ignore_errors=True)
+
+    sonuc.update({
+        'zaman': datetime.now().isoformat(timespec='seconds'),
+        'cikarici_surumu': motor.CIKARICI_SURUMU,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cekirdek': os.cpu_count(),
+        'pdf_kutuphanesi': motor.PDF_LIB,
+        'parametreler': {k: v for k, v in vars(args).items() if k not in ('json', 'klasor')},
+    })
+
+    metin = json.dumps(sonuc, ensure_ascii=False, indent=2)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            f.write(metin)
+    else:
+        print(metin)
+
+    for ad, a in sonuc['asamalar'].items():
+        ek = f" ort {a['ort_ms']:.2f} ms, p95 {a['p95_ms']:.2f} ms" if 'ort_ms' in a else ''
+        print(f"{ad:30} {a['adet']:>7} adet {a['toplam_s']:>9.3f} s{ek}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,16 @@ echo     Aytemiz Yatirim Bankasi A.S.
 echo ========================================================
 echo.
 
+REM Profil: varsayilan "klasor" (--onedir, hizli acilis); "tekdosya" tek EXE uretir
+REM ama her acilista tum paketi gecici klasore actigi icin birkac saniye gec acilir.
+REM   build.bat            -> Dagitim\TBB_Yanit_Sistemi.exe + _internal klasoru
+REM   build.bat tekdosya   -> Dagitim\TBB_Yanit_Sistemi.exe (tek dosya)
+set PROFIL=klasor
+if /i "%~1"=="tekdosya" set PROFIL=tekdosya
+if "%PROFIL%"=="tekdosya" (set PAKET=--onefile) else (set PAKET=--onedir)
+echo Profil: %PROFIL%
+echo.
+
 python --version >nul 2>&1
 if errorlevel 1 (
     echo [HATA] Python bulunamadi!
@@ -22,20 +32,27 @@ pip install python-docx pandas openpyxl PyMuPDF pyinstaller --quiet --disable-pi
 echo.
 echo [2/4] EXE olusturuluyor (2-3 dakika surebilir)...
 
-python -m PyInstaller --onefile --windowed --name=TBB_Yanit_Sistemi --clean --noconfirm main.py
+REM --noupx: UPX ile sikistirilmis DLL'ler her acilista yeniden acilir
+python -m PyInstaller %PAKET% --windowed --noupx --name=TBB_Yanit_Sistemi --clean --noconfirm main.py
 
 echo.
 echo [3/4] Dagitim klasoru hazirlaniyor...
 
 if not exist "Dagitim" mkdir Dagitim
-copy dist\TBB_Yanit_Sistemi.exe Dagitim\ >nul
+if "%PROFIL%"=="tekdosya" (
+    copy dist\TBB_Yanit_Sistemi.exe Dagitim\ >nul
+) else (
+    xcopy /e /i /y /q dist\TBB_Yanit_Sistemi Dagitim >nul
+)
 if exist musteri_listesi.xlsx copy musteri_listesi.xlsx Dagitim\ >nul
+if exist yanit_sablonu.docx copy yanit_sablonu.docx Dagitim\ >nul
 
 echo TBB Yazi Otomatik Yanitlama Sistemi > Dagitim\KULLANIM.txt
 echo =================================== >> Dagitim\KULLANIM.txt
 echo. >> Dagitim\KULLANIM.txt
 echo KULLANIM: >> Dagitim\KULLANIM.txt
 echo 1. TBB_Yanit_Sistemi.exe dosyasini calistirin >> Dagitim\KULLANIM.txt
+if not "%PROFIL%"=="tekdosya" echo    Kopyalarken _internal klasorunu de birlikte tasiyin >> Dagitim\KULLANIM.txt
 echo 2. Musteri Listesi Yukle ile Excel dosyanizi secin >> Dagitim\KULLANIM.txt
 echo 3. Tekli veya Toplu islem yapin >> Dagitim\KULLANIM.txt
 echo. >> Dagitim\KULLANIM.txt
@@ -53,6 +70,9 @@ echo   TAMAMLANDI!
 echo   Dagitim klasorunu kullanicilara paylasabilirsiniz.
 echo ========================================================
 echo.
+echo Acilis suresi olcumu (ilk pencereye kadar):
+echo   python benchmarks\acilis.py --exe Dagitim\TBB_Yanit_Sistemi.exe
+echo.
 
 explorer Dagitim
 pause
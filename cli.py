@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TBB Yazı Otomatik Yanıtlama Sistemi - Komut Satırı
+Arayüz açmadan toplu işlem (sunucu / zamanlanmış görev kullanımı için)
+
+Örnek:
+    python cli.py toplu gelen/ --musteri musteri_listesi.xlsx --cikti yanitlar/ --rapor rapor.xlsx
+    python cli.py toplu gelen/ --musteri musteri_listesi.xlsx --zip yanitlar.zip
+    python cli.py toplu gelen/ -m musteri_listesi.xlsx -o yanitlar/ --olcum-json olcum.json --profil analiz.prof
+    python cli.py izle gelen/ --musteri musteri_listesi.xlsx --cikti yanitlar/
+    python cli.py servis --musteri musteri_listesi.xlsx --port 8765 -j 4 --surec
+    python cli.py gecmis --tckn 12345678901 --baslangic 01.01.2025 --rapor denetim.xlsx
+
+Çıkış kodları: 0 başarılı, 1 bazı dosyalar işlenemedi, 2 kullanım/ortam hatası
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import motor
+from olcum import AsamaOlcumu
+
+
+def toplu_komutu(args):
+    if not motor.DOCX_AVAILABLE or not motor.PANDAS_AVAILABLE:
+        print("[HATA] python-docx ve pandas gerekli: pip install python-docx pandas openpyxl", file=sys.stderr)
+        return 2
+
+    if not os.path.isdir(args.girdi):
+        print(f"[HATA] Girdi klasörü bulunamadı: {args.girdi}", file=sys.stderr)
+        return 2
+
+    musteri_yolu = args.musteri or motor.musteri_listesi_bul()
+    musteri_listesi = None
+    if musteri_yolu:
+        try:
+            musteri_listesi = motor.musteri_listesi_oku(musteri_yolu)
+        except Exception as e:
+            print(f"[HATA] Müşteri listesi yüklenemedi: {e}", file=sys.stderr)
+            return 2
+        print(f"Müşteri listesi: {musteri_yolu} ({len(musteri_listesi)} kayıt)")
+    else:
+        # Liste olmadan herkes "müşteri değil" sayılır; bu yüzden yanıt üretmeyiz
+        print("[UYARI] Müşteri listesi yok; yanıt oluşturulmayacak", file=sys.stderr)
+
+    dosyalar = motor.klasor_tara(args.girdi)
+    print(f"{len(dosyalar)} dosya bulundu: {args.girdi}")
+
+    onbellek = None
+    if not args.onbellek_yok:
+        onbellek = motor.onbellek_ac(args.onbellek, args.onbellek_boyut * 1024 * 1024)
+        if onbellek is None:
+            print("[UYARI] Çıkarım önbelleği açılamadı; önbelleksiz devam ediliyor", file=sys.stderr)
+        elif args.onbellek_temizle:
+            onbellek.temizle()
+
+    manifest = None
+    if not args.manifest_yok:
+        manifest = motor.manifest_ac(args.girdi)
+        if manifest is None:
+            print("[UYARI] İşlem manifestosu açılamadı; kaldığı yerden devam desteği yok", file=sys.stderr)
+        elif args.bastan:
+            manifest.sifirla()
+
+    gecmis = None
+    if not args.gecmis_yok:
+        gecmis = motor.gecmis_ac(args.gecmis)
+        if gecmis is None:
+            print("[UYARI] Sonuç geçmişi açılamadı; sonuçlar geçmişe yazılmayacak", file=sys.stderr)
+
+    paket = None
+    if args.zip:
+        try:
+            paket = motor.YanitPaketi(args.zip, manifest)
+        except OSError as e:
+            print(f"[HATA] ZIP paketi oluşturulamadı: {e}", file=sys.stderr)
+            return 2
+
+    # Yanıtlar analizle birlikte diske yazılır; bellekte yalnızca sonuç özetleri kalır
+    yanit_hedefi = None
+    if musteri_listesi is not None:
+        if args.cikti:
+            os.makedirs(args.cikti, exist_ok=True)
+            yanit_hedefi = args.cikti
+        else:
+            yanit_hedefi = paket
+
+    olcum = AsamaOlcumu() if args.olcum or args.olcum_json else None
+    is_sayisi = args.is_sayisi or motor.varsayilan_is_sayisi()
+    sonuclar, analiz_hatalari = motor.toplu_analiz(dosyalar, musteri_listesi, is_sayisi, onbellek, manifest,
+                                                   args.pdf_erken_dur, yanit_hedefi, olcum, gecmis)
+    onceki_sayisi = sum(1 for s in sonuclar if s.get('onceki'))
+    for dosya_yolu, hata in analiz_hatalari:
+        print(f"[HATA] {os.path.basename(dosya_yolu)}: {hata}", file=sys.stderr)
+
+    basarili = sum(1 for s in sonuclar if s.get('yanit_durumu') == motor.DURUM_TAMAM)
+    kayit_hatalari = [(s['dosya_adi'], s['yanit_hatasi']) for s in sonuclar
+                      if s.get('yanit_durumu') == motor.DURUM_HATA]
+    yanit_sayisi = basarili + len(kayit_hatalari)
+    for dosya_adi, hata in kayit_hatalari:
+        print(f"[HATA] {dosya_adi} yanıtı kaydedilemedi: {hata}", file=sys.stderr)
+
+    if paket is not None:
+        # Müşteri listesi yoksa paket yalnızca rapor ve manifestoyu taşır
+        try:
+            paket.kapat(sonuclar, analiz_hatalari, olcum)
+        except Exception as e:
+            print(f"[HATA] ZIP paketi yazılamadı: {e}", file=sys.stderr)
+            return 2
+
+    if args.rapor:
+        try:
+            motor.rapor_olustur(sonuclar, args.rapor, olcum)
+        except Exception as e:
+            print(f"[HATA] Rapor oluşturulamadı: {e}", file=sys.stderr)
+            return 2
+
+    musteri_sayisi = sum(1 for s in sonuclar if s['musteri_mi'])
+    inceleme_sayisi = sum(1 for s in sonuclar if motor.kimliksiz_mi(s))
+    print(f"Toplam: {len(sonuclar)} | Müşteri: {musteri_sayisi} | "
+          f"Değil: {len(sonuclar) - musteri_sayisi - inceleme_sayisi} | Manuel inceleme: {inceleme_sayisi} | "
+          f"Hatalı: {len(analiz_hatalari)} | Önceki çalıştırmadan: {onceki_sayisi}")
+    elenen = motor.elenen_aday_sayilari(sonuclar)
+    if elenen['tckn'] or elenen['vkn']:
+        print(f"Sağlaması geçersiz kimlik adayı (elendi): TCKN {elenen['tckn']} | VKN {elenen['vkn']}")
+    if args.cikti or args.zip:
+        print(f"Yanıt: {basarili}/{yanit_sayisi} kaydedildi -> {args.cikti or args.zip}")
+    if args.rapor:
+        print(f"Rapor: {args.rapor}")
+    if onbellek is not None:
+        print(f"Önbellek: {onbellek.isabet} isabet, {onbellek.iskalama} ıskalama")
+        onbellek.kapat()
+    if gecmis is not None:
+        print(f"Geçmiş: {gecmis.yol} ({gecmis.kayit_sayisi()} yazı)")
+        gecmis.kapat()
+    if olcum is not None:
+        olcum_yazdir(olcum)
+        if args.olcum_json:
+            try:
+                olcum.json_yaz(args.olcum_json)
+            except OSError as e:
+                print(f"[HATA] Ölçüm dosyası yazılamadı: {e}", file=sys.stderr)
+                return 2
+            print(f"Ölçüm: {args.olcum_json}")
+
+    return 1 if analiz_hatalari or kayit_hatalari else 0
+
+
+def izle_komutu(args):
+    import izleyici
+
+    if not motor.DOCX_AVAILABLE or not motor.PANDAS_AVAILABLE:
+        print("[HATA] python-docx ve pandas gerekli: pip install python-docx pandas openpyxl", file=sys.stderr)
+        return 2
+
+    if not os.path.isdir(args.girdi):
+        print(f"[HATA] Girdi klasörü bulunamadı: {args.girdi}", file=sys.stderr)
+        return 2
+
+    musteri_yolu = args.musteri or motor.musteri_listesi_bul()
+    if not musteri_yolu:
+        print("[HATA] İzleme modu yanıt ürettiği için müşteri listesi gerekli (--musteri)", file=sys.stderr)
+        return 2
+
+    if not args.yoklama and not izleyici.bildirim_destegi():
+        print("[UYARI] watchdog kurulu değil; klasör yoklanarak izlenecek (pip install watchdog)", file=sys.stderr)
+
+    gecmis = None
+    if not args.gecmis_yok:
+        gecmis = motor.gecmis_ac(args.gecmis)
+        if gecmis is None:
+            print("[UYARI] Sonuç geçmişi açılamadı; sonuçlar geçmişe yazılmayacak", file=sys.stderr)
+
+    try:
+        izleme = izleyici.GelenKutusuIzleyici(
+            args.girdi, args.cikti, musteri_yolu, args.islenen, args.hatali,
+            args.is_sayisi or motor.varsayilan_is_sayisi(), args.pdf_erken_dur,
+            args.aralik, args.durulma, bildirim=not args.yoklama, gecmis=gecmis,
+            kayit=lambda satir: print(satir, flush=True))
+    except ValueError as e:
+        print(f"[HATA] {e}", file=sys.stderr)
+        return 2
+
+    try:
+        izleme.calistir()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"[HATA] İzleme başlatılamadı: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if gecmis is not None:
+            gecmis.kapat()
+    print(f"İzleme durdu. İşlenen: {izleme.islenen_sayisi} | Hatalı: {izleme.hatali_sayisi}")
+    return 0
+
+
+def servis_komutu(args):
+    import servis
+
+    if not motor.DOCX_AVAILABLE or not motor.PANDAS_AVAILABLE:
+        print("[HATA] python-docx ve pandas gerekli: pip install python-docx pandas openpyxl", file=sys.stderr)
+        return 2
+
+    musteri_yolu = args.musteri or motor.musteri_listesi_bul()
+    if not musteri_yolu:
+        print("[HATA] Servis müşteri durumunu döndürdüğü için müşteri listesi gerekli (--musteri)", file=sys.stderr)
+        return 2
+
+    def kayit(satir):
+        print(satir, flush=True)
+
+    try:
+        sunucu = servis.YanitServisi(musteri_yolu, args.adres, args.port, args.is_sayisi, args.surec,
+                                     args.kuyruk, args.ayrintili, kayit)
+    except Exception as e:
+        print(f"[HATA] Servis başlatılamadı: {e}", file=sys.stderr)
+        return 2
+
+    kayit(f"Dinleniyor: http://{args.adres}:{sunucu.server_address[1]} "
+          f"({sunucu.is_sayisi} işçi{', süreç havuzu' if args.surec else ''}, kuyruk {args.kuyruk})")
+    try:
+        sunucu.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sunucu.server_close()
+    print(f"Servis durdu. İşlenen yazı: {sunucu.islenen} | Meşgulden reddedilen istek: {sunucu.reddedilen}")
+    return 0
+
+
+def gecmis_komutu(args):
+    yol = args.gecmis or os.path.join(motor.uygulama_dizini(), motor.GECMIS_DOSYASI)
+    if not os.path.exists(yol):
+        print(f"[HATA] Sonuç geçmişi bulunamadı: {yol}", file=sys.stderr)
+        return 2
+    gecmis = motor.gecmis_ac(yol)
+    if gecmis is None:
+        print(f"[HATA] Sonuç geçmişi açılamadı: {yol}", file=sys.stderr)
+        return 2
+
+    kimlik, tur = args.kimlik, None
+    if args.tckn or args.vkn:
+        kimlik, tur = (args.tckn, 'tckn') if args.tckn else (args.vkn, 'vkn')
+    musteri_mi = True if args.musteri else False if args.musteri_degil else None
+    try:
+        bas = time.perf_counter()
+        sonuclar = gecmis.ara(kimlik, tur, args.sayi, args.kurum, args.baslangic, args.bitis, musteri_mi,
+                              args.yanitlanan, args.sinir)
+        sure = time.perf_counter() - bas
+    except ValueError as e:
+        print(f"[HATA] {e}", file=sys.stderr)
+        return 2
+    finally:
+        gecmis.kapat()
+
+    if not args.sessiz:
+        for s in sonuclar:
+            b = s['bilgiler']
+            kimlikler = ", ".join(k['kimlik'] for k in motor.bilgi_kimlikleri(b))
+            durum = 'müşteri' if s['musteri_mi'] else 'kimlik yok' if motor.kimliksiz_mi(s) else 'müşteri değil'
+            print(f"{b['tarih'] or '-':10} | {b['sayi'] or '-'} | {b['muhatap_kurum'] or '-'} | {kimlikler or '-'} | "
+                  f"{durum} | {motor.rapor_aksiyonu(s)} | {s['dosya_adi']}")
+    print(f"{len(sonuclar)} yazı bulundu ({sure * 1000:.1f} ms)", file=sys.stderr)
+
+    if args.rapor:
+        if not motor.PANDAS_AVAILABLE:
+            print("[HATA] Rapor için pandas gerekli: pip install pandas openpyxl", file=sys.stderr)
+            return 2
+        try:
+            bas = time.perf_counter()
+            motor.rapor_olustur(sonuclar, args.rapor)
+        except Exception as e:
+            print(f"[HATA] Rapor oluşturulamadı: {e}", file=sys.stderr)
+            return 2
+        print(f"Rapor: {args.rapor} ({time.perf_counter() - bas:.2f} s)", file=sys.stderr)
+    return 0
+
+
+def olcum_yazdir(olcum):
+    """Aşama sürelerini ve en yavaş dosyaları stderr'e yaz"""
+    ozet = olcum.ozet()
+    print(f"Aşama süreleri ({ozet['gecen_s']:.2f} s):", file=sys.stderr)
+    for asama, o in ozet['asamalar'].items():
+        print(f"  {asama:<16} {o['adet']:>6} adet  toplam {o['toplam_s']:8.3f} s  p50 {o['p50_ms']:8.2f} ms  "
+              f"p95 {o['p95_ms']:8.2f} ms  max {o['max_ms']:8.2f} ms", file=sys.stderr)
+    print(f"  okunan {ozet['okunan_bayt']} bayt, yazılan {ozet['yazilan_bayt']} bayt", file=sys.stderr)
+    if ozet['en_yavas_dosyalar']:
+        print("En yavaş dosyalar:", file=sys.stderr)
+        for d in ozet['en_yavas_dosyalar']:
+            print(f"  {d['toplam_ms']:10.2f} ms  {os.path.basename(d['dosya'])}", file=sys.stderr)
+
+
+def arguman_ayristirici():
+    parser = argparse.ArgumentParser(prog="tbb-yanit", description="TBB Yazı Otomatik Yanıtlama Sistemi")
+    alt = parser.add_subparsers(dest="komut", required=True)
+
+    toplu = alt.add_parser("toplu", help="Klasördeki yazıları analiz et, yanıtları ve raporu oluştur")
+    toplu.add_argument("girdi", help="TBB yazılarının bulunduğu klasör")
+    toplu.add_argument("-m", "--musteri", help="Müşteri listesi (xlsx/csv); verilmezse uygulama dizininde aranır")
+    hedef = toplu.add_mutually_exclusive_group()
+    hedef.add_argument("-o", "--cikti", help="Yanıtların kaydedileceği klasör")
+    hedef.add_argument("-z", "--zip",
+                       help="Yanıtları, raporu ve manifestoyu tek ZIP dosyasına yaz (ağ paylaşımları için)")
+    toplu.add_argument("-r", "--rapor", help="Excel rapor dosyası")
+    toplu.add_argument("-j", "--is-sayisi", type=int, default=1,
+                       help="Paralel analiz süreç sayısı (varsayılan: 1, 0: tüm çekirdekler)")
+    toplu.add_argument("--pdf-erken-dur", action="store_true",
+                       help="PDF'leri sayfa sayfa oku, zorunlu alanlar bulununca dur (ekli uzun PDF'ler için)")
+    toplu.add_argument("--bastan", action="store_true",
+                       help="Manifestodaki önceki sonuçları yok say, tüm dosyaları yeniden işle")
+    toplu.add_argument("--manifest-yok", action="store_true", help="İşlem manifestosu tutma")
+    toplu.add_argument("--onbellek", help="Çıkarım önbelleği dosyası (varsayılan: uygulama dizini)")
+    toplu.add_argument("--onbellek-boyut", type=int, default=motor.VARSAYILAN_AZAMI_BOYUT // (1024 * 1024),
+                       help="Önbellek boyut sınırı, MB (aşılınca en eski kullanılanlar silinir)")
+    toplu.add_argument("--onbellek-temizle", action="store_true", help="Çalışmadan önce önbelleği boşalt")
+    toplu.add_argument("--onbellek-yok", action="store_true", help="Önbelleği kullanma")
+    toplu.add_argument("--gecmis", help="Sonuç geçmişi veritabanı (varsayılan: uygulama dizini)")
+    toplu.add_argument("--gecmis-yok", action="store_true", help="Sonuçları geçmişe yazma")
+    toplu.add_argument("--olcum", action="store_true",
+                       help="Aşama sürelerini (okuma, çıkarma, sorgu, belge, kayıt) ölç; özet stderr'e, "
+                            "rapora 'Ölçüm' sayfası")
+    toplu.add_argument("--olcum-json", help="Aşama ölçümlerini JSON dosyasına yaz (--olcum'u da açar)")
+    toplu.add_argument("--profil",
+                       help="Çalışmayı cProfile ile profille ve istatistikleri dosyaya yaz "
+                            "(yalnızca ana süreç; -j ile işçi süreçler profillenmez)")
+    toplu.set_defaults(islev=toplu_komutu)
+
+    izle = alt.add_parser("izle", help="Gelen klasörünü sürekli izle; yeni yazıları hemen yanıtla ve taşı")
+    izle.add_argument("girdi", help="İzlenecek gelen klasörü")
+    izle.add_argument("-m", "--musteri", help="Müşteri listesi (xlsx/csv); dosya değişince yeniden yüklenir")
+    izle.add_argument("-o", "--cikti", required=True, help="Yanıtların kaydedileceği klasör")
+    izle.add_argument("--islenen", help="İşlenen yazıların taşınacağı klasör (varsayılan: girdi/islenen)")
+    izle.add_argument("--hatali", help="İşlenemeyen yazıların taşınacağı klasör (varsayılan: girdi/hatali)")
+    izle.add_argument("-j", "--is-sayisi", type=int, default=1,
+                      help="Paralel analiz süreç sayısı (varsayılan: 1, 0: tüm çekirdekler)")
+    izle.add_argument("--pdf-erken-dur", action="store_true",
+                      help="PDF'leri sayfa sayfa oku, zorunlu alanlar bulununca dur")
+    izle.add_argument("--aralik", type=float, default=2.0, help="Yoklama aralığı, saniye (varsayılan: 2)")
+    izle.add_argument("--durulma", type=float, default=2.0,
+                      help="Dosya bu kadar saniye değişmeden kalınca işlenir (yazılmakta olanlar beklenir)")
+    izle.add_argument("--yoklama", action="store_true",
+                      help="İşletim sistemi bildirimleri yerine klasörü yoklayarak izle (ağ paylaşımları için)")
+    izle.add_argument("--gecmis", help="Sonuç geçmişi veritabanı (varsayılan: uygulama dizini)")
+    izle.add_argument("--gecmis-yok", action="store_true", help="Sonuçları geçmişe yazma")
+    izle.set_defaults(islev=izle_komutu)
+
+    srv = alt.add_parser("servis", help="Yazı analizi ve yanıt üretimi için yerel HTTP/JSON servisi başlat")
+    srv.add_argument("-m", "--musteri", help="Müşteri listesi (xlsx/csv); dosya değişince yeniden yüklenir")
+    srv.add_argument("--adres", default="127.0.0.1",
+                     help="Dinlenecek adres (varsayılan: 127.0.0.1, yalnızca bu bilgisayar)")
+    srv.add_argument("-p", "--port", type=int, default=8765, help="Port (varsayılan: 8765, 0: boş port)")
+    srv.add_argument("-j", "--is-sayisi", type=int, default=0,
+                     help="Aynı anda işlenen en fazla istek (varsayılan: 0, tüm çekirdekler)")
+    srv.add_argument("--surec", action="store_true",
+                     help="Dosya okuma ve çıkarmayı işçi süreçlerde yap (çok çekirdekte daha yüksek hacim)")
+    srv.add_argument("--kuyruk", type=int, default=64,
+                     help="İşçiler doluyken sıra bekleyebilecek istek sayısı; fazlasına 503 döner")
+    srv.add_argument("--ayrintili", action="store_true", help="Her isteği logla")
+    srv.set_defaults(islev=servis_komutu)
+
+    gec = alt.add_parser("gecmis", help="Geçmişte analiz edilen / yanıtlanan yazıları ara, rapor al")
+    kimlik = gec.add_mutually_exclusive_group()
+    kimlik.add_argument("--kimlik", help="TCKN ya da VKN (yazıdaki tüm kimliklerde aranır)")
+    kimlik.add_argument("--tckn", help="Yalnızca TCKN olarak ara")
+    kimlik.add_argument("--vkn", help="Yalnızca VKN olarak ara")
+    gec.add_argument("--sayi", help="Yazının sayısı (tam eşleşme)")
+    gec.add_argument("--kurum", help="Muhatap kurum adında geçen metin (büyük/küçük harf duyarsız)")
+    gec.add_argument("--baslangic", help="Yazı tarihi en erken (gg.aa.yyyy ya da yyyy-aa-gg)")
+    gec.add_argument("--bitis", help="Yazı tarihi en geç (gg.aa.yyyy ya da yyyy-aa-gg)")
+    durum = gec.add_mutually_exclusive_group()
+    durum.add_argument("--musteri", action="store_true", help="Yalnızca müşteri çıkanlar")
+    durum.add_argument("--musteri-degil", action="store_true", help="Yalnızca müşteri olmayanlar")
+    gec.add_argument("--yanitlanan", action="store_true", help="Yalnızca otomatik yanıtı kaydedilenler")
+    gec.add_argument("--sinir", type=int, help="En fazla bu kadar yazı (en yeniler)")
+    gec.add_argument("-r", "--rapor", help="Bulunanları Excel raporu olarak kaydet")
+    gec.add_argument("-q", "--sessiz", action="store_true", help="Bulunanları listeleme")
+    gec.add_argument("--gecmis", help="Sonuç geçmişi veritabanı (varsayılan: uygulama dizini)")
+    gec.set_defaults(islev=gecmis_komutu)
+
+    return parser
+
+
+def main(argv=None):
+    args = arguman_ayristirici().parse_args(argv)
+    if getattr(args, 'profil', None):
+        import cProfile
+
+        profil = cProfile.Profile()
+        try:
+            return profil.runcall(args.islev, args)
+        finally:
+            profil.dump_stats(args.profil)
+            print(f"Profil: {args.profil} (python -m pstats {args.profil})", file=sys.stderr)
+    return args.islev(args)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TBB Yazı Otomatik Yanıtlama Sistemi - Sonuç Geçmişi
+Tüm analiz sonuçlarının ve yanıtların kalıcı, sorgulanabilir kaydı (SQLite)
+
+Her yazı (dosya yolu, sayı, tarih) ile tek satırdır; aynı yazı yeniden
+analiz edilirse satır güncellenir, önceden kaydedilmiş yanıt bilgisi korunur.
+Yazıdaki her kimlik ayrı tabloda tutulur; böylece çok kimlikli yazılar da
+kimliğe göre bulunur. Kimlik, sayı, kurum, yazı tarihi ve işlem zamanı
+indekslidir. Kayıtlar GECMIS_PARTI satırlık işlemlerle yazılır.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from kimlik_dogrulama import GECERSIZ
+
+GECMIS_PARTI = 500
+
+
+def tarih_iso(tarih):
+    """'gg.aa.yyyy' ya da 'yyyy-aa-gg' tarihini 'yyyy-aa-gg' yap; geçersizse ''"""
+    tarih = (tarih or '').strip().replace('/', '.')
+    if len(tarih) == 10 and tarih[2] == '.' and tarih[5] == '.':
+        gun, ay, yil = tarih.split('.')
+    elif len(tarih) == 10 and tarih[4] == '-' and tarih[7] == '-':
+        yil, ay, gun = tarih.split('-')
+    else:
+        return ''
+    if not (yil.isdigit() and ay.isdigit() and gun.isdigit()) or not (1 <= int(ay) <= 12 and 1 <= int(gun) <= 31):
+        return ''
+    return f"{yil}-{ay}-{gun}"
+
+
+def kurum_anahtari(kurum):
+    """Kurum adını aramaya uygun biçime getir (Türkçe küçük harf, tek boşluk)"""
+    return ' '.join((kurum or '').replace('İ', 'i').replace('I', 'ı').lower().split())
+
+
+class SonucDeposu:
+    """Analiz sonuçları ve yanıt durumları için geçmiş veritabanı"""
+
+    def __init__(self, yol):
+        self.yol = yol
+        self.kilit = threading.Lock()
+        self.baglanti = sqlite3.connect(yol, check_same_thread=False)
+        self.baglanti.row_factory = sqlite3.Row
+        # WAL: analiz yazarken geçmiş araması (ör. ikinci bir süreçten) beklemez
+        self.baglanti.execute("PRAGMA journal_mode=WAL")
+        self.baglanti.execute("PRAGMA synchronous=NORMAL")
+        with self.baglanti:
+            self.baglanti.execute(
+                "CREATE TABLE IF NOT EXISTS yazi ("
+                " id INTEGER PRIMARY KEY, dosya TEXT NOT NULL, dosya_adi TEXT NOT NULL,"
+                " tarih TEXT NOT NULL, tarih_iso TEXT NOT NULL, sayi TEXT NOT NULL,"
+                " kurum TEXT NOT NULL, kurum_anahtar TEXT NOT NULL, tckn TEXT NOT NULL, vkn TEXT NOT NULL,"
+                " adsoyad TEXT NOT NULL, musteri_mi INTEGER, bilgiler TEXT NOT NULL, kimlik_durumlari TEXT,"
+                " yanit_durumu TEXT, cikti TEXT, yanit_hatasi TEXT,"
+                " ilk_islem REAL NOT NULL, son_islem REAL NOT NULL,"
+                " UNIQUE (dosya, sayi, tarih))"
+            )
+            self.baglanti.execute(
+                "CREATE TABLE IF NOT EXISTS kimlik ("
+                " yazi_id INTEGER NOT NULL REFERENCES yazi (id),"
+                " tur TEXT NOT NULL, kimlik TEXT NOT NULL, adsoyad TEXT NOT NULL, musteri_mi INTEGER,"
+                " PRIMARY KEY (yazi_id, tur, kimlik))"
+            )
+            for ad, tanim in (('ix_kimlik_kimlik', 'kimlik (kimlik, tur)'),
+                              ('ix_yazi_tckn', 'yazi (tckn)'),
+                              ('ix_yazi_vkn', 'yazi (vkn)'),
+                              ('ix_yazi_sayi', 'yazi (sayi)'),
+                              ('ix_yazi_kurum', 'yazi (kurum_anahtar)'),
+                              ('ix_yazi_tarih', 'yazi (tarih_iso)'),
+                              ('ix_yazi_islem', 'yazi (son_islem)')):
+                self.baglanti.execute(f"CREATE INDEX IF NOT EXISTS {ad} ON {tanim}")
+
+    def kaydet(self, sonuclar):
+        """Sonuçları (analiz sonucu sözlükleri) ekle ya da güncelle; yazılan satır sayısını döndür"""
+        sonuclar = list(sonuclar)
+        zaman = time.time()
+        with self.kilit:
+            for i in range(0, len(sonuclar), GECMIS_PARTI):
+                with self.baglanti:
+                    for sonuc in sonuclar[i:i + GECMIS_PARTI]:
+                        self._yaz(sonuc, zaman)
+        return len(sonuclar)
+
+    def _yaz(self, sonuc, zaman):
+        b = sonuc['bilgiler']
+        musteri_mi = None if sonuc['musteri_mi'] is None else int(bool(sonuc['musteri_mi']))
+        kimlikler = sonuc.get('kimlik_durumlari')
+        self.baglanti.execute(
+            "INSERT INTO yazi (dosya, dosya_adi, tarih, tarih_iso, sayi, kurum, kurum_anahtar, tckn, vkn,"
+            " adsoyad, musteri_mi, bilgiler, kimlik_durumlari, yanit_durumu, cikti, yanit_hatasi,"
+            " ilk_islem, son_islem)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (dosya, sayi, tarih) DO UPDATE SET"
+            " dosya_adi = excluded.dosya_adi, kurum = excluded.kurum, kurum_anahtar = excluded.kurum_anahtar,"
+            " tckn = excluded.tckn, vkn = excluded.vkn, adsoyad = excluded.adsoyad,"
+            " musteri_mi = excluded.musteri_mi, bilgiler = excluded.bilgiler,"
+            " kimlik_durumlari = excluded.kimlik_durumlari,"
+            # Yeniden analizde (yanıt alanları boş) önceki yanıt bilgisi korunur
+            " yanit_durumu = COALESCE(excluded.yanit_durumu, yazi.yanit_durumu),"
+            " cikti = COALESCE(excluded.cikti, yazi.cikti),"
+            " yanit_hatasi = CASE WHEN excluded.yanit_durumu IS NULL THEN yazi.yanit_hatasi"
+            "                     ELSE excluded.yanit_hatasi END,"
+            " son_islem = excluded.son_islem",
+            (sonuc['dosya'], sonuc['dosya_adi'], b['tarih'], tarih_iso(b['tarih']), b['sayi'],
+             b['muhatap_kurum'], kurum_anahtari(b['muhatap_kurum']), b['tckn'], b['vkn'], b['adsoyad'],
+             musteri_mi, json.dumps(b, ensure_ascii=False),
+             json.dumps(kimlikler, ensure_ascii=False) if kimlikler is not None else None,
+             sonuc.get('yanit_durumu'), sonuc.get('cikti'), sonuc.get('yanit_hatasi'), zaman, zaman)
+        )
+        yazi_id = self.baglanti.execute(
+            "SELECT id FROM yazi WHERE dosya = ? AND sayi = ? AND tarih = ?",
+            (sonuc['dosya'], b['sayi'], b['tarih'])
+        ).fetchone()[0]
+        self.baglanti.execute("DELETE FROM kimlik WHERE yazi_id = ?", (yazi_id,))
+        kimlikler = kimlikler or b.get('kimlikler') or \
+            [{'tur': tur, 'kimlik': b[tur], 'adsoyad': b['adsoyad'] if tur == 'tckn' else ''}
+             for tur in ('tckn', 'vkn') if b[tur]]
+        self.baglanti.executemany(
+            "INSERT OR REPLACE INTO kimlik VALUES (?, ?, ?, ?, ?)",
+            [(yazi_id, k['tur'], k['kimlik'], k['adsoyad'],
+              None if k.get('musteri_mi') in (None, GECERSIZ) else int(bool(k['musteri_mi']))) for k in kimlikler]
+        )
+
+    def ara(self, kimlik=None, tur=None, sayi=None, kurum=None, baslangic=None, bitis=None, musteri_mi=None,
+            yanitlanan=None, sinir=None):
+        """Geçmişte filtrelere uyan yazıları yeniden eskiye (yazı tarihi) analiz sonucu olarak döndür
+
+        kimlik: TCKN / VKN (tur ile yalnızca 'tckn' ya da 'vkn'), yazıdaki tüm
+        kimliklerde aranır. kurum: kurum adında geçen metin. baslangic / bitis:
+        yazı tarihi aralığı ('gg.aa.yyyy' ya da 'yyyy-aa-gg'). yanitlanan: True
+        ise yalnızca otomatik yanıtı kaydedilmiş yazılar. Dönen sözlükler
+        rapor_olustur'a doğrudan verilebilir; 'ilk_islem' / 'son_islem' eklidir.
+        """
+        kosullar, parametreler = [], []
+        if kimlik:
+            alt = "SELECT yazi_id FROM kimlik WHERE kimlik = ?"
+            parametreler.append(kimlik)
+            if tur:
+                alt += " AND tur = ?"
+                parametreler.append(tur)
+            kosullar.append(f"id IN ({alt})")
+        if sayi:
+            kosullar.append("sayi = ?")
+            parametreler.append(sayi.strip())
+        if kurum:
+            # Alt sorgu yalnızca kurum indeksini tarar (tablonun tamamını değil)
+            kosullar.append("id IN (SELECT id FROM yazi WHERE instr(kurum_anahtar, ?) > 0)")
+            parametreler.append(kurum_anahtari(kurum))
+        for deger, islec in ((baslangic, '>='), (bitis, '<=')):
+            if deger:
+                iso = tarih_iso(deger)
+                if not iso:
+                    raise ValueError(f"Geçersiz tarih: {deger} (gg.aa.yyyy ya da yyyy-aa-gg)")
+                kosullar.append(f"tarih_iso != '' AND tarih_iso {islec} ?")
+                parametreler.append(iso)
+        if musteri_mi is not None:
+            kosullar.append("musteri_mi = ?")
+            parametreler.append(int(bool(musteri_mi)))
+        if yanitlanan:
+            kosullar.append("cikti IS NOT NULL AND yanit_durumu = 'tamam'")
+
+        sorgu = "SELECT * FROM yazi"
+        if kosullar:
+            sorgu += " WHERE " + " AND ".join(kosullar)
+        sorgu += " ORDER BY tarih_iso DESC, son_islem DESC"
+        if sinir:
+            sorgu += " LIMIT ?"
+            parametreler.append(int(sinir))
+
+        with self.kilit:
+            satirlar = self.baglanti.execute(sorgu, parametreler).fetchall()
+        return [self._sonuc(satir) for satir in satirlar]
+
+    @staticmethod
+    def _sonuc(satir):
+        """Veritabanı satırını analiz sonucu sözlüğüne çevir"""
+        sonuc = {
+            'dosya': satir['dosya'],
+            'dosya_adi': satir['dosya_adi'],
+            'bilgiler': json.loads(satir['bilgiler']),
+            'musteri_mi': None if satir['musteri_mi'] is None else bool(satir['musteri_mi']),
+            'ilk_islem': satir['ilk_islem'],
+            'son_islem': satir['son_islem'],
+        }
+        if satir['kimlik_durumlari'] is not None:
+            sonuc['kimlik_durumlari'] = json.loads(satir['kimlik_durumlari'])
+        if satir['yanit_durumu'] is not None:
+            sonuc.update(yanit_durumu=satir['yanit_durumu'], cikti=satir['cikti'],
+                         yanit_hatasi=satir['yanit_hatasi'])
+        return sonuc
+
+    def kayit_sayisi(self):
+        with self.kilit:
+            return self.baglanti.execute("SELECT COUNT(*) FROM yazi").fetchone()[0]
+
+    def kapat(self):
+        with self.kilit:
+            self.baglanti.close()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TBB Yazı Otomatik Yanıtlama Sistemi - Gelen Kutusu İzleyici
+Gelen klasörüne düşen yazıları sürekli işleyen izleme modu (bkz. cli.py izle)
+
+Yeni dosyalar watchdog kuruluysa işletim sistemi bildirimleriyle (Linux'ta
+inotify, Windows'ta ReadDirectoryChangesW), değilse klasör aralıklarla
+yoklanarak bulunur. Bildirim kaçırılmasına karşı (ağ paylaşımları) klasör
+bildirimli modda da ara sıra baştan taranır.
+
+Boyutu ve değişiklik zamanı durulma süresi boyunca değişmeyen ve okumaya
+açılabilen dosyalar hazır sayılır; kopyalanmakta olan dosyalar yarım okunmaz.
+Hazır dosyalar birlikte analiz edilir, müşteri olmayanların yanıtı yazılır ve
+her dosya sonucuna göre islenen/ ya da hatali/ klasörüne taşınır. Kimlik
+çıkarılamayan yazılar yanıtlanmadan hatali/ klasörüne gider.
+"""
+
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+import motor
+
+ISLENEN_KLASORU = "islenen"
+HATALI_KLASORU = "hatali"
+YOKLAMA_ARALIGI = 2.0
+DURULMA_SURESI = 2.0
+# Bildirimli modda da klasör bu aralıkla baştan taranır
+TAM_TARAMA_ARALIGI = 60.0
+
+
+def bildirim_destegi():
+    """İşletim sistemi dosya bildirimleri (watchdog) kullanılabilir mi"""
+    return motor.kurulu_mu('watchdog')
+
+
+def benzersiz_yol(klasor, ad):
+    """Klasörde olmayan bir yol üret (varsa ada _1, _2, ... eklenir)"""
+    kok, uzanti = os.path.splitext(ad)
+    yol = os.path.join(klasor, ad)
+    sira = 1
+    while os.path.exists(yol):
+        yol = os.path.join(klasor, f"{kok}_{sira}{uzanti}")
+        sira += 1
+    return yol
+
+
+def okunabilir_mi(dosya_yolu):
+    """Dosya okumaya açılabiliyor mu (Windows'ta kopyalanan dosya kilitlidir)"""
+    try:
+        with open(dosya_yolu, 'rb'):
+            return True
+    except OSError:
+        return False
+
+
+def kimliksizleri_ayir(analiz):
+    """Kimlik çıkarılamayan (okunamayan ya da beklenmeyen biçimdeki) yazıları hataya çevir
+
+    Gözetimsiz çalışırken bunlara "müşterimiz değil" yanıtı yazılmaz; hatali/
+    klasöründe elle bakılmayı bekler.
+    """
+    try:
+        for dosya_yolu, sonuc, hata in analiz:
+            if hata is None and not motor.bilgi_kimlikleri(sonuc['bilgiler']):
+                sonuc, hata = None, "TCKN/VKN bulunamadı (okunamayan ya da beklenmeyen biçimde yazı)"
+            yield dosya_yolu, sonuc, hata
+    finally:
+        analiz.close()
+
+
+class _Bildirimler:
+    """watchdog gözlemcisi: klasörde değişen yolları biriktirir ve bekleyeni uyandırır"""
+
+    def __init__(self, klasor, uyandir):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        self.kilit = threading.Lock()
+        self.degisenler = set()
+        bildirimler = self
+
+        class Isleyici(FileSystemEventHandler):
+            def on_any_event(self, olay):
+                if olay.is_directory:
+                    return
+                # Taşıma / yeniden adlandırmada yeni ad dest_path'tedir
+                yol = getattr(olay, 'dest_path', None) or olay.src_path
+                with bildirimler.kilit:
+                    bildirimler.degisenler.add(os.fsdecode(yol))
+                uyandir.set()
+
+        self.gozlemci = Observer()
+        self.gozlemci.schedule(Isleyici(), klasor, recursive=False)
+        self.gozlemci.start()
+
+    def al(self):
+        """Son çağrıdan beri değişen yolları döndür"""
+        with self.kilit:
+            degisenler, self.degisenler = self.degisenler, set()
+        return degisenler
+
+    def kapat(self):
+        self.gozlemci.stop()
+        self.gozlemci.join()
+
+
+class GelenKutusuIzleyici:
+    """Gelen klasörünü izleyip yeni yazıları analiz eden, yanıtlayan ve taşıyan döngü
+
+    Yanıt üretildiği için müşteri listesi zorunludur; liste dosyası değişirse
+    sonraki toplu işlemden önce yeniden yüklenir. gecmis (gecmis.SonucDeposu)
+    verilirse her toplu işlemin sonuçları oraya yazılır. kayit: log satırı yazan işlev.
+    """
+
+    def __init__(self, klasor, cikti, musteri_yolu, islenen=None, hatali=None, is_sayisi=1, erken_dur=False,
+                 aralik=YOKLAMA_ARALIGI, durulma=DURULMA_SURESI, bildirim=True, gecmis=None, kayit=print):
+        self.klasor = os.path.abspath(klasor)
+        self.cikti = cikti
+        self.islenen = islenen or os.path.join(self.klasor, ISLENEN_KLASORU)
+        self.hatali = hatali or os.path.join(self.klasor, HATALI_KLASORU)
+        self.is_sayisi = is_sayisi
+        self.erken_dur = erken_dur
+        self.aralik = aralik
+        self.durulma = durulma
+        self.bildirim = bildirim and bildirim_destegi()
+        self.gecmis = gecmis
+        self.kayit = kayit
+
+        if os.path.realpath(cikti) == os.path.realpath(self.klasor):
+            # Yanıtlar .docx olduğundan yeni gelen yazı sanılırdı
+            raise ValueError("Yanıt klasörü gelen klasörüyle aynı olamaz")
+
+        self.musteri = motor.MusteriListesiTakibi(musteri_yolu, kayit)
+        self.adaylar = {}        # yol -> [boyut, mtime, ilk görülme, son değişim]
+        self.tasinamayanlar = {}  # yol -> hedef klasör (işlendi ama taşınamadı)
+        self.islenen_sayisi = 0
+        self.hatali_sayisi = 0
+        self.durdur_olayi = threading.Event()
+        self.uyandir = threading.Event()
+
+    def aday_ekle(self, dosya_yolu):
+        """Gelen klasöründeki desteklenen dosyayı izlemeye al"""
+        dosya_yolu = os.path.abspath(dosya_yolu)
+        if dosya_yolu in self.adaylar or dosya_yolu in self.tasinamayanlar:
+            return
+        if os.path.dirname(dosya_yolu) != self.klasor:
+            return
+        ad = os.path.basename(dosya_yolu)
+        if ad.startswith(('.', '~$')) or os.path.splitext(ad)[1].lower() not in motor.DESTEKLENEN_UZANTILAR:
+            return
+        simdi = time.monotonic()
+        self.adaylar[dosya_yolu] = [None, None, simdi, simdi]
+
+    def hazir_dosyalar(self):
+        """Durulma süresi boyunca değişmemiş adayları izlemeden çıkar
+
+        (geliş sırasına göre dosyalar, dosya -> ilk görülme zamanı) döndürür.
+        """
+        simdi = time.monotonic()
+        hazirlar = []
+        for dosya_yolu, durum in list(self.adaylar.items()):
+            try:
+                st = os.stat(dosya_yolu)
+            except OSError:
+                # Silindi ya da başka yere taşındı
+                del self.adaylar[dosya_yolu]
+                continue
+            if (st.st_size, st.st_mtime_ns) != (durum[0], durum[1]):
+                durum[0], durum[1], durum[3] = st.st_size, st.st_mtime_ns, simdi
+            elif simdi - durum[3] >= self.durulma and okunabilir_mi(dosya_yolu):
+                hazirlar.append(dosya_yolu)
+        gelis = {d: self.adaylar.pop(d)[2] for d in hazirlar}
+        return sorted(hazirlar, key=gelis.get), gelis
+
+    def tasi(self, dosya_yolu, hedef_klasor):
+        """Dosyayı hedef klasöre taşı; taşınamazsa sonraki turda yeniden denenmek üzere kaydet"""
+        try:
+            os.makedirs(hedef_klasor, exist_ok=True)
+            yeni = benzersiz_yol(hedef_klasor, os.path.basename(dosya_yolu))
+            shutil.move(dosya_yolu, yeni)
+        except OSError as e:
+            if dosya_yolu not in self.tasinamayanlar:
+                self.kayit(f"[UYARI] {os.path.basename(dosya_yolu)} taşınamadı: {e}")
+            self.tasinamayanlar[dosya_yolu] = hedef_klasor
+            return None
+        self.tasinamayanlar.pop(dosya_yolu, None)
+        return yeni
+
+    def isle(self, dosyalar, gelis):
+        """Hazır dosyaları analiz et, yanıtla ve sonuca göre taşı"""
+        analiz = motor.yanitla_ve_kaydet(kimliksizleri_ayir(
+            motor.analiz_et(dosyalar, self.musteri.guncel(), self.is_sayisi, erken_dur=self.erken_dur)),
+            self.cikti)
+        sonuclar = []
+        try:
+            for dosya_yolu, sonuc, hata in analiz:
+                if hata is None and sonuc.get('yanit_durumu') == motor.DURUM_HATA:
+                    hata = f"yanıt kaydedilemedi: {sonuc['yanit_hatasi']}"
+                yeni = self.tasi(dosya_yolu, self.hatali if hata is not None else self.islenen)
+                if sonuc is not None:
+                    # Geçmişte yazının taşındığı yer görünsün
+                    if yeni is not None:
+                        sonuc['dosya'], sonuc['dosya_adi'] = yeni, os.path.basename(yeni)
+                    sonuclar.append(sonuc)
+                gecikme = time.monotonic() - gelis[dosya_yolu]
+                ad = os.path.basename(dosya_yolu)
+                saat = datetime.now().strftime('%H:%M:%S')
+                if hata is not None:
+                    self.hatali_sayisi += 1
+                    self.kayit(f"[{saat}] [HATA] {ad}: {hata} ({gecikme:.1f} s)")
+                    continue
+                self.islenen_sayisi += 1
+                if sonuc['musteri_mi']:
+                    durum = "müşteri, yanıt yok"
+                else:
+                    durum = f"müşteri değil, yanıt: {os.path.basename(sonuc['cikti'])}"
+                self.kayit(f"[{saat}] {ad}: {durum} ({gecikme:.1f} s)")
+        finally:
+            analiz.close()
+            if self.gecmis is not None and sonuclar:
+                self.gecmis.kaydet(sonuclar)
+
+    def tur(self, tam_tarama, bildirimler=None):
+        """Tek izleme turu: yeni dosyaları topla, hazır olanları işle; bekleyen aday var mı döndür"""
+        for dosya_yolu, hedef in list(self.tasinamayanlar.items()):
+            self.tasi(dosya_yolu, hedef)
+        if tam_tarama:
+            for dosya_yolu in motor.klasor_tara(self.klasor):
+                self.aday_ekle(dosya_yolu)
+        if bildirimler is not None:
+            for dosya_yolu in bildirimler.al():
+                self.aday_ekle(dosya_yolu)
+        hazirlar, gelis = self.hazir_dosyalar()
+        if hazirlar:
+            try:
+                self.isle(hazirlar, gelis)
+            except Exception as e:
+                # İşlenemeyenler klasörde kalır, sonraki tam taramada yeniden denenir
+                self.kayit(f"[HATA] Toplu işlem başarısız: {e}")
+        return bool(self.adaylar)
+
+    def calistir(self):
+        """durdur() çağrılana kadar klasörü izle"""
+        self.musteri.guncel()
+        os.makedirs(self.cikti, exist_ok=True)
+        bildirimler = _Bildirimler(self.klasor, self.uyandir) if self.bildirim else None
+        self.kayit(f"İzleniyor: {self.klasor} ({'bildirim' if bildirimler else f'yoklama, {self.aralik:g} s'})"
+                   f" -> yanıtlar: {self.cikti}")
+        son_tam_tarama = None
+        try:
+            while not self.durdur_olayi.is_set():
+                simdi = time.monotonic()
+                tam_tarama = (bildirimler is None or son_tam_tarama is None
+                              or simdi - son_tam_tarama >= TAM_TARAMA_ARALIGI)
+                if tam_tarama:
+                    son_tam_tarama = simdi
+                bekleyen = self.tur(tam_tarama, bildirimler)
+                if bekleyen:
+                    # Durulmayı beklenen dosyalar sık denetlenir
+                    bekleme = min(self.aralik, max(0.25, self.durulma / 4))
+                elif bildirimler is not None:
+                    bekleme = TAM_TARAMA_ARALIGI - (time.monotonic() - son_tam_tarama)
+                else:
+                    bekleme = self.aralik
+                self.uyandir.wait(max(0.0, bekleme))
+                self.uyandir.clear()
+        finally:
+            if bildirimler is not None:
+                bildirimler.kapat()
+
+    def durdur(self):
+        """İzleme döngüsünü (başka iş parçacığından) durdur"""
+        self.durdur_olayi.set()
+        self.uyandir.set()
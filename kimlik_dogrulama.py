@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TBB Yazı Otomatik Yanıtlama Sistemi - Kimlik Doğrulama
+TCKN ve VKN kontrol hanesi (sağlama) kuralları
+
+Tekil sürümler yazı başına birkaç adayı süzmek için saf Python'dur; toplu
+sürümler int64 anahtar dizileri (bkz. musteri_indeksi.kimlik_anahtarlari)
+üzerinde numpy ile vektörel çalışır. numpy yalnızca toplu sürümler
+çağrıldığında yüklenir.
+
+TCKN: 11 hane, ilk hane 0 değil;
+    h10 = ((h1 + h3 + h5 + h7 + h9) * 7 - (h2 + h4 + h6 + h8)) mod 10
+    h11 = (h1 + ... + h10) mod 10
+VKN: 10 hane; ilk 9 hanenin her biri (hane + 9 - i) mod 10, 2^(9 - i) ile
+    çarpılıp mod 9 alınarak (9 ise 9) toplanır, h10 = (10 - toplam mod 10) mod 10
+"""
+
+# Listede bulunmayan ve sağlaması da tutmayan kimliğin sorgu sonucu: müşteri
+# olmadığı söylenemez (okuma / yazım hatası olabilir), manuel incelenmelidir.
+# Doğruluk değeri True'dur; yanlışlıkla otomatik red yanıtına yol açmaz.
+GECERSIZ = 'gecersiz'
+
+
+def tckn_gecerli_mi(tckn):
+    """11 haneli metnin geçerli bir TCKN olup olmadığı"""
+    if len(tckn) != 11 or not tckn.isdigit() or tckn[0] == '0':
+        return False
+    h = [int(c) for c in tckn]
+    return ((h[0] + h[2] + h[4] + h[6] + h[8]) * 7 - (h[1] + h[3] + h[5] + h[7])) % 10 == h[9] \
+        and sum(h[:10]) % 10 == h[10]
+
+
+def vkn_gecerli_mi(vkn):
+    """10 haneli metnin geçerli bir VKN olup olmadığı"""
+    if len(vkn) != 10 or not vkn.isdigit():
+        return False
+    toplam = 0
+    for i, c in enumerate(vkn[:9]):
+        t = (int(c) + 9 - i) % 10
+        if t:
+            t = (t * 2 ** (9 - i)) % 9 or 9
+        toplam += t
+    return (10 - toplam % 10) % 10 == int(vkn[9])
+
+
+def _haneler(anahtarlar, hane):
+    """int64 anahtarları soldan sağa hane matrisine (n x hane) çevir"""
+    import numpy as np
+
+    return (anahtarlar[:, None] // 10 ** np.arange(hane - 1, -1, -1, dtype=np.int64)) % 10
+
+
+def tckn_gecerli(anahtarlar):
+    """int64 anahtar dizisinde geçerli TCKN'ler için True dizisi (-1 ve diğerleri False)"""
+    import numpy as np
+
+    anahtarlar = np.asarray(anahtarlar, dtype=np.int64)
+    aralikta = (anahtarlar >= 10 ** 10) & (anahtarlar < 10 ** 11)
+    h = _haneler(np.where(aralikta, anahtarlar, 0), 11)
+    h10 = (h[:, 0:9:2].sum(axis=1) * 7 - h[:, 1:8:2].sum(axis=1)) % 10
+    return aralikta & (h10 == h[:, 9]) & (h[:, :10].sum(axis=1) % 10 == h[:, 10])
+
+
+def vkn_gecerli(anahtarlar):
+    """int64 anahtar dizisinde geçerli VKN'ler için True dizisi (-1 ve diğerleri False)
+
+    Anahtarda baştaki sıfırlar kaybolduğundan 10 haneye tamamlanarak denetlenir.
+    """
+    import numpy as np
+
+    anahtarlar = np.asarray(anahtarlar, dtype=np.int64)
+    aralikta = (anahtarlar >= 0) & (anahtarlar < 10 ** 10)
+    h = _haneler(np.where(aralikta, anahtarlar, 0), 10)
+    # i. hane için (9 - i) ekleme ve 2^(9 - i) çarpan
+    ekler = np.arange(9, 0, -1, dtype=np.int64)
+    t = (h[:, :9] + ekler) % 10
+    t = np.where(t == 9, 9, (t * 2 ** ekler) % 9)
+    return aralikta & ((10 - t.sum(axis=1) % 10) % 10 == h[:, 9])
+
+
+def sorgu_birlestir(sonuclar):
+    """TCKN ve VKN sorgu sonuçlarını (müşteri mi, ad) birleştir
+
+    Bulunan kimlik belirleyicidir; bulunamadıysa sağlaması tutan bir kimlik
+    müşteri olmadığını gösterir (False). Verilen kimliklerin hiçbiri
+    listede yoksa ve sağlamaları da tutmuyorsa sonuç GECERSIZ'dir.
+    """
+    for durum in (True, False, GECERSIZ):
+        for sonuc in sonuclar:
+            if sonuc[0] == durum:
+                return sonuc
+    return False, None
@@ -8,41 +8,24 @@ Versiyon: 1.0 Final
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
+import multiprocessing
 import os
-import re
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
 
-# Hata yakalama ile import
-try:
-    from docx import Document
-    from docx.shared import Pt
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
+import motor
+from motor import DOCX_AVAILABLE, PANDAS_AVAILABLE, PDF_LIB
+from olcum import AsamaOlcumu
 
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+# Toplu işlem tablosunda aynı anda gösterilen satır sayısı
+SAYFA_BOYUTU = 500
 
-# PDF kütüphaneleri
-PDF_LIB = None
-try:
-    import fitz
-    PDF_LIB = 'fitz'
-except ImportError:
-    try:
-        import pdfplumber
-        PDF_LIB = 'pdfplumber'
-    except ImportError:
-        try:
-            from PyPDF2 import PdfReader
-            PDF_LIB = 'PyPDF2'
-        except ImportError:
-            pass
+# Açılış ölçümü (bkz. benchmarks/acilis.py): bu ortam değişkeni bir dosya yolu
+# verirse pencere ilk kez göründüğünde zaman damgası oraya yazılır ve uygulama kapanır
+ACILIS_OLCUMU_DEGISKENI = "TBB_ACILIS_OLCUMU"
 
 
 class TBBYanitSistemi:
@@ -72,6 +55,23 @@ class TBBYanitSistemi:
         self.toplu_dosyalar = []
         self.toplu_sonuclar = []
         self.toplu_yanitlar = []
+        # Son analizden bu yana analiz / yanıt / kayıt aşama süreleri (rapora da eklenir)
+        self.olcum = None
+        self.onbellek = motor.onbellek_ac()
+        # Tüm analiz sonuçları ve yanıtlar denetim için burada birikir
+        self.gecmis = motor.gecmis_ac()
+        self.manifest = None
+        
+        # Toplu tablo modeli: tüm satırlar bellekte, Treeview'de yalnızca bir sayfa
+        self.tablo_satirlari = []
+        self.tablo_sayfa = 0
+        self.sayfa_ogeleri = []
+        self.kirli_satirlar = set()
+        
+        # Arka plan (toplu işlem) durumu
+        self.calisan_is = None
+        self.is_kuyrugu = queue.Queue()
+        self.iptal_olayi = threading.Event()
         
         # Arayüz oluştur
         self.notebook = ttk.Notebook(self.root)
@@ -98,150 +98,16 @@ class TBBYanitSistemi:
         tk.Label(durum_frame, text=pdf_durum, font=('Segoe UI', 8), 
                 bg='#e0e0e0', fg='#666', padx=10).pack(side=tk.RIGHT)
         
-        # Otomatik müşteri listesi yükleme
-        self.otomatik_musteri_yukle()
-
-    # ==================== BİLGİ ÇIKARMA ====================
-    
-    def bilgi_cikar(self, icerik):
-        """Yazıdan tüm gerekli bilgileri çıkar"""
-        bilgiler = {
-            'muhatap_kurum': '', 'muhatap_alt1': '', 'muhatap_alt2': '',
-            'tarih': '', 'sayi': '', 'tckn': '', 'vkn': '', 'adsoyad': ''
-        }
-        
-        satirlar = icerik.split('\n')
-        
-        # Muhatap kurumları bul
-        kurum_anahtar = ['başkanlığı', 'müdürlüğü', 'dairesi', 'komutanlığı', 
-                        'savcılığı', 'mahkemesi', 'kaymakamlığı', 'valiliği',
-                        'defterdarlığı', 'bakanlığı', 'kurumu', 'idaresi']
-        
-        kurum_satirlari = []
-        for satir in satirlar[:15]:
-            satir_temiz = satir.strip()
-            if satir_temiz and len(satir_temiz) > 3:
-                if any(k in satir_temiz.lower() for k in kurum_anahtar):
-                    kurum_satirlari.append(satir_temiz)
-        
-        if len(kurum_satirlari) >= 1:
-            bilgiler['muhatap_kurum'] = kurum_satirlari[0]
-        if len(kurum_satirlari) >= 2:
-            bilgiler['muhatap_alt1'] = kurum_satirlari[1]
-        if len(kurum_satirlari) >= 3:
-            bilgiler['muhatap_alt2'] = kurum_satirlari[2]
-        
-        # Tarih bul
-        tarih_match = re.search(r'(\d{2}[./]\d{2}[./]\d{4})', icerik)
-        if tarih_match:
-            bilgiler['tarih'] = tarih_match.group(1).replace('/', '.')
-        
-        # Sayı numarası bul
-        sayi_patterns = [
-            r'[Ss]ayı\s*:\s*([A-Za-z0-9\-\[\]\(\)\s\.\/]+?)(?:\n|$)',
-            r'E-\d+[-\.\d\[\]]+',
-            r'\d{5,}[-\.\d\[\]]+\s*[-–]\s*\d+',
-        ]
-        for pattern in sayi_patterns:
-            sayi_match = re.search(pattern, icerik)
-            if sayi_match:
-                sayi = sayi_match.group(0) if pattern.startswith('E-') or pattern.startswith('\\d') else sayi_match.group(1)
-                if len(sayi.strip()) > 5:
-                    bilgiler['sayi'] = sayi.strip()
-                    break
-        
-        # TCKN bul (11 haneli)
-        tckn_match = re.search(r'\b(\d{11})\b', icerik)
-        if tckn_match:
-            bilgiler['tckn'] = tckn_match.group(1)
-        
-        # VKN bul (10 haneli)
-        vkn_matches = re.findall(r'\b(\d{10})\b', icerik)
-        for match in vkn_matches:
-            if match != bilgiler['tckn'][:10] if bilgiler['tckn'] else True:
-                bilgiler['vkn'] = match
-                break
-        
-        # Ad Soyad bul
-        if bilgiler['tckn']:
-            pattern = rf"{bilgiler['tckn']}\s*(?:T\.?C\.?\s*)?(?:Kimlik\s*)?(?:Numaralı)?\s*([A-ZÇĞİÖŞÜa-zçğıöşü]+\s+[A-ZÇĞİÖŞÜa-zçğıöşü]+)"
-            match = re.search(pattern, icerik)
-            if match:
-                bilgiler['adsoyad'] = match.group(1).strip()
-        
-        if not bilgiler['adsoyad']:
-            match = re.search(r'([A-ZÇĞİÖŞÜ][a-zçğıöşü]+\s+[A-ZÇĞİÖŞÜ][A-Za-zçğıöşü]+)(?:\s+adlı|\s+isimli|\'[ıiuü]n)', icerik)
-            if match:
-                bilgiler['adsoyad'] = match.group(1).strip()
-        
-        return bilgiler
-
-    # ==================== DOSYA OKUMA ====================
-    
-    def pdf_oku(self, dosya_yolu):
-        """PDF dosyasını oku"""
-        if not PDF_LIB:
-            return "[PDF desteği yok. PDF okumak için PyMuPDF gerekli.]"
-        
-        metin = ""
-        try:
-            if PDF_LIB == 'fitz':
-                import fitz
-                doc = fitz.open(dosya_yolu)
-                for sayfa in doc:
-                    metin += sayfa.get_text()
-                doc.close()
-            elif PDF_LIB == 'pdfplumber':
-                import pdfplumber
-                with pdfplumber.open(dosya_yolu) as pdf:
-                    for sayfa in pdf.pages:
-                        t = sayfa.extract_text()
-                        if t:
-                            metin += t + "\n"
-            elif PDF_LIB == 'PyPDF2':
-                from PyPDF2 import PdfReader
-                reader = PdfReader(dosya_yolu)
-                for sayfa in reader.pages:
-                    t = sayfa.extract_text()
-                    if t:
-                        metin += t + "\n"
-        except Exception as e:
-            return f"[PDF okuma hatası: {str(e)}]"
-        
-        return metin if metin.strip() else "[PDF'den metin çıkarılamadı]"
-    
-    def dosya_oku(self, dosya_yolu):
-        """Dosya içeriğini oku"""
-        uzanti = os.path.splitext(dosya_yolu)[1].lower()
-        try:
-            if uzanti == '.docx':
-                doc = Document(dosya_yolu)
-                return '\n'.join([p.text for p in doc.paragraphs])
-            elif uzanti == '.pdf':
-                return self.pdf_oku(dosya_yolu)
-            elif uzanti == '.txt':
-                with open(dosya_yolu, 'r', encoding='utf-8', errors='ignore') as f:
-                    return f.read()
-            else:
-                return f"[Desteklenmeyen format: {uzanti}]"
-        except Exception as e:
-            return f"[Dosya okuma hatası: {str(e)}]"
+        # Otomatik müşteri listesi yükleme: pencere çizildikten sonra
+        self.root.after(100, self.otomatik_musteri_yukle)
 
     # ==================== MÜŞTERİ LİSTESİ ====================
     
     def otomatik_musteri_yukle(self):
         """Aynı dizindeki müşteri listesini otomatik yükle"""
-        # EXE'nin bulunduğu dizini bul
-        if getattr(sys, 'frozen', False):
-            uygulama_dizini = os.path.dirname(sys.executable)
-        else:
-            uygulama_dizini = os.path.dirname(os.path.abspath(__file__))
-        
-        for dosya in ["musteri_listesi.xlsx", "musteri_listesi.csv", "musteriler.xlsx"]:
-            tam_yol = os.path.join(uygulama_dizini, dosya)
-            if os.path.exists(tam_yol):
-                self.musteri_listesi_yukle(tam_yol)
-                break
+        tam_yol = motor.musteri_listesi_bul()
+        if tam_yol:
+            self.musteri_listesi_yukle(tam_yol)
     
     def musteri_listesi_sec(self):
         dosya = filedialog.askopenfilename(
@@ -252,135 +118,102 @@ class TBBYanitSistemi:
             self.musteri_listesi_yukle(dosya)
     
     def musteri_listesi_yukle(self, dosya_yolu):
+        """Müşteri listesini işçi iş parçacığında yükle; sonra analiz sonuçlarını yeniden eşleştir
+        
+        İndeks derlemesi (ya da açılışı) büyük listelerde uzun sürebilir; arayüz bu sırada donmaz.
+        """
+        dosya_adi = os.path.basename(dosya_yolu)
+        yuklenen = []
+        
+        def calistir(bildir, iptal):
+            bildir(motor.musteri_listesi_oku(dosya_yolu))
+        
+        def bitince(iptal_edildi):
+            if not yuklenen:
+                self.durum_label.config(text="Müşteri listesi yüklenemedi")
+                return
+            if iptal_edildi:
+                self.durum_label.config(text="Müşteri listesi yüklemesi iptal edildi")
+                return
+            self.musteri_listesi = yuklenen[0]
+            kayit = len(self.musteri_listesi)
+            self.musteri_durum_label.config(text=f"✅ {dosya_adi} ({kayit} kayıt)", fg='#2e7d32')
+            self.toplu_musteri_label.config(text=f"✅ {dosya_adi} ({kayit} kayıt)", fg='#2e7d32')
+            self.durum_label.config(text=f"Müşteri listesi yüklendi: {kayit} kayıt")
+            if self.toplu_sonuclar:
+                self.toplu_yeniden_eslestir()
+        
+        if self.arka_plan_baslat("Müşteri listesi yükleme", 1, calistir, yuklenen.append, bitince):
+            self.durum_label.config(text=f"Müşteri listesi yükleniyor: {dosya_adi}...")
+    
+    def toplu_yeniden_eslestir(self):
+        """Analiz sonuçlarını dosyaları yeniden okumadan yeni listeyle eşleştir
+        
+        Yalnızca durumu değişen satırlar, istatistik ve bekleyen yanıtlar güncellenir.
+        """
+        degisenler = motor.yeniden_eslestir(self.toplu_sonuclar, self.musteri_listesi)
+        
+        satir_no = {dosya: i for i, dosya in enumerate(self.toplu_dosyalar)}
+        for sonuc in degisenler:
+            i = satir_no.get(sonuc['dosya'])
+            if i is not None:
+                self.tablo_satir_guncelle(i, self.sonuc_satiri(sonuc, self.musteri_listesi))
+        self.tablo_yenile()
+        
+        if self.toplu_yanitlar:
+            self.toplu_yanitlar = motor.bekleyen_yanitlari_guncelle(self.toplu_yanitlar, degisenler)
+        
+        self.istatistik_guncelle(self.toplu_sonuclar)
+        self.gecmise_yaz(degisenler)
+        self.durum_label.config(text=f"Yeni müşteri listesiyle yeniden eşleştirildi: "
+                                     f"{len(degisenler)} sonuç değişti")
+    
+    def gecmise_yaz(self, sonuclar):
+        """Sonuçları geçmiş veritabanına yaz; yazılamazsa yalnızca uyar ve False döndür"""
+        if self.gecmis is None or not sonuclar:
+            return True
         try:
-            uzanti = os.path.splitext(dosya_yolu)[1].lower()
-            if uzanti == '.csv':
-                df = pd.read_csv(dosya_yolu, dtype=str)
-            else:
-                df = pd.read_excel(dosya_yolu, dtype=str)
-            
-            df.columns = df.columns.str.lower().str.strip()
-            
-            tckn_sutun = vkn_sutun = adsoyad_sutun = None
-            for col in df.columns:
-                c = col.lower()
-                if 'tckn' in c or 'tc' in c or 'kimlik' in c:
-                    tckn_sutun = col
-                elif 'vkn' in c or 'vergi' in c:
-                    vkn_sutun = col
-                elif 'ad' in c or 'isim' in c or 'müşteri' in c or 'soyad' in c:
-                    adsoyad_sutun = col
-            
-            if not tckn_sutun and not vkn_sutun:
-                tckn_sutun = df.columns[0]
-            
-            self.musteri_listesi = {
-                'df': df, 'tckn_sutun': tckn_sutun,
-                'vkn_sutun': vkn_sutun, 'adsoyad_sutun': adsoyad_sutun
-            }
-            
-            dosya_adi = os.path.basename(dosya_yolu)
-            self.musteri_durum_label.config(text=f"✅ {dosya_adi} ({len(df)} kayıt)", fg='#2e7d32')
-            self.toplu_musteri_label.config(text=f"✅ {dosya_adi} ({len(df)} kayıt)", fg='#2e7d32')
-            self.durum_label.config(text=f"Müşteri listesi yüklendi: {len(df)} kayıt")
-            
+            self.gecmis.kaydet(sonuclar)
         except Exception as e:
-            messagebox.showerror("Hata", f"Müşteri listesi yüklenemedi:\n{str(e)}")
+            messagebox.showwarning("Uyarı", f"Sonuçlar geçmişe yazılamadı:\n{str(e)}")
+            return False
+        return True
     
-    def musteri_sorgula(self, tckn=None, vkn=None):
-        if self.musteri_listesi is None:
-            return None, None
-        
-        df = self.musteri_listesi['df']
-        tckn_s = self.musteri_listesi['tckn_sutun']
-        vkn_s = self.musteri_listesi['vkn_sutun']
-        ad_s = self.musteri_listesi['adsoyad_sutun']
-        
-        sonuc = None
-        
-        if tckn and tckn_s:
-            eslesme = df[df[tckn_s].astype(str).str.strip() == str(tckn).strip()]
-            if not eslesme.empty:
-                sonuc = eslesme.iloc[0]
-        
-        if sonuc is None and vkn and vkn_s:
-            eslesme = df[df[vkn_s].astype(str).str.strip() == str(vkn).strip()]
-            if not eslesme.empty:
-                sonuc = eslesme.iloc[0]
-        
-        if sonuc is not None:
-            adsoyad = sonuc[ad_s] if ad_s and ad_s in sonuc.index else None
-            return True, adsoyad
-        
-        return False, None
-
-    # ==================== BELGE OLUŞTURMA ====================
+    def gecmis_yazicisi(self):
+        """Toplu iş için (ekle, bitir) döndür: ekle sonuçları biriktirip her GECMIS_PARTI sonuçta, bitir kalanları yazar
+        
+        Böylece iptal edilen ya da yarıda kalan işin biten sonuçları da geçmişte
+        kalır. Yazma bir kez başarısız olursa iş boyunca yeniden denenmez.
+        """
+        bekleyen = []
+        basarisiz = [False]
+        
+        def bitir():
+            if not basarisiz[0]:
+                basarisiz[0] = not self.gecmise_yaz(bekleyen)
+            bekleyen.clear()
+        
+        def ekle(sonuc):
+            bekleyen.append(sonuc)
+            if len(bekleyen) >= motor.GECMIS_PARTI:
+                bitir()
+        
+        return ekle, bitir
     
-    def belge_olustur(self, muhatap_kurum, muhatap_alt1, muhatap_alt2, tarih, sayi, tckn, vkn, adsoyad, musteri_durumu):
-        """Word belgesi oluştur"""
-        doc = Document()
-        
-        # Stil
-        style = doc.styles['Normal']
-        style.font.name = 'Times New Roman'
-        style.font.size = Pt(12)
-        
-        # T.C.
-        p = doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        p.add_run("T.C.").bold = True
-        
-        # Muhatap kurumları
-        for kurum in [muhatap_kurum, muhatap_alt1, muhatap_alt2]:
-            if kurum:
-                pk = doc.add_paragraph()
-                pk.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                pk.add_run(kurum.upper()).bold = True
-        
-        # Tarih
-        pt = doc.add_paragraph()
-        pt.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-        pt.add_run(tarih or datetime.now().strftime("%d.%m.%Y"))
-        
-        # İlgi
-        doc.add_paragraph()
-        doc.add_paragraph(f"İlgi: {tarih} tarihli ve {sayi} sayılı yazınız.")
-        
-        # Ana metin
-        doc.add_paragraph()
-        
-        kimlik = tckn if tckn else vkn
-        kimlik_tipi = "T.C. Kimlik Numaralı" if tckn else "Vergi Kimlik Numaralı"
-        
-        if "DEĞİL" in musteri_durumu.upper():
-            metin = f"İlgi'de kayıtlı yazınıza istinaden Bankamız nezdinde gerekli araştırma yapılmış olup, {kimlik} {kimlik_tipi}"
-            if adsoyad:
-                metin += f" {adsoyad}'ın"
-            metin += " Bankamız müşterisi olmadığı tespit edilmiştir."
-        else:
-            metin = f"İlgi'de kayıtlı yazınıza istinaden Bankamız nezdinde gerekli araştırma yapılmış olup, {kimlik} {kimlik_tipi}"
-            if adsoyad:
-                metin += f" {adsoyad}"
-            metin += " ile ilgili gerekli işlemler yapılmaktadır."
-        
-        doc.add_paragraph(metin)
-        
-        # Kapanış
-        doc.add_paragraph()
-        doc.add_paragraph("Bilgilerinize arz ederiz.")
-        doc.add_paragraph()
-        doc.add_paragraph("Saygılarımızla,")
-        doc.add_paragraph()
-        
-        pi1 = doc.add_paragraph()
-        pi1.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        pi1.add_run("AYTEMİZ YATIRIM BANKASI A.Ş.").bold = True
+    def istatistik_guncelle(self, sonuclar):
+        """Analiz istatistiğini etikete yaz; (müşteri, müşteri değil, manuel inceleme) sayılarını döndür"""
+        musteri_sayisi = sum(1 for s in sonuclar if s['musteri_mi'])
+        inceleme_sayisi = sum(1 for s in sonuclar if motor.kimliksiz_mi(s))
+        degil_sayisi = len(sonuclar) - musteri_sayisi - inceleme_sayisi
         
-        pi2 = doc.add_paragraph()
-        pi2.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        pi2.add_run("Genel Müdürlük").bold = True
-        
-        return doc
+        self.istatistik_label.config(
+            text=f"📊 Toplam: {len(sonuclar)} | ✅ Müşteri: {musteri_sayisi} | ❌ Değil: {degil_sayisi}"
+                 f" | 🔍 Manuel inceleme: {inceleme_sayisi}"
+        )
+        return musteri_sayisi, degil_sayisi, inceleme_sayisi
+    
+    def musteri_sorgula(self, tckn=None, vkn=None):
+        return motor.musteri_sorgula(self.musteri_listesi, tckn, vkn)
 
     # ==================== TEKLİ İŞLEM ARAYÜZÜ ====================
     
@@ -484,7 +317,7 @@ class TBBYanitSistemi:
             self.durum_label.config(text="Dosya okunuyor...")
             self.root.update()
             
-            icerik = self.dosya_oku(dosya)
+            icerik = motor.dosya_oku(dosya)
             self.yazi_text.delete('1.0', tk.END)
             self.yazi_text.insert('1.0', icerik)
             
@@ -493,7 +326,7 @@ class TBBYanitSistemi:
     
     def tekli_bilgi_cikar(self):
         icerik = self.yazi_text.get('1.0', tk.END)
-        bilgiler = self.bilgi_cikar(icerik)
+        bilgiler = motor.bilgi_cikar(icerik)
         
         alan_map = {
             'muhatap_kurum': "Muhatap Kurum:", 'muhatap_alt1': "Alt Birim 1:",
@@ -508,13 +341,18 @@ class TBBYanitSistemi:
         # Müşteri kontrolü
         musteri_mi, adsoyad = self.musteri_sorgula(bilgiler['tckn'], bilgiler['vkn'])
         
-        if self.musteri_listesi:
-            if musteri_mi:
+        if self.musteri_listesi is not None:
+            if musteri_mi is True:
                 self.musteri_sonuc.config(text="✅ MÜŞTERİMİZ", fg='#2e7d32')
                 self.musteri_combo.set("Müşterimiz - Manuel işlem")
                 if adsoyad and not bilgiler['adsoyad']:
                     self.entries["Ad Soyad:"].delete(0, tk.END)
                     self.entries["Ad Soyad:"].insert(0, str(adsoyad))
+            elif musteri_mi == motor.GECERSIZ or not (bilgiler['tckn'] or bilgiler['vkn']):
+                # Kimliksiz (ya da sağlaması tutmayan, listede olmayan kimlikli) yazıya otomatik red verilmez
+                metin = "GEÇERSİZ KİMLİK" if musteri_mi == motor.GECERSIZ else "KİMLİK BULUNAMADI"
+                self.musteri_sonuc.config(text=f"⚠️ {metin} - manuel inceleme", fg='#f57c00')
+                self.musteri_combo.set("Müşterimiz - Manuel işlem")
             else:
                 self.musteri_sonuc.config(text="❌ MÜŞTERİMİZ DEĞİL", fg='#c62828')
                 self.musteri_combo.set("Müşterimiz DEĞİL")
@@ -569,7 +407,7 @@ class TBBYanitSistemi:
             messagebox.showwarning("Uyarı", "TCKN veya VKN bilgisi gerekli!")
             return
         
-        belge = self.belge_olustur(
+        belge = motor.belge_olustur(
             self.entries["Muhatap Kurum:"].get(),
             self.entries["Alt Birim 1:"].get(),
             self.entries["Alt Birim 2:"].get(),
@@ -623,6 +461,22 @@ class TBBYanitSistemi:
                                      font=('Segoe UI', 9), bg='#e3f2fd', fg='#666')
         self.klasor_label.pack(side=tk.RIGHT, padx=10)
         
+        # PDF'lerde zorunlu alanlar bulununca okumayı durdur
+        self.pdf_erken_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(ctrl, text="⚡ Hızlı PDF", variable=self.pdf_erken_var,
+                      font=('Segoe UI', 9), bg='#e3f2fd').pack(side=tk.RIGHT, padx=5)
+        
+        # Yanıtları analiz sırasında diske yaz; belgeler bellekte birikmez
+        self.anlik_kayit_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(ctrl, text="💾 Anında Kaydet", variable=self.anlik_kayit_var,
+                      font=('Segoe UI', 9), bg='#e3f2fd').pack(side=tk.RIGHT, padx=5)
+        
+        # Paralel analiz süreç sayısı
+        self.is_sayisi_var = tk.IntVar(value=motor.varsayilan_is_sayisi())
+        tk.Spinbox(ctrl, from_=1, to=64, width=3, textvariable=self.is_sayisi_var,
+                  font=('Segoe UI', 9)).pack(side=tk.RIGHT)
+        tk.Label(ctrl, text="⚙️ Süreç:", font=('Segoe UI', 9), bg='#e3f2fd').pack(side=tk.RIGHT, padx=(10, 2))
+        
         # Treeview
         tree_frame = tk.Frame(self.toplu_frame, bg='#f0f0f0')
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -643,6 +497,18 @@ class TBBYanitSistemi:
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         sb.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Sayfalama
+        sayfa = tk.Frame(self.toplu_frame, bg='#f0f0f0')
+        sayfa.pack(fill=tk.X, padx=10)
+        self.sayfa_geri_btn = tk.Button(sayfa, text="◀", command=lambda: self.sayfa_degistir(-1),
+                                        font=('Segoe UI', 9), width=3, state=tk.DISABLED)
+        self.sayfa_geri_btn.pack(side=tk.LEFT)
+        self.sayfa_label = tk.Label(sayfa, text="", font=('Segoe UI', 9), bg='#f0f0f0')
+        self.sayfa_label.pack(side=tk.LEFT, padx=10)
+        self.sayfa_ileri_btn = tk.Button(sayfa, text="▶", command=lambda: self.sayfa_degistir(1),
+                                         font=('Segoe UI', 9), width=3, state=tk.DISABLED)
+        self.sayfa_ileri_btn.pack(side=tk.LEFT)
+        
         # Butonlar
         btn = tk.Frame(self.toplu_frame, bg='#f0f0f0', pady=10)
         btn.pack(fill=tk.X, padx=10)
@@ -651,6 +517,7 @@ class TBBYanitSistemi:
             ("🔍 Tümünü Analiz Et", self.toplu_analiz, '#2196F3'),
             ("📝 Yanıtları Oluştur", self.toplu_yanit_olustur, '#4CAF50'),
             ("💾 Tümünü Kaydet", self.toplu_kaydet, '#FF9800'),
+            ("📦 ZIP Paketi", self.toplu_zip_kaydet, '#795548'),
             ("📊 Rapor Çıkar", self.rapor_olustur, '#9C27B0')
         ]
         
@@ -660,8 +527,24 @@ class TBBYanitSistemi:
         
         self.istatistik_label = tk.Label(btn, text="", font=('Segoe UI', 10), bg='#f0f0f0')
         self.istatistik_label.pack(side=tk.RIGHT, padx=20)
+        
+        # İlerleme
+        ilerleme = tk.Frame(self.toplu_frame, bg='#f0f0f0')
+        ilerleme.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        self.ilerleme_bar = ttk.Progressbar(ilerleme, mode='determinate')
+        self.ilerleme_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.iptal_btn = tk.Button(ilerleme, text="⛔ İptal", command=self.toplu_iptal,
+                                   font=('Segoe UI', 9, 'bold'), bg='#e53935', fg='white',
+                                   cursor='hand2', state=tk.DISABLED)
+        self.iptal_btn.pack(side=tk.RIGHT, padx=(10, 0))
+        self.ilerleme_label = tk.Label(ilerleme, text="", font=('Segoe UI', 9), bg='#f0f0f0', width=45, anchor=tk.W)
+        self.ilerleme_label.pack(side=tk.RIGHT, padx=10)
     
     def klasor_sec(self):
+        if self.calisan_is is not None:
+            messagebox.showwarning("Uyarı", "Devam eden bir toplu işlem var!")
+            return
         klasor = filedialog.askdirectory(title="TBB Yazılarının Bulunduğu Klasörü Seçin")
         if not klasor:
             return
@@ -669,129 +552,399 @@ class TBBYanitSistemi:
         self.secili_klasor = klasor
         self.klasor_label.config(text=os.path.basename(klasor))
         
-        self.toplu_dosyalar = []
-        for dosya in os.listdir(klasor):
-            if os.path.splitext(dosya)[1].lower() in ['.docx', '.pdf', '.txt']:
-                self.toplu_dosyalar.append(os.path.join(klasor, dosya))
+        self.toplu_dosyalar = motor.klasor_tara(klasor)
+        self.manifest = motor.manifest_ac(klasor)
+        
+        # Tabloyu temizle ve doldur; önceki çalıştırmada işlenmiş dosyalar manifestodan gelir
+        satirlar = []
+        oncekiler = []
+        for i, dosya in enumerate(self.toplu_dosyalar):
+            onceki = self.manifest.onceki_kayit(dosya) if self.manifest else None
+            if onceki:
+                sonuc = motor.sonuc_olustur(dosya, dict(onceki['bilgiler']), None)
+                sonuc['onceki'] = True
+                oncekiler.append((i, sonuc))
+            satirlar.append((os.path.basename(dosya), '', '', '', '', '', 'Bekliyor'))
+        if self.musteri_listesi is not None:
+            motor.sonuclari_eslestir([s for _, s in oncekiler], self.musteri_listesi)
+        for i, sonuc in oncekiler:
+            satirlar[i] = self.sonuc_satiri(sonuc, self.musteri_listesi)
+        onceki_sayisi = len(oncekiler)
+        self.tablo_doldur(satirlar)
+        
+        self.istatistik_label.config(text=f"📁 {len(self.toplu_dosyalar)} dosya bulundu"
+                                          f" ({onceki_sayisi} önceden işlenmiş)")
+        self.durum_label.config(text=f"Klasör seçildi: {len(self.toplu_dosyalar)} dosya")
+    
+    def sonuc_satiri(self, sonuc, musteri_listesi):
+        """Analiz sonucunu tablo satırı değerlerine dönüştür"""
+        bilgiler = sonuc['bilgiler']
+        if musteri_listesi is None:
+            musteri_str = "⚠️"
+        elif sonuc['musteri_mi']:
+            musteri_str = "✅ Evet"
+        elif motor.kimliksiz_mi(sonuc):
+            musteri_str = "⚠️ Kimlik yok"
+        else:
+            musteri_str = "❌ Hayır"
+        # Çok kimlikli yazılarda müşteri olan kimlik sayısı
+        durumlar = sonuc.get('kimlik_durumlari') or ()
+        if musteri_listesi is not None and len(durumlar) > 1:
+            musteri_str += f" ({sum(1 for d in durumlar if d['musteri_mi'] is True)}/{len(durumlar)})"
+        
+        return (
+            sonuc['dosya_adi'],
+            bilgiler['tckn'],
+            bilgiler['vkn'],
+            bilgiler['adsoyad'][:20] if bilgiler['adsoyad'] else '',
+            bilgiler['sayi'][:25] if bilgiler['sayi'] else '',
+            musteri_str,
+            self.durum_metni(sonuc)
+        )
+    
+    def durum_metni(self, sonuc):
+        """Sonucun Durum sütunundaki metni"""
+        if sonuc.get('yanit_durumu') == motor.DURUM_HATA:
+            return "❌ Kayıt hatası"
+        if sonuc.get('yanit_durumu') == motor.DURUM_TAMAM:
+            return "💾 Kaydedildi"
+        if motor.kimliksiz_mi(sonuc):
+            return "🔍 Manuel inceleme"
+        return "✓ Önceki" if sonuc.get('onceki') else "✓ Tamam"
+    
+    # ==================== SAYFALI TABLO ====================
+    
+    def tablo_doldur(self, satirlar):
+        """Tablo modelini değiştir ve ilk sayfayı göster"""
+        self.tablo_satirlari = satirlar
+        self.kirli_satirlar.clear()
+        self.sayfa_goster(0)
+    
+    def tablo_satir_guncelle(self, i, degerler):
+        """Model satırını güncelle; Treeview bir sonraki yenilemede toplu güncellenir"""
+        self.tablo_satirlari[i] = degerler
+        self.kirli_satirlar.add(i)
+    
+    def tablo_yenile(self):
+        """Değişen satırlardan yalnızca görünen sayfadakileri Treeview'e yaz"""
+        bas = self.tablo_sayfa * SAYFA_BOYUTU
+        for i in self.kirli_satirlar:
+            j = i - bas
+            if 0 <= j < len(self.sayfa_ogeleri):
+                self.tree.item(self.sayfa_ogeleri[j], values=self.tablo_satirlari[i])
+        self.kirli_satirlar.clear()
+    
+    def sayfa_goster(self, sayfa):
+        """Verilen sayfayı göster; mevcut Treeview öğeleri yeniden kullanılır"""
+        sayfa_sayisi = max(1, -(-len(self.tablo_satirlari) // SAYFA_BOYUTU))
+        self.tablo_sayfa = min(max(sayfa, 0), sayfa_sayisi - 1)
+        bas = self.tablo_sayfa * SAYFA_BOYUTU
+        satirlar = self.tablo_satirlari[bas:bas + SAYFA_BOYUTU]
+        
+        fazla = self.sayfa_ogeleri[len(satirlar):]
+        if fazla:
+            self.tree.delete(*fazla)
+            del self.sayfa_ogeleri[len(satirlar):]
+        
+        for j, degerler in enumerate(satirlar):
+            if j < len(self.sayfa_ogeleri):
+                self.tree.item(self.sayfa_ogeleri[j], values=degerler)
+            else:
+                self.sayfa_ogeleri.append(self.tree.insert('', tk.END, values=degerler))
         
-        # Tabloyu temizle ve doldur
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.sayfa_label.config(text=f"Sayfa {self.tablo_sayfa + 1}/{sayfa_sayisi} "
+                                     f"({len(self.tablo_satirlari)} dosya)")
+        self.sayfa_geri_btn.config(state=tk.NORMAL if self.tablo_sayfa > 0 else tk.DISABLED)
+        self.sayfa_ileri_btn.config(state=tk.NORMAL if self.tablo_sayfa < sayfa_sayisi - 1 else tk.DISABLED)
+    
+    def sayfa_degistir(self, adim):
+        self.sayfa_goster(self.tablo_sayfa + adim)
+    
+    # ==================== ARKA PLAN İŞLERİ ====================
+    
+    def arka_plan_baslat(self, asama, toplam, is_fonksiyonu, oge_isle, bitince):
+        """Toplu işlem aşamasını işçi iş parçacığında çalıştır
+        
+        is_fonksiyonu(bildir, iptal) her dosya için bildir(oge) çağırır ve iptal
+        olayı kurulmuşsa dosyalar arasında durur. Öğeler kuyruk üzerinden ana iş
+        parçacığında oge_isle'ye, iş bitince bitince(iptal_edildi)'ye verilir.
+        """
+        if self.calisan_is is not None:
+            messagebox.showwarning("Uyarı", "Devam eden bir toplu işlem var!")
+            return False
+        
+        self.is_kuyrugu = queue.Queue()
+        self.iptal_olayi = threading.Event()
+        kuyruk, iptal = self.is_kuyrugu, self.iptal_olayi
+        
+        def calistir():
+            try:
+                is_fonksiyonu(lambda oge: kuyruk.put(('oge', oge)), iptal)
+                kuyruk.put(('bitti', None))
+            except Exception as e:
+                kuyruk.put(('bitti', e))
         
-        for dosya in self.toplu_dosyalar:
-            self.tree.insert('', tk.END, values=(os.path.basename(dosya), '', '', '', '', '', 'Bekliyor'))
+        self.calisan_is = {
+            'asama': asama, 'toplam': toplam, 'tamam': 0, 'baslangic': time.monotonic(),
+            'oge_isle': oge_isle, 'bitince': bitince, 'oge_hatalari': []
+        }
+        self.ilerleme_bar.config(maximum=max(toplam, 1), value=0)
+        self.iptal_btn.config(state=tk.NORMAL)
+        self.ilerleme_guncelle()
         
-        self.istatistik_label.config(text=f"📁 {len(self.toplu_dosyalar)} dosya bulundu")
-        self.durum_label.config(text=f"Klasör seçildi: {len(self.toplu_dosyalar)} dosya")
+        threading.Thread(target=calistir, daemon=True).start()
+        self.root.after(100, self.kuyrugu_isle)
+        return True
+    
+    def kuyrugu_isle(self):
+        """İşçiden gelen sonuçları arayüze aktar (after ile periyodik çağrılır)
+        
+        Bir öğe işlenirken çıkan hata yalnızca o öğeyi atlar; döngü her durumda
+        yeniden zamanlanır ya da iş kapatılır, böylece sonraki işler engellenmez.
+        """
+        is_ = self.calisan_is
+        bitti, hata = False, None
+        try:
+            while True:
+                try:
+                    tur, veri = self.is_kuyrugu.get_nowait()
+                except queue.Empty:
+                    break
+                if tur != 'oge':
+                    bitti, hata = True, veri
+                    break
+                try:
+                    is_['oge_isle'](veri)
+                except Exception as e:
+                    is_['oge_hatalari'].append(str(e))
+                is_['tamam'] += 1
+            
+            # Bu turda gelen tüm sonuçlar tabloya tek seferde yansıtılır
+            self.tablo_yenile()
+            self.ilerleme_guncelle()
+        finally:
+            if not bitti:
+                self.root.after(100, self.kuyrugu_isle)
+            else:
+                self.calisan_is = None
+                self.iptal_btn.config(state=tk.DISABLED)
+        
+        if not bitti:
+            return
+        if hata is not None:
+            messagebox.showerror("Hata", f"{is_['asama']} yarıda kaldı:\n{str(hata)}")
+        if is_['oge_hatalari']:
+            messagebox.showwarning("Uyarı", f"{len(is_['oge_hatalari'])} sonuç arayüze aktarılamadı:\n"
+                                            f"{is_['oge_hatalari'][0]}")
+        is_['bitince'](self.iptal_olayi.is_set())
+    
+    def ilerleme_guncelle(self):
+        """İlerleme çubuğu, hız (dosya/s) ve tahmini kalan süreyi güncelle"""
+        is_ = self.calisan_is
+        if is_ is None:
+            return
+        
+        tamam, toplam = is_['tamam'], is_['toplam']
+        gecen = time.monotonic() - is_['baslangic']
+        hiz = tamam / gecen if gecen > 0 else 0
+        
+        if hiz > 0:
+            kalan = int((toplam - tamam) / hiz)
+            eta = f"{kalan // 60:02d}:{kalan % 60:02d}"
+        else:
+            eta = "--:--"
+        
+        self.ilerleme_bar.config(value=tamam)
+        self.ilerleme_label.config(text=f"{is_['asama']}: {tamam}/{toplam} | {hiz:.1f} dosya/s | Kalan: {eta}")
+    
+    def toplu_iptal(self):
+        if self.calisan_is is not None:
+            self.iptal_olayi.set()
+            self.durum_label.config(text="İptal ediliyor (geçerli dosya bitince durur)...")
+    
+    # ==================== TOPLU İŞLEM AŞAMALARI ====================
     
     def toplu_analiz(self):
         if not self.toplu_dosyalar:
             messagebox.showwarning("Uyarı", "Önce bir klasör seçin!")
             return
         
-        self.toplu_sonuclar = []
-        self.durum_label.config(text="Analiz yapılıyor...")
-        
-        for i, dosya_yolu in enumerate(self.toplu_dosyalar):
+        try:
+            is_sayisi = max(1, self.is_sayisi_var.get())
+        except tk.TclError:
+            is_sayisi = 1
+        
+        dosyalar = list(self.toplu_dosyalar)
+        musteri_listesi = self.musteri_listesi
+        onbellek = self.onbellek
+        manifest = self.manifest
+        erken_dur = self.pdf_erken_var.get()
+        olcum = AsamaOlcumu()
+        sonuclar = []
+        gecmise_ekle, gecmisi_bitir = self.gecmis_yazicisi()
+        
+        yanit_klasoru = None
+        if self.anlik_kayit_var.get():
+            if musteri_listesi is None:
+                messagebox.showwarning("Uyarı", "Anında kayıt için önce müşteri listesini yükleyin!")
+                return
+            yanit_klasoru = filedialog.askdirectory(title="Yanıtların Kaydedileceği Klasörü Seçin")
+            if not yanit_klasoru:
+                return
+        
+        def calistir(bildir, iptal):
+            # Müşteri durumu her yazı için ayrı değil, parça başına tek toplu sorguyla belirlenir
+            analiz = motor.analiz_et(dosyalar, None, is_sayisi, onbellek, manifest, erken_dur, olcum)
+            if musteri_listesi is not None:
+                analiz = motor.parcali_eslestir(analiz, musteri_listesi, olcum=olcum)
+            if yanit_klasoru:
+                analiz = motor.yanitla_ve_kaydet(analiz, yanit_klasoru, manifest, olcum)
             try:
-                self.root.update()
-                icerik = self.dosya_oku(dosya_yolu)
-                bilgiler = self.bilgi_cikar(icerik)
-                
-                musteri_mi, adsoyad_db = self.musteri_sorgula(bilgiler['tckn'], bilgiler['vkn'])
-                
-                if self.musteri_listesi is None:
-                    musteri_str = "⚠️"
-                elif musteri_mi:
-                    musteri_str = "✅ Evet"
-                else:
-                    musteri_str = "❌ Hayır"
-                
-                if adsoyad_db and not bilgiler['adsoyad']:
-                    bilgiler['adsoyad'] = str(adsoyad_db)
-                
-                sonuc = {
-                    'dosya': dosya_yolu,
-                    'dosya_adi': os.path.basename(dosya_yolu),
-                    'bilgiler': bilgiler,
-                    'musteri_mi': musteri_mi
-                }
-                self.toplu_sonuclar.append(sonuc)
-                
-                item = self.tree.get_children()[i]
-                self.tree.item(item, values=(
-                    os.path.basename(dosya_yolu),
-                    bilgiler['tckn'],
-                    bilgiler['vkn'],
-                    bilgiler['adsoyad'][:20] if bilgiler['adsoyad'] else '',
-                    bilgiler['sayi'][:25] if bilgiler['sayi'] else '',
-                    musteri_str,
-                    "✓ Tamam"
-                ))
-                
-            except Exception as e:
-                item = self.tree.get_children()[i]
-                self.tree.item(item, values=(os.path.basename(dosya_yolu), '', '', '', '', '', f"❌ Hata"))
-        
-        # İstatistik
-        musteri_sayisi = sum(1 for s in self.toplu_sonuclar if s['musteri_mi'])
-        degil_sayisi = len(self.toplu_sonuclar) - musteri_sayisi
-        
-        self.istatistik_label.config(
-            text=f"📊 Toplam: {len(self.toplu_sonuclar)} | ✅ Müşteri: {musteri_sayisi} | ❌ Değil: {degil_sayisi}"
-        )
-        self.durum_label.config(text="Analiz tamamlandı")
-        messagebox.showinfo("Tamamlandı", f"{len(self.toplu_sonuclar)} dosya analiz edildi!\n\n"
-                           f"✅ Müşteri: {musteri_sayisi}\n❌ Müşteri değil: {degil_sayisi}")
+                for i, (dosya_yolu, sonuc, hata) in enumerate(analiz):
+                    bildir((i, dosya_yolu, sonuc, hata))
+                    if iptal.is_set():
+                        break
+            finally:
+                analiz.close()
+        
+        def oge_isle(oge):
+            i, dosya_yolu, sonuc, hata = oge
+            if hata is not None:
+                self.tablo_satir_guncelle(i, (os.path.basename(dosya_yolu), '', '', '', '', '', f"❌ Hata"))
+                return
+            
+            sonuclar.append(sonuc)
+            gecmise_ekle(sonuc)
+            self.tablo_satir_guncelle(i, self.sonuc_satiri(sonuc, musteri_listesi))
+        
+        def bitince(iptal_edildi):
+            self.toplu_sonuclar = sonuclar
+            gecmisi_bitir()
+            musteri_sayisi, degil_sayisi, inceleme_sayisi = self.istatistik_guncelle(sonuclar)
+            baslik = "İptal Edildi" if iptal_edildi else "Tamamlandı"
+            self.durum_label.config(text=f"Analiz {baslik.lower()}  {olcum.durum_metni()}")
+            mesaj = (f"{len(sonuclar)}/{len(dosyalar)} dosya analiz edildi!\n\n"
+                     f"✅ Müşteri: {musteri_sayisi}\n❌ Müşteri değil: {degil_sayisi}")
+            if inceleme_sayisi:
+                mesaj += f"\n🔍 Manuel inceleme (geçerli kimlik yok): {inceleme_sayisi}"
+            elenen = motor.elenen_aday_sayilari(sonuclar)
+            if elenen['tckn'] or elenen['vkn']:
+                mesaj += f"\n\n🔎 Elenen geçersiz kimlik: TCKN {elenen['tckn']}, VKN {elenen['vkn']}"
+            if yanit_klasoru:
+                kaydedilen = sum(1 for s in sonuclar if s.get('yanit_durumu') == motor.DURUM_TAMAM)
+                hatali = sum(1 for s in sonuclar if s.get('yanit_durumu') == motor.DURUM_HATA)
+                mesaj += f"\n\n💾 Kaydedilen yanıt: {kaydedilen}"
+                if hatali:
+                    mesaj += f"\n⚠️ Kaydedilemeyen: {hatali}"
+                mesaj += f"\nKonum: {yanit_klasoru}"
+            messagebox.showinfo(baslik, mesaj)
+        
+        if self.arka_plan_baslat("Analiz", len(dosyalar), calistir, oge_isle, bitince):
+            self.toplu_sonuclar = []
+            self.toplu_yanitlar = []
+            self.olcum = olcum
+            self.durum_label.config(text="Analiz yapılıyor...")
     
     def toplu_yanit_olustur(self):
         if not self.toplu_sonuclar:
             messagebox.showwarning("Uyarı", "Önce analiz yapın!")
             return
         
-        self.toplu_yanitlar = []
+        bekleyenler = [s for s in self.toplu_sonuclar if motor.yanit_bekliyor_mu(s)]
+        yanitlar = []
+        olcum = self.olcum
+        
+        def calistir(bildir, iptal):
+            for sonuc in bekleyenler:
+                if iptal.is_set():
+                    break
+                bildir(motor.yanit_olustur(sonuc, olcum))
+        
+        def bitince(iptal_edildi):
+            self.toplu_yanitlar = yanitlar
+            self.durum_label.config(text=f"{len(yanitlar)} yanıt oluşturuldu  {olcum.durum_metni()}")
+            messagebox.showinfo("İptal Edildi" if iptal_edildi else "Tamamlandı",
+                               f"{len(yanitlar)} yanıt yazısı oluşturuldu!\n\n"
+                               "(Sadece müşteri olmayanlar için)")
         
-        for sonuc in self.toplu_sonuclar:
-            if not sonuc['musteri_mi']:
-                b = sonuc['bilgiler']
-                belge = self.belge_olustur(
-                    b['muhatap_kurum'], b['muhatap_alt1'], b['muhatap_alt2'],
-                    b['tarih'], b['sayi'], b['tckn'], b['vkn'], b['adsoyad'],
-                    "Müşterimiz DEĞİL"
-                )
-                self.toplu_yanitlar.append({
-                    'dosya_adi': sonuc['dosya_adi'],
-                    'tckn': b['tckn'],
-                    'vkn': b['vkn'],
-                    'belge': belge
-                })
-        
-        self.durum_label.config(text=f"{len(self.toplu_yanitlar)} yanıt oluşturuldu")
-        messagebox.showinfo("Tamamlandı", f"{len(self.toplu_yanitlar)} yanıt yazısı oluşturuldu!\n\n"
-                           "(Sadece müşteri olmayanlar için)")
-    
-    def toplu_kaydet(self):
+        if self.arka_plan_baslat("Yanıt", len(bekleyenler), calistir, yanitlar.append, bitince):
+            self.durum_label.config(text="Yanıtlar oluşturuluyor...")
+    
+    def toplu_zip_kaydet(self):
+        """Yanıtları, raporu ve manifestoyu tek ZIP dosyasına kaydet"""
+        self.toplu_kaydet(zip_paketi=True)
+    
+    def toplu_kaydet(self, zip_paketi=False):
         if not self.toplu_yanitlar:
             messagebox.showwarning("Uyarı", "Önce yanıtları oluşturun!")
             return
         
-        klasor = filedialog.askdirectory(title="Yanıtların Kaydedileceği Klasörü Seçin")
+        if zip_paketi:
+            klasor = filedialog.asksaveasfilename(
+                title="ZIP Paketini Kaydet",
+                defaultextension=".zip",
+                initialfile=f"TBB_Yanitlar_{datetime.now().strftime('%Y%m%d_%H%M')}.zip",
+                filetypes=[("ZIP", "*.zip")]
+            )
+        else:
+            klasor = filedialog.askdirectory(title="Yanıtların Kaydedileceği Klasörü Seçin")
         if not klasor:
             return
         
-        basarili = 0
-        for yanit in self.toplu_yanitlar:
-            try:
-                kimlik = yanit['tckn'] if yanit['tckn'] else yanit['vkn']
-                dosya_adi = f"Yanit_{kimlik}_{datetime.now().strftime('%Y%m%d')}.docx"
-                dosya_yolu = os.path.join(klasor, dosya_adi)
-                yanit['belge'].save(dosya_yolu)
-                basarili += 1
-            except:
-                pass
+        try:
+            hedef = motor.YanitPaketi(klasor, self.manifest) if zip_paketi else klasor
+        except OSError as e:
+            messagebox.showerror("Hata", f"ZIP paketi oluşturulamadı:\n{str(e)}")
+            return
         
-        self.durum_label.config(text=f"{basarili} yanıt kaydedildi")
-        messagebox.showinfo("Tamamlandı", f"{basarili} yanıt yazısı kaydedildi!\n\nKonum: {klasor}")
+        yanitlar = list(self.toplu_yanitlar)
+        tum_sonuclar = list(self.toplu_sonuclar)
+        manifest = self.manifest
+        musteri_listesi = self.musteri_listesi
+        olcum = self.olcum
+        satir_no = {dosya: i for i, dosya in enumerate(self.toplu_dosyalar)}
+        sonuclar = []
+        gecmise_ekle, gecmisi_bitir = self.gecmis_yazicisi()
+        
+        def calistir(bildir, iptal):
+            kayit = motor.yanitlari_kaydet(yanitlar, hedef, manifest, olcum=olcum)
+            try:
+                for yanit, sonuc in zip(yanitlar, kayit):
+                    bildir((yanit, sonuc))
+                    if iptal.is_set():
+                        break
+            finally:
+                kayit.close()
+            if zip_paketi:
+                # İptalde de o ana kadar eklenenlerle paket tamamlanır
+                hedef.kapat(tum_sonuclar, olcum=olcum)
+        
+        def oge_isle(oge):
+            yanit, sonuc = oge
+            sonuclar.append(sonuc)
+            if yanit['sonuc'].get('yanit_durumu'):
+                gecmise_ekle(yanit['sonuc'])
+            i = satir_no.get(yanit['dosya'])
+            if i is not None:
+                self.tablo_satir_guncelle(i, self.sonuc_satiri(yanit['sonuc'], musteri_listesi))
+        
+        def bitince(iptal_edildi):
+            # Kaydedilenler bir daha kaydedilmesin; hatalılar tekrar denenebilir
+            self.toplu_yanitlar = [y for y in self.toplu_yanitlar if not y['sonuc'].get('cikti')]
+            gecmisi_bitir()
+            basarili = sum(1 for s in sonuclar if s['hata'] is None)
+            hatalar = [s for s in sonuclar if s['hata'] is not None]
+            self.durum_label.config(text=f"{basarili} yanıt kaydedildi  {olcum.durum_metni()}")
+            mesaj = f"{basarili} yanıt yazısı kaydedildi!\n\nKonum: {klasor}"
+            if hatalar:
+                mesaj += f"\n\n⚠️ {len(hatalar)} yanıt kaydedilemedi:\n"
+                mesaj += "\n".join(f"{s['dosya_adi']}: {s['hata']}" for s in hatalar[:10])
+            messagebox.showinfo("İptal Edildi" if iptal_edildi else "Tamamlandı", mesaj)
+        
+        if self.arka_plan_baslat("Kayıt", len(yanitlar), calistir, oge_isle, bitince):
+            self.durum_label.config(text="Yanıtlar kaydediliyor...")
+        elif zip_paketi:
+            hedef.iptal()
     
     def rapor_olustur(self):
         if not self.toplu_sonuclar:
@@ -809,33 +962,35 @@ class TBBYanitSistemi:
             return
         
         try:
-            data = []
-            for s in self.toplu_sonuclar:
-                b = s['bilgiler']
-                data.append({
-                    'Dosya': s['dosya_adi'],
-                    'Muhatap Kurum': b['muhatap_kurum'],
-                    'Tarih': b['tarih'],
-                    'Sayı': b['sayi'],
-                    'TCKN': b['tckn'],
-                    'VKN': b['vkn'],
-                    'Ad Soyad': b['adsoyad'],
-                    'Müşteri mi?': 'Evet' if s['musteri_mi'] else 'Hayır',
-                    'Aksiyon': 'Manuel işlem gerekli' if s['musteri_mi'] else 'Otomatik yanıt oluşturuldu'
-                })
-            
-            pd.DataFrame(data).to_excel(dosya, index=False)
+            motor.rapor_olustur(self.toplu_sonuclar, dosya, self.olcum)
             messagebox.showinfo("Tamamlandı", f"Rapor kaydedildi:\n{dosya}")
             self.durum_label.config(text=f"Rapor: {os.path.basename(dosya)}")
         except Exception as e:
             messagebox.showerror("Hata", f"Rapor oluşturulamadı:\n{str(e)}")
 
 
+def acilis_olcumu_kur(root, dosya):
+    """Pencere ilk kez göründüğünde zaman damgasını dosyaya yaz ve uygulamayı kapat"""
+    def goruldu(olay):
+        if olay.widget is not root:
+            return
+        root.unbind('<Map>')
+        with open(dosya, 'w') as f:
+            f.write(repr(time.time()))
+        root.after_idle(root.destroy)
+    root.bind('<Map>', goruldu)
+
+
 def main():
     root = tk.Tk()
     app = TBBYanitSistemi(root)
+    olcum_dosyasi = os.environ.get(ACILIS_OLCUMU_DEGISKENI)
+    if olcum_dosyasi:
+        acilis_olcumu_kur(root, olcum_dosyasi)
     root.mainloop()
 
 
 if __name__ == "__main__":
+    # PyInstaller EXE'sinde süreç havuzu işçileri için gerekli
+    multiprocessing.freeze_support()
     main()
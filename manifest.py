@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TBB Yazı Otomatik Yanıtlama Sistemi - İşlem Manifestosu
+Girdi klasörü başına, her dosya bitince eklenen JSON Lines kaydı
+
+Her satır bir dosyanın son durumunu taşır (boyut, mtime, özet, çıkarıcı sürümü,
+durum, çıkarılan bilgiler, yanıt yolu). Okurken aynı dosyanın son satırı
+geçerlidir; böylece yarıda kalan bir çalıştırma kaldığı yerden devam eder.
+Başka çıkarıcı sürümüyle yazılmış kayıtlar yok sayılır (dosya yeniden analiz
+edilir). Yanıt dosyası sonradan silinmiş ya da taşınmış kayıt yanıtlanmamış
+sayılır.
+"""
+
+import json
+import os
+import threading
+
+MANIFEST_DOSYASI = ".tbb_manifest.jsonl"
+
+DURUM_TAMAM = "tamam"
+DURUM_HATA = "hata"
+
+
+def cikti_mevcut_mu(cikti):
+    """Kaydedilen yanıt hâlâ yerinde mi?
+
+    ZIP paketine yazılan yanıtın yolu paket/yanitlar/ad biçimindedir; bunun
+    için paket dosyasının varlığına bakılır.
+    """
+    if not cikti:
+        return False
+    yol = cikti
+    while not os.path.exists(yol):
+        ust = os.path.dirname(yol)
+        if not ust or ust == yol:
+            return False
+        yol = ust
+    return yol == cikti or os.path.isfile(yol)
+
+
+class IslemManifesti:
+    def __init__(self, klasor, surum, dosya_adi=MANIFEST_DOSYASI):
+        self.klasor = klasor
+        self.surum = str(surum)
+        self.yol = os.path.join(klasor, dosya_adi)
+        self.kilit = threading.Lock()
+        self.kayitlar = {}
+
+        satir_sayisi = 0
+        if os.path.exists(self.yol):
+            with open(self.yol, 'r', encoding='utf-8') as f:
+                for satir in f:
+                    try:
+                        kayit = json.loads(satir)
+                    except ValueError:
+                        # Çökme anında yarım yazılmış son satır
+                        continue
+                    satir_sayisi += 1
+                    self.kayitlar[kayit['dosya']] = {**self.kayitlar.get(kayit['dosya'], {}), **kayit}
+
+        if satir_sayisi > 2 * len(self.kayitlar) + 100:
+            self.sikistir()
+
+    def _ekle(self, kayit):
+        with self.kilit:
+            self.kayitlar[kayit['dosya']] = {**self.kayitlar.get(kayit['dosya'], {}), **kayit}
+            with open(self.yol, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(kayit, ensure_ascii=False) + '\n')
+
+    def sifirla(self):
+        """Tüm kayıtları unut: dosyalar baştan işlenir (eski satırları yeni kayıtlar geçersiz kılar)"""
+        with self.kilit:
+            self.kayitlar.clear()
+
+    def sikistir(self):
+        """Manifestoyu dosya başına tek satır olacak şekilde yeniden yaz"""
+        with self.kilit:
+            gecici = self.yol + '.tmp'
+            with open(gecici, 'w', encoding='utf-8') as f:
+                for kayit in self.kayitlar.values():
+                    f.write(json.dumps(kayit, ensure_ascii=False) + '\n')
+            os.replace(gecici, self.yol)
+
+    def onceki_kayit(self, dosya_yolu):
+        """Dosya son başarılı işlemden (aynı çıkarıcı sürümüyle) beri değişmediyse kaydını döndür, yoksa None
+
+        Kaydedilen yanıt artık yerinde değilse kayıt yanıtsız ('cikti' None) döner.
+        """
+        kayit = self.kayitlar.get(os.path.basename(dosya_yolu))
+        if not kayit or kayit.get('durum') != DURUM_TAMAM or kayit.get('surum') != self.surum:
+            return None
+        try:
+            st = os.stat(dosya_yolu)
+        except OSError:
+            return None
+        if st.st_size != kayit.get('boyut') or st.st_mtime_ns != kayit.get('mtime_ns'):
+            return None
+        if kayit.get('cikti') and not cikti_mevcut_mu(kayit['cikti']):
+            return dict(kayit, cikti=None)
+        return kayit
+
+    def analiz_yaz(self, dosya_yolu, durum, bilgiler=None, hata=None, ozet=None):
+        """Dosyanın analiz sonucunu ekle (yeniden analizde eski yanıt yolu düşer)"""
+        try:
+            st = os.stat(dosya_yolu)
+            boyut, mtime_ns = st.st_size, st.st_mtime_ns
+        except OSError:
+            boyut = mtime_ns = None
+        self._ekle({
+            'dosya': os.path.basename(dosya_yolu), 'boyut': boyut, 'mtime_ns': mtime_ns,
+            'ozet': ozet, 'surum': self.surum, 'durum': durum, 'bilgiler': bilgiler, 'hata': hata, 'cikti': None
+        })
+
+    def cikti_yaz(self, dosya_yolu, cikti):
+        """Dosya için kaydedilen yanıtın yolunu ekle"""
+        self._ekle({'dosya': os.path.basename(dosya_yolu), 'cikti': cikti})
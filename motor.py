@@ -0,0 +1,1341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TBB Yazı Otomatik Yanıtlama Sistemi - İşlem Motoru
+Arayüzden bağımsız bilgi çıkarma, müşteri sorgulama, belge oluşturma ve raporlama
+"""
+
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+
+from gecmis import GECMIS_PARTI, SonucDeposu
+from kimlik_dogrulama import GECERSIZ, sorgu_birlestir, tckn_gecerli_mi, vkn_gecerli_mi
+from manifest import DURUM_HATA, DURUM_TAMAM, IslemManifesti
+from onbellek import VARSAYILAN_AZAMI_BOYUT, CikarimOnbellegi, dosya_ozeti
+from sablon import DocxSablonu
+
+
+def kurulu_mu(modul):
+    """Modülü yüklemeden kurulu olup olmadığını denetle"""
+    try:
+        return importlib.util.find_spec(modul) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# Ağır kütüphaneler (python-docx, pandas/numpy, PDF) açılışta yüklenmez; yalnızca
+# bulunup bulunmadıkları denetlenir, ilk kullanıldıkları işlevde import edilirler
+DOCX_AVAILABLE = kurulu_mu('docx')
+PANDAS_AVAILABLE = kurulu_mu('pandas') and kurulu_mu('numpy')
+
+# PDF kütüphaneleri (tercih sırasıyla)
+PDF_KUTUPHANELERI = ['fitz', 'pdfplumber', 'PyPDF2']
+PDF_LIB = next((ad for ad in PDF_KUTUPHANELERI if kurulu_mu(ad)), None)
+
+
+DESTEKLENEN_UZANTILAR = ['.docx', '.pdf', '.txt']
+MUSTERI_LISTESI_ADLARI = ["musteri_listesi.xlsx", "musteri_listesi.csv", "musteriler.xlsx"]
+ONBELLEK_DOSYASI = "tbb_onbellek.db"
+GECMIS_DOSYASI = "tbb_gecmis.db"
+SABLON_DOSYASI = "yanit_sablonu.docx"
+
+# dosya_oku / bilgi_cikar kuralları değiştiğinde artırın: eski önbellek kayıtları geçersiz olur
+CIKARICI_SURUMU = 5
+
+
+def uygulama_dizini():
+    """EXE'nin (veya betiğin) bulunduğu dizini bul"""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+# ==================== BİLGİ ÇIKARMA ====================
+
+# Desenler modül yüklenirken bir kez derlenir. Alanlar ayrı desenlerle aranır:
+# hepsini tek adlandırılmış gruplu alternation'da birleştirmek her konumda tüm
+# dalları denediğinden daha yavaştır (ölçümde ~1.8 kat) ve sayı desenlerinin
+# sırasını (metindeki konum değil, desen önceliği) koruyamaz. Tarih ve sayı
+# aramaları ilk eşleşmede durur; metnin tamamı yalnızca kimlik için taranır.
+KURUM_ANAHTAR = ['başkanlığı', 'müdürlüğü', 'dairesi', 'komutanlığı',
+                 'savcılığı', 'mahkemesi', 'kaymakamlığı', 'valiliği',
+                 'defterdarlığı', 'bakanlığı', 'kurumu', 'idaresi']
+# Tüm anahtar kelimeler satır başına tek taramada aranır
+KURUM_DESENI = re.compile('|'.join(re.escape(k) for k in KURUM_ANAHTAR))
+TARIH_DESENI = re.compile(r'(\d{2}[./]\d{2}[./]\d{4})')
+# (desen, alınacak grup) - sıra önemli, ilk uyan geçerli
+SAYI_DESENLERI = [
+    (re.compile(r'[Ss]ayı\s*:\s*([A-Za-z0-9\-\[\]\(\)\s\.\/]+?)(?:\n|$)'), 1),
+    (re.compile(r'E-\d+[-\.\d\[\]]+'), 0),
+    (re.compile(r'\d{5,}[-\.\d\[\]]+\s*[-–]\s*\d+'), 0),
+]
+# 10 (VKN) ve 11 (TCKN) haneli sayılar tek geçişte. \b(\d{10,11})\b ile aynı
+# eşleşmeler; desen rakamla başladığı için re rakam olmayan konumları hızla atlar
+# (\b ile başlayan desen her konumda denenir, 4 KB'lık yazıda ~3 kat yavaş)
+KIMLIK_DESENI = re.compile(r'(\d(?<!\w\d)\d{9,10})(?!\w)')
+# TCKN'nin hemen ardından gelen ad soyad
+TCKN_ADSOYAD_DESENI = re.compile(r"\s*(?:T\.?C\.?\s*)?(?:Kimlik\s*)?(?:Numaralı)?\s*([A-ZÇĞİÖŞÜa-zçğıöşü]+\s+[A-ZÇĞİÖŞÜa-zçğıöşü]+)")
+# Herhangi bir kimliğin (TCKN / VKN) hemen ardından gelen ad
+# (ad yoksa "Kimlik Numaralı" gibi kalıp sözcükleri ad sanılmasın)
+KIMLIK_ADSOYAD_DESENI = re.compile(r"\s*(?:T\.?C\.?\s*)?(?:Vergi\s*)?(?:Kimlik\s*)?(?:Numaralı)?\s*"
+                                   r"(?!(?:Vergi|Kimlik|Numaralı)\b)([A-ZÇĞİÖŞÜa-zçğıöşü]+\s+[A-ZÇĞİÖŞÜa-zçğıöşü]+)")
+ADSOYAD_DESENI = re.compile(r'([A-ZÇĞİÖŞÜ][a-zçğıöşü]+\s+[A-ZÇĞİÖŞÜ][A-Za-zçğıöşü]+)(?:\s+adlı|\s+isimli|\'[ıiuü]n)')
+
+
+def bilgi_cikar(icerik):
+    """Yazıdan tüm gerekli bilgileri çıkar"""
+    bilgiler = {
+        'muhatap_kurum': '', 'muhatap_alt1': '', 'muhatap_alt2': '',
+        'tarih': '', 'sayi': '', 'tckn': '', 'vkn': '', 'adsoyad': '',
+        'kimlikler': [], 'supheli_kimlikler': [], 'elenen_adaylar': {'tckn': 0, 'vkn': 0}
+    }
+
+    # Muhatap kurumları bul (yalnızca ilk 15 satır)
+    kurum_satirlari = []
+    for satir in icerik.split('\n', 15)[:15]:
+        satir_temiz = satir.strip()
+        if len(satir_temiz) > 3 and KURUM_DESENI.search(satir_temiz.lower()):
+            kurum_satirlari.append(satir_temiz)
+            if len(kurum_satirlari) == 3:
+                break
+
+    for alan, satir in zip(('muhatap_kurum', 'muhatap_alt1', 'muhatap_alt2'), kurum_satirlari):
+        bilgiler[alan] = satir
+
+    # Tarih bul
+    tarih_match = TARIH_DESENI.search(icerik)
+    if tarih_match:
+        bilgiler['tarih'] = tarih_match.group(1).replace('/', '.')
+
+    # Sayı numarası bul
+    for desen, grup in SAYI_DESENLERI:
+        sayi_match = desen.search(icerik)
+        if sayi_match:
+            sayi = sayi_match.group(grup).strip()
+            if len(sayi) > 5:
+                bilgiler['sayi'] = sayi
+                break
+
+    # Tüm TCKN (11 hane) ve VKN adayları (10 hane) tek geçişte, metindeki sırayla;
+    # sağlaması tutmayanlar (telefon, dosya no vb.) kimliklerden elenir ve
+    # sayılır, ama şüpheli olarak ayrıca tutulur: müşteri listesinde varlarsa
+    # eşleşirler. Her kimliğin adı, ardından ad gelen ilk geçişinden alınır
+    tcknler, vkn_adaylari, supheliler = {}, {}, {}
+    for eslesme in KIMLIK_DESENI.finditer(icerik):
+        kimlik = eslesme.group(1)
+        if kimlik in supheliler:
+            adaylar = supheliler
+        else:
+            adaylar = tcknler if len(kimlik) == 11 else vkn_adaylari
+            if kimlik not in adaylar and not (tckn_gecerli_mi(kimlik) if len(kimlik) == 11
+                                              else vkn_gecerli_mi(kimlik)):
+                adaylar = supheliler
+        if adaylar.get(kimlik):
+            continue
+        ad = KIMLIK_ADSOYAD_DESENI.match(icerik, eslesme.end())
+        adaylar[kimlik] = ad.group(1).strip() if ad else ''
+    bilgiler['elenen_adaylar'] = {'tckn': sum(1 for k in supheliler if len(k) == 11),
+                                  'vkn': sum(1 for k in supheliler if len(k) == 10)}
+
+    # VKN: bir TCKN'nin ilk 10 hanesiyle aynı olmayan 10 haneli sayılar
+    tckn_onekleri = {tckn[:10] for tckn in tcknler}
+    vknler = {vkn: ad for vkn, ad in vkn_adaylari.items() if vkn not in tckn_onekleri}
+    tckn_onekleri.update(k[:10] for k in supheliler if len(k) == 11)
+    bilgiler['supheli_kimlikler'] = [{'tur': 'tckn' if len(k) == 11 else 'vkn', 'kimlik': k, 'adsoyad': ad}
+                                     for k, ad in supheliler.items() if k not in tckn_onekleri]
+
+    bilgiler['tckn'] = next(iter(tcknler), '')
+    bilgiler['vkn'] = next(iter(vknler), '')
+    bilgiler['kimlikler'] = (
+        [{'tur': 'tckn', 'kimlik': k, 'adsoyad': ad} for k, ad in tcknler.items()] +
+        [{'tur': 'vkn', 'kimlik': k, 'adsoyad': ad} for k, ad in vknler.items()]
+    )
+
+    # Ad Soyad bul: TCKN'nin geçtiği ilk yerden sonra gelen iki kelime
+    tckn = bilgiler['tckn']
+    if tckn:
+        konum = icerik.find(tckn)
+        while konum != -1:
+            match = TCKN_ADSOYAD_DESENI.match(icerik, konum + len(tckn))
+            if match:
+                bilgiler['adsoyad'] = match.group(1).strip()
+                break
+            konum = icerik.find(tckn, konum + 1)
+
+    if not bilgiler['adsoyad']:
+        match = ADSOYAD_DESENI.search(icerik)
+        if match:
+            bilgiler['adsoyad'] = match.group(1).strip()
+
+    return bilgiler
+
+
+# ==================== DOSYA OKUMA ====================
+
+# Erken durma kontrolü yapılan en fazla sayfa; sonrası kontrolsüz sonuna kadar okunur
+ERKEN_DURMA_SAYFA_SINIRI = 5
+
+
+def alanlar_tamam_mi(bilgiler):
+    """Sonraki sayfaların değiştiremeyeceği zorunlu alanların hepsi bulundu mu?"""
+    return bool(bilgiler['tarih'] and bilgiler['sayi'] and bilgiler['adsoyad']
+                and (bilgiler['tckn'] or bilgiler['vkn']))
+
+
+def pdf_sayfalari(dosya_yolu):
+    """PDF sayfalarının metnini tek tek (tembel) üret"""
+    if PDF_LIB == 'fitz':
+        import fitz
+        doc = fitz.open(dosya_yolu)
+        try:
+            for sayfa in doc:
+                yield sayfa.get_text()
+        finally:
+            doc.close()
+    elif PDF_LIB == 'pdfplumber':
+        import pdfplumber
+        with pdfplumber.open(dosya_yolu) as pdf:
+            for sayfa in pdf.pages:
+                t = sayfa.extract_text()
+                if t:
+                    yield t + "\n"
+    elif PDF_LIB == 'PyPDF2':
+        from PyPDF2 import PdfReader
+        reader = PdfReader(dosya_yolu)
+        for sayfa in reader.pages:
+            t = sayfa.extract_text()
+            if t:
+                yield t + "\n"
+
+
+def pdf_oku(dosya_yolu, erken_dur=False):
+    """PDF dosyasını oku
+
+    erken_dur=True ise sayfalar tek tek okunur; zorunlu alanların hepsi
+    bulunduktan sonra kimlik bölümü bitene, yani kimlik adayı (10-11 haneli
+    sayı) içermeyen ilk sayfaya kadar okunup durulur (ilk
+    ERKEN_DURMA_SAYFA_SINIRI sayfa içinde). Böylece sonraki sayfalara taşan
+    kimlik listeleri kesilmez. Aksi halde belgenin tamamı okunur.
+    """
+    if not PDF_LIB:
+        return "[PDF desteği yok. PDF okumak için PyMuPDF gerekli.]"
+
+    parcalar = []
+    tamam = False
+    try:
+        sayfalar = pdf_sayfalari(dosya_yolu)
+        try:
+            for i, parca in enumerate(sayfalar):
+                parcalar.append(parca)
+                if not erken_dur or i >= ERKEN_DURMA_SAYFA_SINIRI:
+                    continue
+                if not tamam:
+                    tamam = alanlar_tamam_mi(bilgi_cikar(''.join(parcalar)))
+                if tamam and not KIMLIK_DESENI.search(parca):
+                    break
+        finally:
+            sayfalar.close()
+    except Exception as e:
+        return f"[PDF okuma hatası: {str(e)}]"
+
+    metin = ''.join(parcalar)
+    return metin if metin.strip() else "[PDF'den metin çıkarılamadı]"
+
+
+def dosya_oku(dosya_yolu, erken_dur=False):
+    """Dosya içeriğini oku (erken_dur yalnızca PDF'lerde etkilidir, bkz. pdf_oku)"""
+    uzanti = os.path.splitext(dosya_yolu)[1].lower()
+    try:
+        if uzanti == '.docx':
+            from docx import Document
+            doc = Document(dosya_yolu)
+            return '\n'.join([p.text for p in doc.paragraphs])
+        elif uzanti == '.pdf':
+            return pdf_oku(dosya_yolu, erken_dur)
+        elif uzanti == '.txt':
+            with open(dosya_yolu, 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read()
+        else:
+            return f"[Desteklenmeyen format: {uzanti}]"
+    except Exception as e:
+        return f"[Dosya okuma hatası: {str(e)}]"
+
+
+def okuma_hatasi_mi(icerik):
+    """dosya_oku / pdf_oku'nun köşeli parantezli hata ve uyarı metinlerini ayırt et"""
+    return icerik.startswith('[') and icerik.rstrip().endswith(']')
+
+
+def klasor_tara(klasor):
+    """Klasördeki desteklenen yazı dosyalarını listele"""
+    dosyalar = []
+    for dosya in os.listdir(klasor):
+        if os.path.splitext(dosya)[1].lower() in DESTEKLENEN_UZANTILAR:
+            dosyalar.append(os.path.join(klasor, dosya))
+    return dosyalar
+
+
+# ==================== MÜŞTERİ LİSTESİ ====================
+
+def musteri_listesi_bul(dizin=None):
+    """Dizindeki (varsayılan: uygulama dizini) müşteri listesi dosyasını bul"""
+    dizin = dizin or uygulama_dizini()
+    for dosya in MUSTERI_LISTESI_ADLARI:
+        tam_yol = os.path.join(dizin, dosya)
+        if os.path.exists(tam_yol):
+            return tam_yol
+    return None
+
+
+# Müşteri listesi bu kadar satırlık parçalarla okunur (bellek üst sınırı)
+MUSTERI_PARCA_SATIRI = 200000
+
+
+def musteri_sutunlari_bul(basliklar):
+    """Başlık satırından (tckn, vkn, ad soyad) sütun sıralarını tespit et; bulunamayan None"""
+    tckn_sutun = vkn_sutun = adsoyad_sutun = None
+    for i, baslik in enumerate(basliklar):
+        c = str(baslik).lower().strip() if baslik is not None else ''
+        if 'tckn' in c or 'tc' in c or 'kimlik' in c:
+            tckn_sutun = i
+        elif 'vkn' in c or 'vergi' in c:
+            vkn_sutun = i
+        elif 'ad' in c or 'isim' in c or 'müşteri' in c or 'soyad' in c:
+            adsoyad_sutun = i
+
+    if tckn_sutun is None and vkn_sutun is None:
+        tckn_sutun = 0
+    return tckn_sutun, vkn_sutun, adsoyad_sutun
+
+
+def _hucre_metni(deger):
+    """XLSX hücre değerini read_excel(dtype=str) gibi metne çevir"""
+    if deger is None or isinstance(deger, str):
+        return deger
+    if isinstance(deger, float) and deger.is_integer():
+        return str(int(deger))
+    return str(deger)
+
+
+def _xlsx_parcalari(dosya_yolu, parca_satiri):
+    """XLSX'i openpyxl salt okunur kipte akıtarak (başlıklar, satır parçaları) üret"""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(dosya_yolu, read_only=True, data_only=True)
+    try:
+        satirlar = wb.worksheets[0].iter_rows(values_only=True)
+        basliklar = next(satirlar, ())
+        yield basliklar
+        parca = []
+        for satir in satirlar:
+            # Biçimlendirilmiş boş satırlar (read_excel de atlar)
+            if all(h is None for h in satir):
+                continue
+            parca.append(satir)
+            if len(parca) >= parca_satiri:
+                yield parca
+                parca = []
+        if parca:
+            yield parca
+    finally:
+        wb.close()
+
+
+def musteri_tablosu_oku(dosya_yolu, derleyici, parca_satiri=MUSTERI_PARCA_SATIRI):
+    """Müşteri listesini parça parça okuyup kimlik ve adları derleyiciye ver
+
+    Sütunlar önce başlıktan tespit edilir; yalnızca o sütunlar okunur (CSV için
+    pandas parça okuyucu, XLSX için openpyxl salt okunur kip). Tespit edilen
+    sütun adlarını döndürür.
+    """
+    import pandas as pd
+
+    uzanti = os.path.splitext(dosya_yolu)[1].lower()
+    if uzanti == '.csv':
+        basliklar = list(pd.read_csv(dosya_yolu, nrows=0).columns)
+    elif uzanti in ('.xlsx', '.xlsm'):
+        xlsx = _xlsx_parcalari(dosya_yolu, parca_satiri)
+        basliklar = list(next(xlsx))
+    else:
+        basliklar = list(pd.read_excel(dosya_yolu, nrows=0).columns)
+
+    sutunlar = musteri_sutunlari_bul(basliklar)
+    secili = sorted({i for i in sutunlar if i is not None})
+
+    def ekle(parca):
+        # parca: sütunları sütun sırası olan DataFrame
+        derleyici.ekle(len(parca), *(parca[i] if i is not None else None for i in sutunlar))
+
+    if uzanti == '.csv':
+        okuyucu = pd.read_csv(dosya_yolu, usecols=secili, dtype=str, chunksize=parca_satiri)
+        for parca in okuyucu:
+            parca.columns = secili
+            ekle(parca)
+    elif uzanti in ('.xlsx', '.xlsm'):
+        for satirlar in xlsx:
+            ekle(pd.DataFrame({i: [_hucre_metni(s[i]) if i < len(s) else None for s in satirlar]
+                               for i in secili}))
+    else:
+        # .xls vb.: pandas üzerinden, yine yalnızca gerekli sütunlar
+        parca = pd.read_excel(dosya_yolu, usecols=secili, dtype=str)
+        parca.columns = secili
+        ekle(parca)
+
+    return {
+        ad: str(basliklar[i]).lower().strip() if i is not None else None
+        for ad, i in zip(('tckn_sutun', 'vkn_sutun', 'adsoyad_sutun'), sutunlar)
+    }
+
+
+def musteri_listesi_oku(dosya_yolu):
+    """Müşteri listesinin derlenmiş indeksini aç (bkz. musteri_indeksi)
+
+    İndeks kaynağın yanında tutulur ve yalnızca kaynak değiştiğinde yeniden
+    derlenir; sonraki açılışlar dosyayı bellek eşleyerek milisaniyeler sürer.
+    """
+    from musteri_indeksi import musteri_indeksi_ac
+
+    return musteri_indeksi_ac(dosya_yolu, lambda derleyici: musteri_tablosu_oku(dosya_yolu, derleyici))
+
+
+def musteri_sorgula(musteri_listesi, tckn=None, vkn=None):
+    """(müşteri mi, listedeki ad soyad) döndür; liste yoksa (None, None)"""
+    if musteri_listesi is None:
+        return None, None
+    return musteri_listesi.sorgula(tckn, vkn)
+
+
+def musteri_toplu_sorgula(musteri_listesi, tcknler, vknler):
+    """Tüm kimlikleri tek vektörel aramada sorgula; (müşteri mi listesi, ad listesi) döndür"""
+    if musteri_listesi is None:
+        return [None] * len(tcknler), [None] * len(tcknler)
+    return musteri_listesi.toplu_sorgula(tcknler, vknler)
+
+
+class MusteriListesiTakibi:
+    """Müşteri listesini bellekte tutar; dosyası değişince yeniden yükler
+
+    Uzun süre çalışan modlar (izleme, servis) içindir. Dosya en çok
+    DENETIM_ARALIGI saniyede bir denetlenir; yeniden yükleme başarısız olursa
+    önceki liste kullanılmaya devam edilir. kayit: log satırı yazan işlev.
+    """
+
+    DENETIM_ARALIGI = 2.0
+
+    def __init__(self, yol, kayit=print):
+        self.yol = yol
+        self.kayit = kayit
+        self.kilit = threading.Lock()
+        self.liste = None
+        self.zaman = None
+        self.son_denetim = None
+
+    def guncel(self):
+        """Güncel listeyi döndür; ilk yükleme başarısızsa hatayı yükselt"""
+        with self.kilit:
+            simdi = time.monotonic()
+            if self.liste is not None and simdi - self.son_denetim < self.DENETIM_ARALIGI:
+                return self.liste
+            self.son_denetim = simdi
+            try:
+                zaman = os.path.getmtime(self.yol)
+                if zaman != self.zaman:
+                    liste = musteri_listesi_oku(self.yol)
+                    self.liste, self.zaman = liste, zaman
+                    self.kayit(f"Müşteri listesi yüklendi: {self.yol} ({len(liste)} kayıt)")
+            except Exception as e:
+                if self.liste is None:
+                    raise
+                self.kayit(f"[UYARI] Müşteri listesi yenilenemedi, önceki liste kullanılıyor: {e}")
+            return self.liste
+
+
+# ==================== BELGE OLUŞTURMA ====================
+
+KIMLIK_TIPLERI = {'tckn': "T.C. Kimlik Numaralı", 'vkn': "Vergi Kimlik Numaralı"}
+
+
+def yanit_metinleri(muhatap_kurum, muhatap_alt1, muhatap_alt2, tarih, sayi, tckn, vkn, adsoyad, musteri_durumu,
+                    kimlikler=None):
+    """Yanıt belgesindeki değişken metinleri hesapla
+
+    kimlikler (tur / kimlik / adsoyad sözlükleri) birden fazlaysa metin
+    hepsini tek tek sayar; aksi halde tckn / vkn / adsoyad kullanılır.
+    """
+    kimlik = tckn if tckn else vkn
+    kimlik_tipi = "T.C. Kimlik Numaralı" if tckn else "Vergi Kimlik Numaralı"
+
+    if kimlikler and len(kimlikler) > 1:
+        metin = ("İlgi'de kayıtlı yazınıza istinaden Bankamız nezdinde gerekli araştırma yapılmış olup, "
+                 "aşağıda kimlik numaraları belirtilen")
+        if "DEĞİL" in musteri_durumu.upper():
+            metin += f" {len(kimlikler)} kişi/kurumun Bankamız müşterisi olmadığı tespit edilmiştir:"
+        else:
+            metin += f" {len(kimlikler)} kişi/kurum ile ilgili gerekli işlemler yapılmaktadır:"
+        for sira, k in enumerate(kimlikler, 1):
+            metin += f"\n{sira}. {k['kimlik']} {KIMLIK_TIPLERI[k['tur']]}"
+            if k['adsoyad']:
+                metin += f" {k['adsoyad']}"
+    elif "DEĞİL" in musteri_durumu.upper():
+        metin = f"İlgi'de kayıtlı yazınıza istinaden Bankamız nezdinde gerekli araştırma yapılmış olup, {kimlik} {kimlik_tipi}"
+        if adsoyad:
+            metin += f" {adsoyad}'ın"
+        metin += " Bankamız müşterisi olmadığı tespit edilmiştir."
+    else:
+        metin = f"İlgi'de kayıtlı yazınıza istinaden Bankamız nezdinde gerekli araştırma yapılmış olup, {kimlik} {kimlik_tipi}"
+        if adsoyad:
+            metin += f" {adsoyad}"
+        metin += " ile ilgili gerekli işlemler yapılmaktadır."
+
+    return {
+        'kurumlar': [kurum.upper() for kurum in [muhatap_kurum, muhatap_alt1, muhatap_alt2] if kurum],
+        'tarih': tarih or datetime.now().strftime("%d.%m.%Y"),
+        'ilgi': f"İlgi: {tarih} tarihli ve {sayi} sayılı yazınız.",
+        'metin': metin,
+    }
+
+
+def _belge_iskeleti(kurumlar, tarih, ilgi, metin):
+    """Yanıt belgesini verilen metinlerle python-docx üzerinden kur"""
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt
+
+    doc = Document()
+
+    # Stil
+    style = doc.styles['Normal']
+    style.font.name = 'Times New Roman'
+    style.font.size = Pt(12)
+
+    # T.C.
+    p = doc.add_paragraph()
+    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    p.add_run("T.C.").bold = True
+
+    # Muhatap kurumları
+    for kurum in kurumlar:
+        pk = doc.add_paragraph()
+        pk.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        pk.add_run(kurum).bold = True
+
+    # Tarih
+    pt = doc.add_paragraph()
+    pt.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    pt.add_run(tarih)
+
+    # İlgi
+    doc.add_paragraph()
+    doc.add_paragraph(ilgi)
+
+    # Ana metin
+    doc.add_paragraph()
+    doc.add_paragraph(metin)
+
+    # Kapanış
+    doc.add_paragraph()
+    doc.add_paragraph("Bilgilerinize arz ederiz.")
+    doc.add_paragraph()
+    doc.add_paragraph("Saygılarımızla,")
+    doc.add_paragraph()
+
+    pi1 = doc.add_paragraph()
+    pi1.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    pi1.add_run("AYTEMİZ YATIRIM BANKASI A.Ş.").bold = True
+
+    pi2 = doc.add_paragraph()
+    pi2.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    pi2.add_run("Genel Müdürlük").bold = True
+
+    return doc
+
+
+def belge_olustur(muhatap_kurum, muhatap_alt1, muhatap_alt2, tarih, sayi, tckn, vkn, adsoyad, musteri_durumu,
+                  kimlikler=None):
+    """Word belgesi oluştur"""
+    return _belge_iskeleti(**yanit_metinleri(
+        muhatap_kurum, muhatap_alt1, muhatap_alt2, tarih, sayi, tckn, vkn, adsoyad, musteri_durumu, kimlikler))
+
+
+# Şablon yer tutucuları (yanit_sablonu.docx hazırlanırken de bunlar kullanılır)
+SABLON_KURUMLARI = ['KURUM1', 'KURUM2', 'KURUM3']
+_sablon = None
+_sablon_kilidi = threading.Lock()
+
+
+def yanit_sablonu():
+    """Yanıt şablonunu (ilk çağrıda bir kez) yükle
+
+    Uygulama dizininde SABLON_DOSYASI varsa o kullanılır; yoksa şablon
+    belge_olustur ile aynı iskeletten yer tutucularla üretilir.
+    """
+    global _sablon
+    with _sablon_kilidi:
+        if _sablon is None:
+            yol = os.path.join(uygulama_dizini(), SABLON_DOSYASI)
+            if os.path.exists(yol):
+                with open(yol, 'rb') as f:
+                    veri = f.read()
+            else:
+                tampon = io.BytesIO()
+                _belge_iskeleti([f"{{{{{k}}}}}" for k in SABLON_KURUMLARI],
+                                "{{TARIH}}", "{{ILGI}}", "{{METIN}}").save(tampon)
+                veri = tampon.getvalue()
+            _sablon = DocxSablonu(veri)
+        return _sablon
+
+
+def belge_baytlari(muhatap_kurum, muhatap_alt1, muhatap_alt2, tarih, sayi, tckn, vkn, adsoyad, musteri_durumu,
+                   kimlikler=None):
+    """Yanıt belgesini DOCX baytları olarak üret (şablondan; olmazsa python-docx ile)"""
+    metinler = yanit_metinleri(muhatap_kurum, muhatap_alt1, muhatap_alt2, tarih, sayi, tckn, vkn, adsoyad,
+                               musteri_durumu, kimlikler)
+    degerler = {'TARIH': metinler['tarih'], 'ILGI': metinler['ilgi'], 'METIN': metinler['metin']}
+    degerler.update(zip(SABLON_KURUMLARI, metinler['kurumlar']))
+    veri = yanit_sablonu().doldur(degerler)
+    if veri is None:
+        # Satır sonu / sekme içeren alanlar (ör. çok kimlikli metin): python-docx bunları ayrı öğelere çevirir
+        tampon = io.BytesIO()
+        _belge_iskeleti(**metinler).save(tampon)
+        veri = tampon.getvalue()
+    return veri
+
+
+def belge_yaz(belge, dosya_yolu):
+    """Belgeyi (DOCX baytları ya da python-docx Document) dosyaya yaz"""
+    if isinstance(belge, bytes):
+        with open(dosya_yolu, 'wb') as f:
+            f.write(belge)
+    else:
+        belge.save(dosya_yolu)
+
+
+def yanit_dosya_adi(yanit):
+    """Yanıt belgesi için dosya adı üret
+
+    Aynı gün aynı kimlik için gelen yazıların yanıtları birbirini ezmesin diye
+    ada kaynak dosya adının kısa özeti eklenir; aynı yazı için ad hep aynıdır.
+    """
+    kimlik = yanit['tckn'] if yanit['tckn'] else yanit['vkn']
+    kaynak = hashlib.sha256(os.path.basename(yanit['dosya']).encode('utf-8')).hexdigest()[:8]
+    return f"Yanit_{kimlik}_{datetime.now().strftime('%Y%m%d')}_{kaynak}.docx"
+
+
+# ==================== TOPLU İŞLEM ====================
+
+# Paralel analizde süreç başına havuzda bekletilen en fazla dosya
+ANALIZ_PENCERESI = 4
+# Akış halinde müşteri eşleştirmesi bu kadar sonuçluk (ya da bu kadar saniyelik) parçalarla yapılır
+ESLESTIRME_PARTI = 256
+ESLESTIRME_BEKLEMESI = 0.5
+# Bundan az sonuç için vektörel sorgunun hazırlığı tekil sorgulardan pahalıdır
+TOPLU_SORGU_ESIGI = 8
+
+
+def varsayilan_is_sayisi():
+    """Paralel analiz için varsayılan süreç sayısı (çekirdek sayısı)"""
+    return os.cpu_count() or 1
+
+
+def onbellek_ac(yol=None, azami_boyut=VARSAYILAN_AZAMI_BOYUT):
+    """Çıkarım önbelleğini aç (varsayılan: uygulama dizini); açılamazsa None döndür"""
+    try:
+        return CikarimOnbellegi(yol or os.path.join(uygulama_dizini(), ONBELLEK_DOSYASI),
+                                CIKARICI_SURUMU, azami_boyut)
+    except Exception:
+        return None
+
+
+def gecmis_ac(yol=None):
+    """Sonuç geçmişi veritabanını aç (varsayılan: uygulama dizini); açılamazsa None döndür"""
+    try:
+        return SonucDeposu(yol or os.path.join(uygulama_dizini(), GECMIS_DOSYASI))
+    except Exception:
+        return None
+
+
+def manifest_ac(klasor):
+    """Girdi klasörünün işlem manifestosunu aç; açılamazsa None döndür"""
+    try:
+        return IslemManifesti(klasor, CIKARICI_SURUMU)
+    except Exception:
+        return None
+
+
+def dosya_cikar(dosya_yolu, erken_dur=False):
+    """Dosyayı oku ve bilgileri çıkar; (metin, bilgiler, süreler) döndür (işçi süreçlerde de çalışır)
+
+    süreler: aşama -> saniye; okuma aşaması PDF'lerde 'pdf_oku', diğerlerinde 'dosya_oku'
+    """
+    bas = time.perf_counter()
+    icerik = dosya_oku(dosya_yolu, erken_dur)
+    okundu = time.perf_counter()
+    bilgiler = bilgi_cikar(icerik)
+    okuma = 'pdf_oku' if dosya_yolu.lower().endswith('.pdf') else 'dosya_oku'
+    return icerik, bilgiler, {okuma: okundu - bas, 'bilgi_cikar': time.perf_counter() - okundu}
+
+
+def _olc(olcum, asama, dosya=None):
+    """olcum (olcum.AsamaOlcumu) verilmişse aşama ölçümü, verilmemişse boş bağlam"""
+    return olcum.olc(asama, dosya) if olcum is not None else nullcontext()
+
+
+def _cikarim_olcumu_isle(olcum, dosya_yolu, sureler):
+    """dosya_cikar sürelerini ve okunan baytı ölçüme ekle"""
+    try:
+        boyut = os.path.getsize(dosya_yolu)
+    except OSError:
+        boyut = 0
+    for asama, sure in sureler.items():
+        olcum.kaydet(asama, sure, dosya_yolu, okunan=boyut if asama != 'bilgi_cikar' else 0)
+
+
+def _hazirla(dosya_yolu, onbellek, manifest, erken_dur=False):
+    """(manifest kaydı, içerik özeti, önbellek kaydı) döndür
+
+    Önceki çalıştırmadan beri değişmemiş dosyada yalnızca manifest kaydı döner;
+    özet yalnızca önbellek ya da manifesto kullanılıyorsa hesaplanır.
+    """
+    if manifest is not None:
+        onceki = manifest.onceki_kayit(dosya_yolu)
+        if onceki is not None:
+            return onceki, None, None
+    if onbellek is None and manifest is None:
+        return None, None, None
+    try:
+        ozet = dosya_ozeti(dosya_yolu)
+    except OSError:
+        return None, None, None
+    # Erken durmalı okumada metin kısmi olabilir; önbellekte ayrı anahtarla tutulur
+    anahtar = ozet + ':erken' if erken_dur else ozet
+    return None, ozet, onbellek.getir(anahtar) if onbellek is not None else None
+
+
+def musteri_durumu_isle(sonuc, musteri_mi, adsoyad_db):
+    """Müşteri sorgusunun sonucunu sonuç kaydına işle (yazıda ad yoksa listedeki kullanılır)"""
+    sonuc['musteri_mi'] = musteri_mi
+    if adsoyad_db and not sonuc['bilgiler']['adsoyad']:
+        sonuc['bilgiler']['adsoyad'] = str(adsoyad_db)
+        # Liste değişirse geri alınabilsin diye
+        sonuc['adsoyad_listeden'] = True
+
+
+def bilgi_kimlikleri(bilgiler):
+    """Yazıdaki tüm kimlikler (tur / kimlik / adsoyad); eski kayıtlarda birincil TCKN / VKN"""
+    kimlikler = bilgiler.get('kimlikler')
+    if kimlikler is None:
+        kimlikler = [{'tur': tur, 'kimlik': bilgiler[tur], 'adsoyad': bilgiler['adsoyad'] if tur == 'tckn' else ''}
+                     for tur in ('tckn', 'vkn') if bilgiler[tur]]
+    return kimlikler
+
+
+def elenen_aday_sayilari(sonuclar):
+    """Sağlama denetiminde elenen TCKN / VKN adaylarının toplamı"""
+    toplam = {'tckn': 0, 'vkn': 0}
+    for sonuc in sonuclar:
+        for tur, adet in sonuc['bilgiler'].get('elenen_adaylar', {}).items():
+            toplam[tur] += adet
+    return toplam
+
+
+def kimlik_durumlari_olustur(kimlikler, supheliler, sorgular):
+    """Kimliklerin müşteri durumları; sorgular kimlikler + supheliler sırasıyla (müşteri mi, ad)
+
+    Sağlaması tutmayan adaylardan yalnızca listede bulunanlar ('supheli'
+    işaretiyle) eklenir: okuma hatalı bir kimlik listedeki kayıtla aynı
+    olabilir; bulunamayanlar çoğunlukla telefon, dosya no vb. sayılardır.
+    """
+    durumlar = []
+    for i, (k, (musteri_mi, ad)) in enumerate(zip(kimlikler + supheliler, sorgular)):
+        supheli = i >= len(kimlikler)
+        if supheli and musteri_mi is not True:
+            continue
+        durum = dict(k, adsoyad=k['adsoyad'] or (str(ad) if ad else ''), musteri_mi=musteri_mi)
+        if supheli:
+            durum['supheli'] = True
+        durumlar.append(durum)
+    return durumlar
+
+
+def sonuc_olustur(dosya_yolu, bilgiler, musteri_listesi):
+    """Çıkarılan bilgileri müşteri listesinde sorgulayıp sonuç kaydı oluştur"""
+    sonuc = {
+        'dosya': dosya_yolu,
+        'dosya_adi': os.path.basename(dosya_yolu),
+        'bilgiler': bilgiler,
+        'musteri_mi': None
+    }
+    if musteri_listesi is not None:
+        sonuc_eslestir(sonuc, musteri_listesi)
+    return sonuc
+
+
+def sonuc_eslestir(sonuc, musteri_listesi):
+    """Tek sonucun kimliklerini tekil sorgularla eşleştir (sonuclari_eslestir ile aynı kurallar)
+
+    Tek yazı için vektörel sorgunun dizi hazırlığı, sorgunun kendisinden pahalıdır.
+    """
+    b = sonuc['bilgiler']
+    sorgular = {}
+
+    def sorgula(tur, kimlik):
+        # Birincil TCKN / VKN, kimlik listesinde de olduğundan ikinci kez aranmaz
+        if (tur, kimlik) not in sorgular:
+            sorgular[tur, kimlik] = musteri_sorgula(musteri_listesi, *((kimlik, None) if tur == 'tckn'
+                                                                        else (None, kimlik)))
+        return sorgular[tur, kimlik]
+
+    kimlikler = bilgi_kimlikleri(b)
+    supheliler = b.get('supheli_kimlikler', [])
+    durumlar = kimlik_durumlari_olustur(kimlikler, supheliler,
+                                        [sorgula(k['tur'], k['kimlik']) for k in kimlikler + supheliler])
+    sonuc['kimlik_durumlari'] = durumlar
+
+    # Birincil sorgu: önce TCKN, bulunamazsa VKN (bkz. MusteriIndeksi.sorgula)
+    musteri_mi, adsoyad_db = None, None
+    if musteri_listesi is not None:
+        musteri_mi, adsoyad_db = sorgu_birlestir([sorgula(tur, b[tur]) for tur in ('tckn', 'vkn') if b[tur]])
+        if musteri_mi is not True:
+            musteri_mi = any(d['musteri_mi'] is True for d in durumlar)
+    musteri_durumu_isle(sonuc, musteri_mi, adsoyad_db)
+    return sonuc
+
+
+def sonuclari_eslestir(sonuclar, musteri_listesi):
+    """Tüm sonuçların tüm kimliklerini tek toplu sorguyla eşleştir
+
+    Her kimliğin durumu 'kimlik_durumlari'na yazılır (yazıda adı yoksa
+    listedeki ad kullanılır). Kimliklerinden biri (ya da listede bulunan
+    şüpheli bir adayı) müşteri olan yazı müşteri sayılır; yazının adı ise birincil TCKN / VKN sorgusundan tamamlanır.
+    TOPLU_SORGU_ESIGI'nden az sonuç tekil sorgularla eşleştirilir.
+    """
+    if len(sonuclar) < TOPLU_SORGU_ESIGI:
+        for sonuc in sonuclar:
+            sonuc_eslestir(sonuc, musteri_listesi)
+        return sonuclar
+    tcknler, vknler, adetler = [], [], []
+    for sonuc in sonuclar:
+        b = sonuc['bilgiler']
+        kimlikler = bilgi_kimlikleri(b) + b.get('supheli_kimlikler', [])
+        # Önce birincil sorgu (önce TCKN, bulunamazsa VKN), ardından her kimlik ayrı
+        tcknler.append(b['tckn'])
+        vknler.append(b['vkn'])
+        for k in kimlikler:
+            tcknler.append(k['kimlik'] if k['tur'] == 'tckn' else '')
+            vknler.append(k['kimlik'] if k['tur'] == 'vkn' else '')
+        adetler.append(len(kimlikler))
+    musteri, adlar = musteri_toplu_sorgula(musteri_listesi, tcknler, vknler)
+
+    i = 0
+    for sonuc, adet in zip(sonuclar, adetler):
+        b = sonuc['bilgiler']
+        sonuc['kimlik_durumlari'] = kimlik_durumlari_olustur(
+            bilgi_kimlikleri(b), b.get('supheli_kimlikler', []),
+            list(zip(musteri[i + 1:i + 1 + adet], adlar[i + 1:i + 1 + adet])))
+        musteri_mi = musteri[i]
+        if musteri_listesi is not None and musteri_mi is not True:
+            musteri_mi = any(d['musteri_mi'] is True for d in sonuc['kimlik_durumlari'])
+        musteri_durumu_isle(sonuc, musteri_mi, adlar[i])
+        i += adet + 1
+    return sonuclar
+
+
+def yeniden_eslestir(sonuclar, musteri_listesi):
+    """Sonuçları (dosyaları yeniden okumadan) yeni müşteri listesiyle eşleştir
+
+    Önceki listeden gelen adlar geri alınır, tüm sonuçlar tek toplu sorguyla
+    yeniden eşleştirilir. Müşteri durumu ya da adı değişen sonuçları döndürür.
+    """
+    def durum(s):
+        return s['musteri_mi'], s['bilgiler']['adsoyad'], s.get('kimlik_durumlari')
+
+    once = [durum(s) for s in sonuclar]
+    for sonuc in sonuclar:
+        if sonuc.pop('adsoyad_listeden', False):
+            sonuc['bilgiler']['adsoyad'] = ''
+    sonuclari_eslestir(sonuclar, musteri_listesi)
+    return [s for s, o in zip(sonuclar, once) if durum(s) != o]
+
+
+def dosya_analiz_et(dosya_yolu, musteri_listesi, erken_dur=False):
+    """Tek dosyayı oku, bilgileri çıkar ve müşteri listesinde sorgula"""
+    return sonuc_olustur(dosya_yolu, dosya_cikar(dosya_yolu, erken_dur)[1], musteri_listesi)
+
+
+def analiz_et(dosyalar, musteri_listesi, is_sayisi=1, onbellek=None, manifest=None, erken_dur=False,
+              olcum=None):
+    """Dosyaları analiz et; girdi sırasıyla her dosya için (dosya_yolu, sonuç, hata) üret
+
+    is_sayisi > 1 ise okuma ve bilgi çıkarma süreç havuzunda paralel yapılır;
+    havuzda aynı anda en çok is_sayisi * ANALIZ_PENCERESI dosya bekler, böylece
+    ilk sonuçlar hemen gelir ve bellek klasör boyutuyla büyümez. Müşteri
+    sorgusu ana süreçte, tek indeks üzerinden kalır. Önbellek verilirse
+    içeriği değişmemiş dosyalar hiç ayrıştırılmaz. Manifesto verilirse her dosya
+    bitince kaydedilir ve önceki çalıştırmadan beri değişmemiş dosyaların
+    bilgileri oradan alınır (sonuçta 'onceki' işaretli). erken_dur için bkz. pdf_oku.
+    olcum (olcum.AsamaOlcumu) verilirse okuma, çıkarma ve sorgu süreleri eklenir.
+    """
+    sorgu_olcumu = olcum if musteri_listesi is not None else None
+    havuz = None
+    if is_sayisi > 1 and len(dosyalar) > 1:
+        havuz = ProcessPoolExecutor(max_workers=min(is_sayisi, len(dosyalar)))
+    pencere_boyutu = is_sayisi * ANALIZ_PENCERESI if havuz is not None else 1
+    kalan = iter(dosyalar)
+    pencere = deque()
+
+    def pencereyi_doldur():
+        # Hazırlık (özet, manifesto, önbellek) de pencere içinde, dosya sırası gelince yapılır;
+        # hatası yalnızca o dosyanın hatası olur, sırası gelince üretilir
+        while len(pencere) < pencere_boyutu:
+            d = next(kalan, None)
+            if d is None:
+                return
+            onceki = ozet = kayit = is_ = hazirlik_hatasi = None
+            try:
+                onceki, ozet, kayit = _hazirla(d, onbellek, manifest, erken_dur)
+                # Ne manifestoda ne önbellekte olan dosyalar havuza gönderilir
+                if havuz is not None and onceki is None and kayit is None:
+                    is_ = havuz.submit(dosya_cikar, d, erken_dur)
+            except Exception as e:
+                hazirlik_hatasi = e
+            pencere.append((d, onceki, ozet, kayit, is_, hazirlik_hatasi))
+
+    try:
+        pencereyi_doldur()
+        while pencere:
+            dosya_yolu, onceki, ozet, kayit, is_, hazirlik_hatasi = pencere.popleft()
+            # Sıradaki dosya işlenirken işçiler boş kalmasın: yerine yenisi hemen girer
+            pencereyi_doldur()
+            try:
+                if hazirlik_hatasi is not None:
+                    raise hazirlik_hatasi
+                if onceki is not None:
+                    with _olc(sorgu_olcumu, 'musteri_sorgula', dosya_yolu):
+                        sonuc = sonuc_olustur(dosya_yolu, dict(onceki['bilgiler']), musteri_listesi)
+                    sonuc['onceki'] = True
+                    sonuc['cikti'] = onceki.get('cikti')
+                    yield dosya_yolu, sonuc, None
+                    continue
+
+                if kayit is not None:
+                    icerik, bilgiler = kayit
+                else:
+                    icerik, bilgiler, sureler = is_.result() if is_ is not None else dosya_cikar(dosya_yolu, erken_dur)
+                    if olcum is not None:
+                        _cikarim_olcumu_isle(olcum, dosya_yolu, sureler)
+                    if onbellek is not None and ozet is not None and not okuma_hatasi_mi(icerik):
+                        onbellek.kaydet(ozet + ':erken' if erken_dur else ozet, icerik, bilgiler)
+
+                if manifest is not None:
+                    # Okunamayan dosyalar bir sonraki çalıştırmada yeniden denenir
+                    if okuma_hatasi_mi(icerik):
+                        manifest.analiz_yaz(dosya_yolu, DURUM_HATA, bilgiler, hata=icerik, ozet=ozet)
+                    else:
+                        manifest.analiz_yaz(dosya_yolu, DURUM_TAMAM, bilgiler, ozet=ozet)
+
+                with _olc(sorgu_olcumu, 'musteri_sorgula', dosya_yolu):
+                    sonuc = sonuc_olustur(dosya_yolu, bilgiler, musteri_listesi)
+                yield dosya_yolu, sonuc, None
+            except Exception as e:
+                if manifest is not None:
+                    manifest.analiz_yaz(dosya_yolu, DURUM_HATA, hata=str(e))
+                yield dosya_yolu, None, str(e)
+    finally:
+        # Üretici erken kapatılırsa bekleyen işler başlatılmadan iptal edilir
+        if havuz is not None:
+            havuz.shutdown(wait=True, cancel_futures=True)
+        # Çalıştırmanın önbellek kayıtları ve erişimleri tek işlemle yazılır
+        if onbellek is not None:
+            onbellek.yaz()
+
+
+def parcali_eslestir(analiz, musteri_listesi, parca=ESLESTIRME_PARTI, azami_bekleme=ESLESTIRME_BEKLEMESI,
+                     olcum=None):
+    """Müşteri listesi olmadan çalışan analiz_et akışını parça parça toplu sorguyla eşleştir
+
+    Sonuçlar parca kadar biriktirilir (ya da ilk bekleyenin üzerinden
+    azami_bekleme saniye geçince) ve tek sonuclari_eslestir çağrısıyla
+    eşleştirilip sırayla geçirilir. Akış halinde yanıt kaydı ve arayüz
+    güncellemesi bu sayede toplu sorgudan yararlanır.
+    """
+    bekleyen = []
+    bas = None
+
+    def bosalt():
+        sonuclar = [sonuc for _, sonuc, hata in bekleyen if hata is None]
+        if sonuclar:
+            # Parça sorgusu tek ölçüm olarak (dosyasız) kaydedilir
+            with _olc(olcum, 'musteri_sorgula'):
+                sonuclari_eslestir(sonuclar, musteri_listesi)
+        cikti = list(bekleyen)
+        bekleyen.clear()
+        return cikti
+
+    try:
+        for oge in analiz:
+            if not bekleyen:
+                bas = time.monotonic()
+            bekleyen.append(oge)
+            if len(bekleyen) >= parca or time.monotonic() - bas >= azami_bekleme:
+                yield from bosalt()
+        yield from bosalt()
+    finally:
+        analiz.close()
+
+
+def yanitla_ve_kaydet(analiz, hedef, manifest=None, olcum=None):
+    """analiz_et akışındaki her müşteri olmayan yazının yanıtını hemen kaydet
+
+    hedef bir klasör ya da YanitPaketi olabilir. (dosya_yolu, sonuç, hata)
+    üçlüleri aynen geçirilir. Yanıtı ele alınan
+    sonuca 'yanit_durumu' (DURUM_TAMAM / DURUM_HATA) ile 'cikti' ya da
+    'yanit_hatasi' eklenir; belge bellekte tutulmaz, böylece bellek kullanımı
+    toplu işin boyutundan bağımsız kalır.
+    """
+    try:
+        for dosya_yolu, sonuc, hata in analiz:
+            if hata is None and yanit_bekliyor_mu(sonuc):
+                try:
+                    yanit = yanit_olustur(sonuc, olcum)
+                except Exception as e:
+                    yanit_sonucu_isle(sonuc, hata=str(e))
+                else:
+                    yanit_kaydet_ve_isle(yanit, hedef, manifest, olcum)
+            yield dosya_yolu, sonuc, hata
+    finally:
+        analiz.close()
+
+
+def toplu_analiz(dosyalar, musteri_listesi, is_sayisi=1, onbellek=None, manifest=None, erken_dur=False,
+                 cikti=None, olcum=None, gecmis=None):
+    """Tüm dosyaları analiz et; (sonuçlar, [(dosya_yolu, hata)]) döndür
+
+    Müşteri durumu toplu sorguyla belirlenir: cikti (klasör ya da YanitPaketi)
+    verilirse yanıtlar analizle birlikte kaydedildiğinden sonuçlar parça parça
+    eşleştirilir (bkz. parcali_eslestir, yanitla_ve_kaydet); aksi halde tüm
+    yazılar analizden sonra tek sorguyla eşleştirilir. gecmis
+    (gecmis.SonucDeposu) verilirse biten sonuçlar çalıştırma sürerken
+    GECMIS_PARTI'lık işlemlerle oraya yazılır (bu durumda eşleştirme de parça
+    parçadır); yarıda kalan bir çalıştırmanın biten sonuçları kaybolmaz.
+    """
+    sonuclar, hatalar = [], []
+    parcali = musteri_listesi is not None and (cikti is not None or gecmis is not None)
+    analiz = analiz_et(dosyalar, None, is_sayisi, onbellek, manifest, erken_dur, olcum)
+    if parcali:
+        analiz = parcali_eslestir(analiz, musteri_listesi, olcum=olcum)
+    if cikti is not None:
+        analiz = yanitla_ve_kaydet(analiz, cikti, manifest, olcum)
+    yazilacak = []
+    try:
+        for dosya_yolu, sonuc, hata in analiz:
+            if hata is not None:
+                hatalar.append((dosya_yolu, hata))
+                continue
+            sonuclar.append(sonuc)
+            if gecmis is not None:
+                yazilacak.append(sonuc)
+                if len(yazilacak) >= GECMIS_PARTI:
+                    gecmis.kaydet(yazilacak)
+                    yazilacak = []
+    finally:
+        analiz.close()
+        if yazilacak:
+            gecmis.kaydet(yazilacak)
+    if not parcali and musteri_listesi is not None:
+        # Toplu sorgu tek ölçüm olarak (dosyasız) kaydedilir
+        with _olc(olcum, 'musteri_sorgula'):
+            sonuclari_eslestir(sonuclar, musteri_listesi)
+    return sonuclar, hatalar
+
+
+def yanit_olustur(sonuc, olcum=None):
+    """Müşteri olmayan yazı için yanıt kaydını (belge DOCX baytları dahil) oluştur"""
+    b = sonuc['bilgiler']
+    with _olc(olcum, 'belge_olustur', sonuc['dosya']):
+        belge = belge_baytlari(
+            b['muhatap_kurum'], b['muhatap_alt1'], b['muhatap_alt2'],
+            b['tarih'], b['sayi'], b['tckn'], b['vkn'], b['adsoyad'],
+            "Müşterimiz DEĞİL", sonuc.get('kimlik_durumlari') or bilgi_kimlikleri(b)
+        )
+    return {
+        'dosya': sonuc['dosya'],
+        'dosya_adi': sonuc['dosya_adi'],
+        'tckn': b['tckn'],
+        'vkn': b['vkn'],
+        'belge': belge,
+        'sonuc': sonuc
+    }
+
+
+def kimliksiz_mi(sonuc):
+    """Geçerli kimlik okunamadığı için müşteri durumu belirlenemeyen yazı mı? (manuel inceleme)
+
+    Kimliği hiç okunamayan ya da tüm kimliklerinin sorgusu GECERSIZ olan yazılar.
+    """
+    if sonuc['musteri_mi']:
+        return False
+    durumlar = sonuc.get('kimlik_durumlari') or bilgi_kimlikleri(sonuc['bilgiler'])
+    return all(d.get('musteri_mi') == GECERSIZ for d in durumlar)
+
+
+def yanit_bekliyor_mu(sonuc):
+    """Müşteri olmayan ve önceki bir çalıştırmada yanıtı kaydedilmemiş yazı mı?
+
+    Kimliksiz yazılara otomatik red yanıtı verilmez; manuel incelenirler.
+    """
+    return not sonuc['musteri_mi'] and not sonuc.get('cikti') and not kimliksiz_mi(sonuc)
+
+
+def toplu_yanit_olustur(sonuclar, olcum=None):
+    """Müşteri olmayanlar için (henüz yanıtlanmamışsa) yanıt belgelerini oluştur"""
+    return [yanit_olustur(sonuc, olcum) for sonuc in sonuclar if yanit_bekliyor_mu(sonuc)]
+
+
+def bekleyen_yanitlari_guncelle(yanitlar, degisenler):
+    """Değişen sonuçların kaydedilmemiş yanıtlarını yenile
+
+    Müşteri olanların yanıtı düşer; hâlâ (ya da artık) yanıt bekleyenler için
+    güncel bilgilerle yeni yanıt oluşturulur. Diğer yanıtlara dokunulmaz.
+    """
+    degisen = {id(s) for s in degisenler}
+    kalan = [y for y in yanitlar if id(y['sonuc']) not in degisen]
+    return kalan + toplu_yanit_olustur(degisenler)
+
+
+def yanit_kaydet(yanit, klasor):
+    """Yanıt belgesini klasöre kaydet, kaydedilen yolu döndür
+
+    Belge önce aynı klasörde geçici dosyaya yazılıp sonra yeniden adlandırılır;
+    yarıda kalan bir yazma hiçbir zaman eksik bir .docx bırakmaz.
+    """
+    dosya_yolu = os.path.join(klasor, yanit_dosya_adi(yanit))
+    fd, gecici = tempfile.mkstemp(dir=klasor, prefix='.yanit_', suffix='.tmp')
+    os.close(fd)
+    try:
+        belge_yaz(yanit['belge'], gecici)
+        os.replace(gecici, dosya_yolu)
+    except BaseException:
+        try:
+            os.remove(gecici)
+        except OSError:
+            pass
+        raise
+    return dosya_yolu
+
+
+def yanit_sonucu_isle(sonuc, cikti=None, hata=None):
+    """Yanıt kaydının sonucunu analiz sonucuna işle (rapor ve tablo buradan okur)"""
+    sonuc['yanit_durumu'] = DURUM_HATA if hata is not None else DURUM_TAMAM
+    sonuc['cikti'] = cikti
+    sonuc['yanit_hatasi'] = hata
+
+
+def yanit_kaydet_ve_isle(yanit, hedef, manifest=None, olcum=None):
+    """Yanıtı kaydet, sonucu manifestoya ve analiz sonucuna işle; dosya sonucunu döndür
+
+    hedef bir klasör ya da YanitPaketi olabilir (paketin manifesto kayıtları
+    paket kapanınca yazılır). Dönen sözlük: {'dosya', 'dosya_adi', 'cikti',
+    'hata'}; hata yoksa None.
+    """
+    cikti, hata = None, None
+    bas = time.perf_counter()
+    try:
+        if isinstance(hedef, YanitPaketi):
+            cikti = hedef.ekle(yanit)
+        else:
+            cikti = yanit_kaydet(yanit, hedef)
+            if manifest is not None:
+                manifest.cikti_yaz(yanit['dosya'], cikti)
+    except Exception as e:
+        hata = str(e)
+    if olcum is not None:
+        olcum.kaydet('kaydet', time.perf_counter() - bas, yanit['dosya'],
+                     yazilan=len(yanit['belge']) if hata is None else 0)
+    if yanit.get('sonuc') is not None:
+        yanit_sonucu_isle(yanit['sonuc'], cikti, hata)
+    return {'dosya': yanit['dosya'], 'dosya_adi': yanit['dosya_adi'], 'cikti': cikti, 'hata': hata}
+
+
+def yanitlari_kaydet(yanitlar, hedef, manifest=None, is_sayisi=None, olcum=None):
+    """Yanıtları iş parçacığı havuzunda kaydet; girdi sırasıyla dosya sonuçlarını üret
+
+    Yazma işi G/Ç ağırlıklı olduğundan (özellikle ağ paylaşımlarında) iş
+    parçacıkları yeterlidir. is_sayisi verilmezse havuzun varsayılanı kullanılır.
+    Üretici erken kapatılırsa başlamamış kayıtlar iptal edilir.
+    """
+    havuz = ThreadPoolExecutor(max_workers=is_sayisi)
+    try:
+        isler = [havuz.submit(yanit_kaydet_ve_isle, yanit, hedef, manifest, olcum) for yanit in yanitlar]
+        for is_ in isler:
+            yield is_.result()
+    finally:
+        havuz.shutdown(wait=True, cancel_futures=True)
+
+
+def toplu_kaydet(yanitlar, hedef, manifest=None, is_sayisi=None, olcum=None):
+    """Yanıtları paralel kaydet; dosya başına sonuç listesini döndür (bkz. yanit_kaydet_ve_isle)"""
+    return list(yanitlari_kaydet(yanitlar, hedef, manifest, is_sayisi, olcum))
+
+
+class YanitPaketi:
+    """Yanıtları, raporu ve paket manifestosunu tek ZIP arşivinde toplar
+
+    Belgeler bellekten doğrudan arşive yazılır (geçici dosya yok); DOCX zaten
+    sıkıştırılmış olduğundan yeniden sıkıştırılmadan saklanır. Arşiv önce
+    geçici adla yazılır, kapat() ile yerine taşınır; işlem manifestosuna
+    yanıt yolları da ancak o zaman yazılır.
+    """
+
+    def __init__(self, yol, manifest=None):
+        self.yol = yol
+        self.manifest = manifest
+        self.gecici = yol + '.tmp'
+        self.zf = zipfile.ZipFile(self.gecici, 'w', zipfile.ZIP_DEFLATED)
+        self.kilit = threading.Lock()
+        self.eklenenler = []  # (kaynak dosya yolu, arşivdeki yol)
+
+    def _yaz(self, ad, veri, sikistir=True):
+        bilgi = zipfile.ZipInfo(ad, date_time=datetime.now().timetuple()[:6])
+        bilgi.compress_type = zipfile.ZIP_DEFLATED if sikistir else zipfile.ZIP_STORED
+        bilgi.external_attr = 0o644 << 16
+        with self.kilit:
+            self.zf.writestr(bilgi, veri)
+
+    def ekle(self, yanit):
+        """Yanıt belgesini arşive ekle; sonuç için yolu (paket/yanitlar/ad) döndür"""
+        belge = yanit['belge']
+        if not isinstance(belge, bytes):
+            tampon = io.BytesIO()
+            belge.save(tampon)
+            belge = tampon.getvalue()
+        ad = 'yanitlar/' + yanit_dosya_adi(yanit)
+        self._yaz(ad, belge, sikistir=False)
+        self.eklenenler.append((yanit['dosya'], ad))
+        return os.path.join(self.yol, ad)
+
+    def kapat(self, sonuclar, hatalar=(), olcum=None):
+        """Raporu ve paket manifestosunu ekleyip arşivi tamamla
+
+        hatalar: analiz edilemeyen dosyalar için [(dosya_yolu, hata)].
+        olcum verilirse rapora 'Ölçüm' sayfası eklenir (bkz. rapor_olustur).
+        """
+        try:
+            if PANDAS_AVAILABLE:
+                rapor = io.BytesIO()
+                rapor_olustur(sonuclar, rapor, olcum)
+                self._yaz('rapor.xlsx', rapor.getvalue())
+
+            arsivdeki = dict(self.eklenenler)
+            satirlar = []
+            for s in sonuclar:
+                b = s['bilgiler']
+                satirlar.append({
+                    'dosya': s['dosya_adi'], 'analiz_durumu': DURUM_TAMAM,
+                    'tckn': b['tckn'], 'vkn': b['vkn'], 'sayi': b['sayi'], 'musteri_mi': s['musteri_mi'],
+                    'yanit_durumu': s.get('yanit_durumu'), 'yanit': arsivdeki.get(s['dosya']),
+                    'hata': s.get('yanit_hatasi')
+                })
+            for dosya_yolu, hata in hatalar:
+                satirlar.append({'dosya': os.path.basename(dosya_yolu), 'analiz_durumu': DURUM_HATA, 'hata': hata})
+            self._yaz('manifest.jsonl', ''.join(json.dumps(k, ensure_ascii=False) + '\n' for k in satirlar))
+            self.zf.close()
+            os.replace(self.gecici, self.yol)
+        except BaseException:
+            self.iptal()
+            raise
+
+        if self.manifest is not None:
+            for dosya_yolu, ad in self.eklenenler:
+                self.manifest.cikti_yaz(dosya_yolu, os.path.join(self.yol, ad))
+
+    def iptal(self):
+        """Arşivi bırak, geçici dosyayı sil"""
+        try:
+            self.zf.close()
+        except Exception:
+            pass
+        try:
+            os.remove(self.gecici)
+        except OSError:
+            pass
+
+
+def musteri_metni(kimlik_durumu):
+    """Rapordaki kimlik başına 'Müşteri mi?' metni"""
+    musteri_mi = kimlik_durumu.get('musteri_mi')
+    if musteri_mi == GECERSIZ:
+        return 'Geçersiz kimlik'
+    if musteri_mi:
+        return 'Evet (sağlaması tutmuyor)' if kimlik_durumu.get('supheli') else 'Evet'
+    return 'Hayır'
+
+
+def rapor_aksiyonu(sonuc):
+    """Rapordaki Aksiyon sütununun metni"""
+    if sonuc['musteri_mi']:
+        return 'Manuel işlem gerekli'
+    if kimliksiz_mi(sonuc):
+        return 'Manuel inceleme: geçerli kimlik bulunamadı'
+    if sonuc.get('yanit_durumu') == DURUM_HATA:
+        return f"Yanıt kaydedilemedi: {sonuc.get('yanit_hatasi')}"
+    if sonuc.get('cikti'):
+        return 'Otomatik yanıt oluşturuldu'
+    return 'Yanıt bekliyor'
+
+
+def rapor_olustur(sonuclar, dosya, olcum=None):
+    """Analiz sonuçlarını Excel raporu olarak kaydet
+
+    İlk sayfada yazı başına bir satır, 'Kimlikler' sayfasında yazılardaki her
+    kimlik için ayrı müşteri durumu bulunur. olcum (olcum.AsamaOlcumu)
+    verilirse aşama süreleri 'Ölçüm' sayfasına yazılır.
+    """
+    import pandas as pd
+
+    data = []
+    kimlik_satirlari = []
+    for s in sonuclar:
+        b = s['bilgiler']
+        kimlikler = s.get('kimlik_durumlari') or bilgi_kimlikleri(b)
+        for k in kimlikler:
+            kimlik_satirlari.append({
+                'Dosya': s['dosya_adi'],
+                'Sayı': b['sayi'],
+                'Tür': k['tur'].upper(),
+                'Kimlik': k['kimlik'],
+                'Ad Soyad': k['adsoyad'],
+                'Müşteri mi?': musteri_metni(k),
+            })
+        data.append({
+            'Dosya': s['dosya_adi'],
+            'Muhatap Kurum': b['muhatap_kurum'],
+            'Tarih': b['tarih'],
+            'Sayı': b['sayi'],
+            'TCKN': b['tckn'],
+            'VKN': b['vkn'],
+            'Ad Soyad': b['adsoyad'],
+            'Kimlik Sayısı': len(kimlikler),
+            'Müşteri mi?': 'Evet' if s['musteri_mi'] else 'Kimlik yok' if kimliksiz_mi(s) else 'Hayır',
+            'Aksiyon': rapor_aksiyonu(s),
+            'Yanıt Dosyası': os.path.basename(s['cikti']) if s.get('cikti') else ''
+        })
+
+    with pd.ExcelWriter(dosya, engine='openpyxl') as yazici:
+        pd.DataFrame(data).to_excel(yazici, sheet_name='Yazılar', index=False)
+        pd.DataFrame(kimlik_satirlari, columns=['Dosya', 'Sayı', 'Tür', 'Kimlik', 'Ad Soyad', 'Müşteri mi?']
+                     ).to_excel(yazici, sheet_name='Kimlikler', index=False)
+        if olcum is not None:
+            pd.DataFrame(olcum.tablo_satirlari()).to_excel(yazici, sheet_name='Ölçüm', index=False)
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TBB Yazı Otomatik Yanıtlama Sistemi - Derlenmiş Müşteri İndeksi
+Müşteri listesinin kimlik ve ad bilgilerini bellek eşlemeli (mmap) tek dosyada tutar
+
+Dosya düzeni (küçük uçlu, diziler 8 bayt hizalı):
+    IMZA | meta uzunluğu (uint64) | meta (JSON) | diziler
+
+Diziler: tckn ve vkn (sıralı int64) ile karşılık gelen satır numaraları
+(int64), ad_ofset (int64, satır sayısı + 1) ve ad_veri (UTF-8). Açılışta
+yalnızca meta okunur; diziler sayfa sayfa, sorgulandıkça belleğe gelir.
+
+Kaynak dosyanın boyutu ve mtime'ı meta ile uyuşuyorsa indeks doğrudan
+kullanılır. Uyuşmuyorsa içerik özeti karşılaştırılır; özet de farklıysa
+indeks kaynaktan yeniden derlenir.
+"""
+
+import io
+import json
+import mmap
+import os
+import re
+import struct
+
+import numpy as np
+
+from kimlik_dogrulama import GECERSIZ, sorgu_birlestir, tckn_gecerli, tckn_gecerli_mi, vkn_gecerli, vkn_gecerli_mi
+from onbellek import dosya_ozeti
+
+INDEKS_SURUMU = 1
+INDEKS_UZANTISI = ".indeks"
+IMZA = b'TBBMIX01'
+DIZILER = ['tckn', 'tckn_satir', 'vkn', 'vkn_satir', 'ad_ofset', 'ad_veri']
+
+# int64'e sığan, yalnızca rakamlardan oluşan kimlikler
+KIMLIK_BICIMI = re.compile(r'\d{1,18}')
+
+
+def kimlik_sayisi(kimlik):
+    """Kimliği int64 anahtara çevir; geçersizse None"""
+    kimlik = str(kimlik).strip()
+    return int(kimlik) if KIMLIK_BICIMI.fullmatch(kimlik) else None
+
+
+def kimlik_anahtarlari(kimlikler):
+    """Kimlik listesini int64 anahtar dizisine çevir; boş ya da geçersizler -1"""
+    anahtarlar = (kimlik_sayisi(k) if k else None for k in kimlikler)
+    return np.fromiter((-1 if a is None else a for a in anahtarlar), dtype=np.int64)
+
+
+class IndeksDerleyici:
+    """Müşteri listesi parça parça okunurken indeks dizilerini biriktirir
+
+    Her parçadan yalnızca normalize edilmiş kimlikler (int64) ve UTF-8 adlar
+    tutulur; bellek kullanımı listenin sütun sayısından bağımsızdır.
+    """
+
+    def __init__(self):
+        self.satir = 0
+        self.parcalar = {ad: [] for ad in ['tckn', 'tckn_satir', 'vkn', 'vkn_satir', 'ad_uzunluk', 'ad_veri']}
+
+    def _kimlikler(self, tur, seri):
+        temiz = seri.reset_index(drop=True).dropna().astype(str).str.strip()
+        temiz = temiz[temiz.str.fullmatch(KIMLIK_BICIMI.pattern)]
+        self.parcalar[tur].append(temiz.astype(np.int64).to_numpy())
+        self.parcalar[tur + '_satir'].append(temiz.index.to_numpy(dtype=np.int64) + self.satir)
+
+    def ekle(self, adet, tckn=None, vkn=None, adlar=None):
+        """adet satırlık bir parçayı ekle; tckn / vkn / adlar pandas serisi ya da None"""
+        if tckn is not None:
+            self._kimlikler('tckn', tckn)
+        if vkn is not None:
+            self._kimlikler('vkn', vkn)
+        kodlu = [a.encode('utf-8') if isinstance(a, str) else b'' for a in adlar] if adlar is not None else []
+        uzunluk = np.zeros(adet, dtype=np.int64)
+        uzunluk[:len(kodlu)] = [len(k) for k in kodlu]
+        self.parcalar['ad_uzunluk'].append(uzunluk)
+        self.parcalar['ad_veri'].append(b''.join(kodlu))
+        self.satir += adet
+
+    def diziler(self):
+        """Biriken parçalardan indeks dizilerini üret
+
+        Aynı numara birden fazla satırda varsa ilk satır geçerli olur.
+        """
+        diziler = {}
+        for tur in ('tckn', 'vkn'):
+            anahtarlar = np.concatenate(self.parcalar[tur] or [np.zeros(0, dtype=np.int64)])
+            satirlar = np.concatenate(self.parcalar[tur + '_satir'] or [np.zeros(0, dtype=np.int64)])
+            # np.unique her anahtarın ilk geçtiği konumu verir; parçalar satır sırasında
+            diziler[tur], ilk = np.unique(anahtarlar, return_index=True)
+            diziler[tur + '_satir'] = satirlar[ilk]
+        ofset = np.zeros(self.satir + 1, dtype=np.int64)
+        if self.satir:
+            np.cumsum(np.concatenate(self.parcalar['ad_uzunluk']), out=ofset[1:])
+        diziler['ad_ofset'] = ofset
+        diziler['ad_veri'] = np.frombuffer(b''.join(self.parcalar['ad_veri']), dtype=np.uint8)
+        return diziler
+
+
+def indeks_yaz(f, meta, diziler):
+    """Meta ve dizileri açık ikili dosyaya indeks düzeninde yaz"""
+    meta = dict(meta, diziler={})
+    konum = 0
+    for ad in DIZILER:
+        dizi = diziler[ad]
+        meta['diziler'][ad] = [konum, str(dizi.dtype), len(dizi)]
+        konum += -(-dizi.nbytes // 8) * 8
+
+    meta_bayt = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    meta_bayt += b' ' * (-(len(IMZA) + 8 + len(meta_bayt)) % 8)
+    f.write(IMZA + struct.pack('<Q', len(meta_bayt)) + meta_bayt)
+    for ad in DIZILER:
+        veri = np.ascontiguousarray(diziler[ad]).tobytes()
+        f.write(veri + b'\0' * (-len(veri) % 8))
+
+
+class MusteriIndeksi:
+    """Derlenmiş müşteri indeksi üzerinde kimlik sorgusu
+
+    tampon bir mmap ya da bayt dizisi olabilir.
+    """
+
+    def __init__(self, tampon, yol=None):
+        if bytes(tampon[:len(IMZA)]) != IMZA:
+            raise ValueError("Geçersiz müşteri indeksi")
+        meta_uzunlugu, = struct.unpack('<Q', tampon[len(IMZA):len(IMZA) + 8])
+        bas = len(IMZA) + 8
+        self.meta = json.loads(bytes(tampon[bas:bas + meta_uzunlugu]).decode('utf-8'))
+        if self.meta.get('surum') != INDEKS_SURUMU:
+            raise ValueError("Müşteri indeksi sürümü farklı")
+
+        self.tampon = tampon
+        self.yol = yol
+        veri_bas = bas + meta_uzunlugu
+        self.diziler = {
+            ad: np.frombuffer(tampon, dtype=tur, count=adet, offset=veri_bas + konum)
+            for ad, (konum, tur, adet) in self.meta['diziler'].items()
+        }
+        self.tckn_sutun = self.meta.get('tckn_sutun')
+        self.vkn_sutun = self.meta.get('vkn_sutun')
+        self.adsoyad_sutun = self.meta.get('adsoyad_sutun')
+
+    @classmethod
+    def dosyadan(cls, yol):
+        with open(yol, 'rb') as f:
+            tampon = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(tampon, yol)
+        except Exception:
+            tampon.close()
+            raise
+
+    def __len__(self):
+        return self.meta['satir']
+
+    def satir_bul(self, tur, kimlik):
+        """tur ('tckn' / 'vkn') dizisinde kimliğin satır numarasını bul; yoksa None"""
+        anahtar = kimlik_sayisi(kimlik)
+        if anahtar is None:
+            return None
+        anahtarlar = self.diziler[tur]
+        i = int(np.searchsorted(anahtarlar, anahtar))
+        if i < len(anahtarlar) and anahtarlar[i] == anahtar:
+            return int(self.diziler[tur + '_satir'][i])
+        return None
+
+    def toplu_satir_bul(self, tur, anahtarlar):
+        """int64 anahtar dizisinin satır numaralarını tek aramada bul; bulunamayan -1"""
+        dizi = self.diziler[tur]
+        if not len(dizi):
+            return np.full(len(anahtarlar), -1, dtype=np.int64)
+        i = np.minimum(np.searchsorted(dizi, anahtarlar), len(dizi) - 1)
+        bulundu = (dizi[i] == anahtarlar) & (anahtarlar >= 0)
+        return np.where(bulundu, self.diziler[tur + '_satir'][i], -1)
+
+    def ad(self, satir):
+        """Satırın ad soyadı; boşsa None"""
+        ofset = self.diziler['ad_ofset']
+        ad = self.diziler['ad_veri'][ofset[satir]:ofset[satir + 1]].tobytes().decode('utf-8')
+        return ad or None
+
+    def _kimlik_sorgula(self, tur, kimlik):
+        """Tek kimliği ara; bulunamazsa sağlamasına göre False ya da GECERSIZ"""
+        satir = self.satir_bul(tur, kimlik)
+        if satir is not None:
+            return True, self.ad(satir) if self.adsoyad_sutun else None
+        kimlik = str(kimlik).strip()
+        gecerli = tckn_gecerli_mi(kimlik) if tur == 'tckn' else vkn_gecerli_mi(kimlik.zfill(10))
+        return (False if gecerli else GECERSIZ), None
+
+    def sorgula(self, tckn=None, vkn=None):
+        """(müşteri mi, listedeki ad soyad) döndür; önce TCKN, bulunamazsa VKN aranır
+
+        Kimlik sağlamasından bağımsız olarak listede aranır; listedeki bir
+        kaydın sağlaması tutmasa da eşleşir. Bulunamayan kimliklerin hiçbirinin
+        sağlaması tutmuyorsa müşteri mi GECERSIZ'dir (bkz. sorgu_birlestir).
+        """
+        return sorgu_birlestir([self._kimlik_sorgula(tur, kimlik)
+                                for tur, kimlik in (('tckn', tckn), ('vkn', vkn)) if kimlik])
+
+    def toplu_sorgula(self, tcknler, vknler):
+        """Kimlik listelerini (aynı uzunlukta) toplu sorgula; (müşteri mi listesi, ad listesi) döndür
+
+        sorgula ile aynı kural: önce TCKN, bulunamazsa VKN; ikisi de
+        bulunamayan ve hiçbir kimliğinin sağlaması tutmayan satır GECERSIZ.
+        Sağlamalar yalnızca bulunamayanlar için vektörel olarak hesaplanır.
+        """
+        tckn_anahtarlari = kimlik_anahtarlari(tcknler)
+        vkn_anahtarlari = kimlik_anahtarlari(vknler)
+        satirlar = self.toplu_satir_bul('tckn', tckn_anahtarlari)
+        eksik = satirlar < 0
+        if eksik.any():
+            satirlar[eksik] = self.toplu_satir_bul('vkn', vkn_anahtarlari)[eksik]
+        musteri = (satirlar >= 0).tolist()
+        eksik = np.flatnonzero(satirlar < 0)
+        if len(eksik):
+            verilen = np.fromiter((bool(tcknler[i] or vknler[i]) for i in eksik.tolist()),
+                                  dtype=bool, count=len(eksik))
+            gecerli = tckn_gecerli(tckn_anahtarlari[eksik]) | vkn_gecerli(vkn_anahtarlari[eksik])
+            for i in eksik[verilen & ~gecerli].tolist():
+                musteri[i] = GECERSIZ
+        if self.adsoyad_sutun:
+            adlar = [self.ad(s) if s >= 0 else None for s in satirlar.tolist()]
+        else:
+            adlar = [None] * len(satirlar)
+        return musteri, adlar
+
+    def kapat(self):
+        self.diziler = {}
+        if isinstance(self.tampon, mmap.mmap):
+            self.tampon.close()
+
+
+def _kaynak_bilgisi(kaynak):
+    st = os.stat(kaynak)
+    return {'kaynak_boyut': st.st_size, 'kaynak_mtime_ns': st.st_mtime_ns}
+
+
+def indeks_derle(kaynak, okuyucu, yol):
+    """okuyucu ile kaynağı okuyup indeksi yol'a yaz ve aç
+
+    okuyucu(derleyici) kaynağı parça parça IndeksDerleyici.ekle'ye verir ve
+    tespit ettiği sütun adlarını döndürür. Yol yazılamıyorsa indeks bellekte
+    kurulur.
+    """
+    bilgi = dict(_kaynak_bilgisi(kaynak), kaynak_ozet=dosya_ozeti(kaynak))
+    derleyici = IndeksDerleyici()
+    sutunlar = okuyucu(derleyici)
+    diziler = derleyici.diziler()
+    del derleyici
+    meta = dict(bilgi, surum=INDEKS_SURUMU, satir=len(diziler['ad_ofset']) - 1, **sutunlar)
+
+    gecici = yol + '.tmp'
+    try:
+        with open(gecici, 'wb') as f:
+            indeks_yaz(f, meta, diziler)
+        os.replace(gecici, yol)
+        return MusteriIndeksi.dosyadan(yol)
+    except OSError:
+        # Salt okunur klasör ya da (Windows'ta) eşlenmiş eski indeks: kalıcı olmayan indeks
+        tampon = io.BytesIO()
+        indeks_yaz(tampon, meta, diziler)
+        return MusteriIndeksi(tampon.getvalue())
+
+
+def musteri_indeksi_ac(kaynak, okuyucu, yol=None):
+    """kaynak için derlenmiş indeksi aç; yoksa ya da kaynak değiştiyse yeniden derle"""
+    yol = yol or kaynak + INDEKS_UZANTISI
+    try:
+        indeks = MusteriIndeksi.dosyadan(yol)
+    except (OSError, ValueError):
+        return indeks_derle(kaynak, okuyucu, yol)
+
+    bilgi = _kaynak_bilgisi(kaynak)
+    if all(indeks.meta.get(k) == v for k, v in bilgi.items()):
+        return indeks
+
+    # Dosyaya dokunulmuş ama içerik aynı: yalnızca meta güncellenir
+    if indeks.meta.get('kaynak_ozet') == dosya_ozeti(kaynak):
+        meta = dict(indeks.meta, **bilgi)
+        diziler = {ad: np.array(d) for ad, d in indeks.diziler.items()}
+        indeks.kapat()
+        try:
+            with open(yol + '.tmp', 'wb') as f:
+                indeks_yaz(f, meta, diziler)
+            os.replace(yol + '.tmp', yol)
+            return MusteriIndeksi.dosyadan(yol)
+        except OSError:
+            return indeks_derle(kaynak, okuyucu, yol)
+
+    indeks.kapat()
+    return indeks_derle(kaynak, okuyucu, yol)
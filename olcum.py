@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TBB Yazı Otomatik Yanıtlama Sistemi - Aşama Ölçümü
+Toplu işin her aşaması için dosya başına süre ve okunan / yazılan bayt kaydı
+
+Aşamalar: dosya_oku (DOCX/TXT), pdf_oku, bilgi_cikar, musteri_sorgula,
+belge_olustur ve kaydet. Okuma ve çıkarma işçi süreçlerde ölçülüp sonuçla
+birlikte ana sürece döner (bkz. motor.dosya_cikar). Kayıtlar iş parçacıkları
+arasında kilitle korunur.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+ASAMALAR = ['dosya_oku', 'pdf_oku', 'bilgi_cikar', 'musteri_sorgula', 'belge_olustur', 'kaydet']
+# Durum çubuğundaki kısa adlar
+KISA_ADLAR = {'dosya_oku': 'oku', 'pdf_oku': 'pdf', 'bilgi_cikar': 'çıkar',
+              'musteri_sorgula': 'sorgu', 'belge_olustur': 'belge', 'kaydet': 'kayıt'}
+EN_YAVAS_ADET = 10
+
+
+def yuzdelik(sirali, oran):
+    """Sıralı listede yüzdelik değer (en yakın sıra)"""
+    return sirali[min(len(sirali) - 1, int(len(sirali) * oran))]
+
+
+def boyut_metni(bayt):
+    """Bayt sayısını okunur birimle yaz"""
+    for birim in ('B', 'KB', 'MB'):
+        if bayt < 1024:
+            return f"{bayt:.0f} {birim}" if birim == 'B' else f"{bayt:.1f} {birim}"
+        bayt /= 1024
+    return f"{bayt:.1f} GB"
+
+
+class AsamaOlcumu:
+    """Bir toplu işin (analiz, yanıt, kayıt) aşama süreleri ve G/Ç toplamları"""
+
+    def __init__(self):
+        self.kilit = threading.Lock()
+        self.sureler = {}       # aşama -> [(saniye, dosya)]
+        self.dosya_sureleri = {}  # dosya -> toplam saniye
+        self.okunan = 0
+        self.yazilan = 0
+        self.baslangic = time.perf_counter()
+
+    def kaydet(self, asama, sure, dosya=None, okunan=0, yazilan=0):
+        """Bir aşama ölçümünü ekle (dosya None ise toplu işlem, ör. toplu sorgu)"""
+        with self.kilit:
+            self.sureler.setdefault(asama, []).append((sure, dosya))
+            if dosya is not None:
+                self.dosya_sureleri[dosya] = self.dosya_sureleri.get(dosya, 0.0) + sure
+            self.okunan += okunan
+            self.yazilan += yazilan
+
+    @contextmanager
+    def olc(self, asama, dosya=None, okunan=0, yazilan=0):
+        """with bloğunun süresini aşama ölçümü olarak ekle"""
+        bas = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.kaydet(asama, time.perf_counter() - bas, dosya, okunan, yazilan)
+
+    def ozet(self):
+        """Aşama başına adet / toplam / ortalama / p50 / p95 / max (ms) ve genel toplamlar"""
+        with self.kilit:
+            sureler = {a: sorted(s for s, _ in kayitlar) for a, kayitlar in self.sureler.items()}
+            en_yavas = sorted(self.dosya_sureleri.items(), key=lambda x: x[1], reverse=True)[:EN_YAVAS_ADET]
+            okunan, yazilan = self.okunan, self.yazilan
+        asamalar = {}
+        for asama in sorted(sureler, key=lambda a: ASAMALAR.index(a) if a in ASAMALAR else len(ASAMALAR)):
+            s = sureler[asama]
+            asamalar[asama] = {
+                'adet': len(s),
+                'toplam_s': round(sum(s), 4),
+                'ort_ms': round(sum(s) / len(s) * 1000, 3),
+                'p50_ms': round(yuzdelik(s, 0.5) * 1000, 3),
+                'p95_ms': round(yuzdelik(s, 0.95) * 1000, 3),
+                'max_ms': round(s[-1] * 1000, 3),
+            }
+        return {
+            'asamalar': asamalar,
+            'en_yavas_dosyalar': [{'dosya': d, 'toplam_ms': round(s * 1000, 3)} for d, s in en_yavas],
+            'okunan_bayt': okunan,
+            'yazilan_bayt': yazilan,
+            'gecen_s': round(time.perf_counter() - self.baslangic, 3),
+        }
+
+    def durum_metni(self):
+        """Durum çubuğu için tek satırlık özet"""
+        ozet = self.ozet()
+        parcalar = [f"{KISA_ADLAR.get(a, a)} {o['toplam_s']:.2f}s (p95 {o['p95_ms']:.0f} ms)"
+                    for a, o in ozet['asamalar'].items()]
+        parcalar.append(f"okunan {boyut_metni(ozet['okunan_bayt'])}, yazılan {boyut_metni(ozet['yazilan_bayt'])}")
+        return "⏱ " + " · ".join(parcalar)
+
+    def json_yaz(self, dosya):
+        """Özeti (bkz. ozet) JSON dosyasına yaz"""
+        with open(dosya, 'w', encoding='utf-8') as f:
+            json.dump(self.ozet(), f, ensure_ascii=False, indent=2)
+
+    def tablo_satirlari(self):
+        """Rapor sayfası için satırlar: aşama özetleri, ardından en yavaş dosyalar"""
+        ozet = self.ozet()
+        satirlar = [{'Bölüm': 'Aşama', 'Ad': asama, 'Adet': o['adet'], 'Toplam (s)': o['toplam_s'],
+                     'Ortalama (ms)': o['ort_ms'], 'p50 (ms)': o['p50_ms'], 'p95 (ms)': o['p95_ms'],
+                     'Max (ms)': o['max_ms']}
+                    for asama, o in ozet['asamalar'].items()]
+        satirlar += [{'Bölüm': 'En yavaş dosya', 'Ad': d['dosya'], 'Toplam (s)': round(d['toplam_ms'] / 1000, 4)}
+                     for d in ozet['en_yavas_dosyalar']]
+        satirlar.append({'Bölüm': 'G/Ç', 'Ad': 'Okunan bayt', 'Adet': ozet['okunan_bayt']})
+        satirlar.append({'Bölüm': 'G/Ç', 'Ad': 'Yazılan bayt', 'Adet': ozet['yazilan_bayt']})
+        return satirlar
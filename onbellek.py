@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TBB Yazı Otomatik Yanıtlama Sistemi - Çıkarım Önbelleği
+Dosya içeriğinin SHA-256 özetine göre saklanan metin ve bilgi_cikar sonuçları
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+VARSAYILAN_AZAMI_BOYUT = 256 * 1024 * 1024  # 256 MB
+OKUMA_BLOGU = 1024 * 1024
+# Bu kadar yeni kayıt / erişim birikince yaz() beklenmeden diske yazılır
+ONBELLEK_PARTI = 500
+
+
+def dosya_ozeti(dosya_yolu):
+    """Dosya içeriğinin SHA-256 özetini hesapla"""
+    ozet = hashlib.sha256()
+    with open(dosya_yolu, 'rb') as f:
+        for blok in iter(lambda: f.read(OKUMA_BLOGU), b''):
+            ozet.update(blok)
+    return ozet.hexdigest()
+
+
+class CikarimOnbellegi:
+    """Boyut sınırlı, LRU tahliyeli kalıcı çıkarım önbelleği (SQLite)
+
+    Kayıtlar (içerik özeti, çıkarıcı sürümü) ile anahtarlanır. Açılışta farklı
+    sürüme ait kayıtlar silinir; böylece çıkarım kuralları değiştiğinde sürümü
+    artırmak önbelleği geçersiz kılar.
+
+    Yeni kayıtlar ve LRU erişim zamanları bellekte biriktirilir; yaz() (ya da
+    ONBELLEK_PARTI dolunca) tek işlemle diske yazılır. Toplu işin sonunda
+    yaz() çağrılmalıdır; kapat() da bekleyenleri yazar.
+    """
+
+    def __init__(self, yol, surum, azami_boyut=VARSAYILAN_AZAMI_BOYUT):
+        self.yol = yol
+        self.surum = str(surum)
+        self.azami_boyut = azami_boyut
+        self.kilit = threading.Lock()
+        self.isabet = 0
+        self.iskalama = 0
+        self.bekleyen = {}  # özet -> (metin, bilgiler JSON, boyut, zaman)
+        self.erisilen = {}  # özet -> son erişim zamanı
+
+        self.baglanti = sqlite3.connect(yol, check_same_thread=False)
+        self.baglanti.execute("PRAGMA journal_mode=WAL")
+        self.baglanti.execute("PRAGMA synchronous=NORMAL")
+        with self.baglanti:
+            self.baglanti.execute(
+                "CREATE TABLE IF NOT EXISTS cikarim ("
+                " ozet TEXT NOT NULL, surum TEXT NOT NULL, metin TEXT NOT NULL,"
+                " bilgiler TEXT NOT NULL, boyut INTEGER NOT NULL, son_erisim REAL NOT NULL,"
+                " PRIMARY KEY (ozet, surum))"
+            )
+            self.baglanti.execute("CREATE INDEX IF NOT EXISTS ix_cikarim_erisim ON cikarim (son_erisim)")
+            self.baglanti.execute("DELETE FROM cikarim WHERE surum != ?", (self.surum,))
+        self.toplam_boyut = self.baglanti.execute("SELECT COALESCE(SUM(boyut), 0) FROM cikarim").fetchone()[0]
+
+    def getir(self, ozet):
+        """(metin, bilgiler) döndür; kayıt yoksa None"""
+        with self.kilit:
+            if ozet in self.bekleyen:
+                metin, bilgiler_json, _, _ = self.bekleyen[ozet]
+                self.isabet += 1
+                return metin, json.loads(bilgiler_json)
+            satir = self.baglanti.execute(
+                "SELECT metin, bilgiler FROM cikarim WHERE ozet = ? AND surum = ?", (ozet, self.surum)
+            ).fetchone()
+            if satir is None:
+                self.iskalama += 1
+                return None
+            self.erisilen[ozet] = time.time()
+            self.isabet += 1
+            self._parti_doldu_mu()
+            return satir[0], json.loads(satir[1])
+
+    def kaydet(self, ozet, metin, bilgiler):
+        """Çıkarım sonucunu saklanmak üzere biriktir (bkz. yaz)"""
+        bilgiler_json = json.dumps(bilgiler, ensure_ascii=False)
+        boyut = len(metin.encode('utf-8')) + len(bilgiler_json.encode('utf-8'))
+        if boyut > self.azami_boyut:
+            return
+
+        with self.kilit:
+            self.bekleyen[ozet] = (metin, bilgiler_json, boyut, time.time())
+            self._parti_doldu_mu()
+
+    def _parti_doldu_mu(self):
+        if len(self.bekleyen) + len(self.erisilen) >= ONBELLEK_PARTI:
+            self._yaz()
+
+    def yaz(self):
+        """Biriken kayıtları ve erişim zamanlarını tek işlemle yaz; sınır aşılırsa en eski erişilenleri sil"""
+        with self.kilit:
+            self._yaz()
+
+    def _yaz(self):
+        if not self.bekleyen and not self.erisilen:
+            return
+        with self.baglanti:
+            self.baglanti.executemany(
+                "UPDATE cikarim SET son_erisim = ? WHERE ozet = ? AND surum = ?",
+                [(zaman, ozet, self.surum) for ozet, zaman in self.erisilen.items()]
+            )
+            for ozet, (metin, bilgiler_json, boyut, zaman) in self.bekleyen.items():
+                eski = self.baglanti.execute(
+                    "SELECT boyut FROM cikarim WHERE ozet = ? AND surum = ?", (ozet, self.surum)
+                ).fetchone()
+                self.baglanti.execute(
+                    "INSERT OR REPLACE INTO cikarim VALUES (?, ?, ?, ?, ?, ?)",
+                    (ozet, self.surum, metin, bilgiler_json, boyut, zaman)
+                )
+                self.toplam_boyut += boyut - (eski[0] if eski else 0)
+            if self.toplam_boyut > self.azami_boyut:
+                self._tahliye_et()
+        self.bekleyen.clear()
+        self.erisilen.clear()
+
+    def _tahliye_et(self):
+        """Toplam boyut sınırın altına inene kadar en eski erişilen kayıtları sil"""
+        silinecek = []
+        for ozet, boyut in self.baglanti.execute(
+                "SELECT ozet, boyut FROM cikarim ORDER BY son_erisim"):
+            if self.toplam_boyut <= self.azami_boyut:
+                break
+            silinecek.append((ozet, self.surum))
+            self.toplam_boyut -= boyut
+        self.baglanti.executemany("DELETE FROM cikarim WHERE ozet = ? AND surum = ?", silinecek)
+
+    def temizle(self):
+        """Önbellekteki tüm kayıtları sil"""
+        with self.kilit:
+            self.bekleyen.clear()
+            self.erisilen.clear()
+            with self.baglanti:
+                self.baglanti.execute("DELETE FROM cikarim")
+            self.baglanti.execute("VACUUM")
+            self.toplam_boyut = 0
+
+    def kapat(self):
+        with self.kilit:
+            self._yaz()
+            self.baglanti.close()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TBB Yazı Otomatik Yanıtlama Sistemi - DOCX Şablonu
+Yer tutuculu bir DOCX'i bir kez yükleyip her belgeyi XML'e değer yerleştirerek üretir
+
+Şablondaki yer tutucular kendi run'ında tek başına duran {{AD}} metinleridir.
+Değeri None verilen yer tutucunun bulunduğu paragraf tamamen çıkarılır.
+word/document.xml dışındaki tüm parçalar şablondaki sıkıştırılmış halleriyle
+aynen kopyalanır; yalnızca document.xml yeniden sıkıştırılır.
+"""
+
+import io
+import re
+import struct
+import time
+import zipfile
+import zlib
+
+BELGE_PARCASI = 'word/document.xml'
+
+# <w:p ...> ... <w:t ...>{{AD}}</w:t> ... </w:p>
+YER_TUTUCU_DESENI = re.compile(
+    r'(<w:p(?:\s[^>]*)?>(?:(?!</w:p>).)*?<w:t(?:\s[^>]*)?>)\{\{(\w+)\}\}(</w:t>(?:(?!</w:p>).)*?</w:p>)',
+    re.S
+)
+# python-docx'in run.text'te özel işlediği (w:br / w:tab) karakterler
+OZEL_KARAKTERLER = re.compile(r'[\n\r\t]')
+
+
+def escape(metin):
+    """XML metin kaçışı (xml.sax.saxutils.escape ile aynı; o modül açılışta urllib'i de yükler)"""
+    return metin.replace('&', '&amp;').replace('>', '&gt;').replace('<', '&lt;')
+
+
+class DocxSablonu:
+    def __init__(self, veri):
+        """veri: şablon DOCX dosyasının baytları"""
+        self.girdiler = []  # (ad, ham sıkıştırılmış veri, crc, sıkıştırılmış boyut, boyut, yöntem) ya da belge
+        with zipfile.ZipFile(io.BytesIO(veri)) as zf:
+            for bilgi in zf.infolist():
+                if bilgi.filename == BELGE_PARCASI:
+                    xml = zf.read(bilgi).decode('utf-8')
+                    self.girdiler.append(None)
+                    continue
+                # Yerel başlığı atlayıp sıkıştırılmış veriyi olduğu gibi al
+                bas = bilgi.header_offset
+                ad_uzunlugu, ek_uzunlugu = struct.unpack('<HH', veri[bas + 26:bas + 30])
+                veri_bas = bas + 30 + ad_uzunlugu + ek_uzunlugu
+                self.girdiler.append((
+                    bilgi.filename.encode('utf-8'), veri[veri_bas:veri_bas + bilgi.compress_size],
+                    bilgi.CRC, bilgi.compress_size, bilgi.file_size, bilgi.compress_type
+                ))
+
+        # document.xml: sabit metin ve yer tutuculu paragraflar sırasıyla
+        self.parcalar = []
+        konum = 0
+        for eslesme in YER_TUTUCU_DESENI.finditer(xml):
+            self.parcalar.append(xml[konum:eslesme.start()])
+            self.parcalar.append((eslesme.group(1), eslesme.group(2), eslesme.group(3)))
+            konum = eslesme.end()
+        self.parcalar.append(xml[konum:])
+        self.yer_tutucular = {p[1] for p in self.parcalar if isinstance(p, tuple)}
+
+    def belge_xml(self, degerler):
+        """Değerleri yerleştirilmiş document.xml metnini döndür
+
+        Değerlerden biri python-docx'in farklı yazdığı karakterler içeriyorsa
+        (satır sonu, sekme) None döner; çağıran python-docx yoluna düşmelidir.
+        """
+        cikti = []
+        for parca in self.parcalar:
+            if isinstance(parca, str):
+                cikti.append(parca)
+                continue
+            on, ad, son = parca
+            deger = degerler.get(ad)
+            if deger is None:
+                continue
+            if OZEL_KARAKTERLER.search(deger):
+                return None
+            if deger != deger.strip() and on.endswith('<w:t>'):
+                on = on[:-len('<w:t>')] + '<w:t xml:space="preserve">'
+            cikti.append(on + escape(deger) + son)
+        return ''.join(cikti)
+
+    def doldur(self, degerler):
+        """Değerleri yerleştirip DOCX baytlarını döndür (bkz. belge_xml; None olabilir)"""
+        xml = self.belge_xml(degerler)
+        if xml is None:
+            return None
+        return self._zip_yaz(xml.encode('utf-8'))
+
+    def _zip_yaz(self, belge):
+        """Şablon parçaları ve yeni document.xml ile ZIP arşivini baytlarda oluştur"""
+        yil, ay, gun, saat, dakika, saniye = time.localtime()[:6]
+        dos_saat = saat << 11 | dakika << 5 | saniye // 2
+        dos_tarih = (yil - 1980) << 9 | ay << 5 | gun
+
+        sikistirici = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        sikisik = sikistirici.compress(belge) + sikistirici.flush()
+        belge_girdisi = (BELGE_PARCASI.encode('utf-8'), sikisik, zlib.crc32(belge),
+                         len(sikisik), len(belge), zipfile.ZIP_DEFLATED)
+
+        cikti = io.BytesIO()
+        merkez = []
+        for girdi in self.girdiler:
+            ad, ham, crc, sikisik_boyut, boyut, yontem = girdi or belge_girdisi
+            konum = cikti.tell()
+            cikti.write(struct.pack('<IHHHHHIIIHH', 0x04034b50, 20, 0, yontem, dos_saat, dos_tarih,
+                                    crc, sikisik_boyut, boyut, len(ad), 0))
+            cikti.write(ad)
+            cikti.write(ham)
+            merkez.append(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, 20, 20, 0, yontem, dos_saat,
+                                      dos_tarih, crc, sikisik_boyut, boyut, len(ad), 0, 0, 0, 0,
+                                      0o600 << 16, konum) + ad)
+
+        merkez_bas = cikti.tell()
+        for kayit in merkez:
+            cikti.write(kayit)
+        merkez_boyut = cikti.tell() - merkez_bas
+        cikti.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, len(merkez), len(merkez),
+                                merkez_boyut, merkez_bas, 0))
+        return cikti.getvalue()
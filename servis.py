@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TBB Yazı Otomatik Yanıtlama Sistemi - Yerel HTTP Servisi
+Diğer sistemlerin yazı gönderip çıkarılan bilgileri, müşteri durumunu ve
+yanıt belgesini JSON olarak aldığı servis (bkz. cli.py servis)
+
+Müşteri listesi ve yanıt şablonu açılışta bir kez yüklenip bellekte kalır;
+liste dosyası değişince yeniden yüklenir. Bağlantılar ayrı iş parçacıklarında
+karşılanır, işlemler ise is_sayisi ile sınırlıdır; ayrıca en çok kuyruk kadar
+istek sıra bekler, fazlası 503 ile hemen geri çevrilir. surec verilirse dosya
+okuma ve bilgi çıkarma işçi süreçlerde çalışır (GIL'e takılmadan ölçeklenir).
+
+    GET  /saglik  -> {"durum": "hazir", "musteri_sayisi": ..., ...}
+    POST /yazi    <- {"ad": "yazi.pdf", "icerik": "<base64>"} ya da {"ad": ..., "metin": "..."}
+                  -> {"ad", "bilgiler", "musteri_mi", "kimlik_durumlari", "okuma_hatasi", "yanit"}
+    POST /toplu   <- {"yazilar": [<yazi>, ...]} -> {"sonuclar": [<sonuç ya da {"ad", "hata"}>, ...]}
+
+"yanit" müşteri olmayan yazılar için {"dosya_adi", "belge": "<base64 DOCX>"},
+diğerlerinde null'dur; ?belge=0 ile belge üretilmez. Kimlik çıkarılamayan
+yazılara yanıt üretilmez.
+"""
+
+import base64
+import binascii
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import motor
+
+VARSAYILAN_ADRES = "127.0.0.1"
+VARSAYILAN_PORT = 8765
+VARSAYILAN_KUYRUK = 64
+# Tek istekte kabul edilen en büyük gövde ve /toplu'daki en fazla yazı
+AZAMI_GOVDE = 64 * 1024 * 1024
+AZAMI_TOPLU = 500
+
+
+class IstekHatasi(ValueError):
+    """İstemciden kaynaklanan (400) hata"""
+
+
+class GovdeCokBuyuk(Exception):
+    """Gövde AZAMI_GOVDE'den büyük (413)"""
+
+
+def _oge_hazirla(oge):
+    """İstekteki yazıyı doğrula; (ad, metin, None) ya da (ad, None, geçici dosya) döndür"""
+    if not isinstance(oge, dict):
+        raise IstekHatasi("Her yazı bir JSON nesnesi olmalı")
+    ad = oge.get('ad') or 'yazi'
+    if not isinstance(ad, str):
+        raise IstekHatasi("'ad' metin olmalı")
+    ad = os.path.basename(ad)
+
+    if 'metin' in oge:
+        if not isinstance(oge['metin'], str):
+            raise IstekHatasi("'metin' metin olmalı")
+        return ad, oge['metin'], None
+
+    uzanti = os.path.splitext(ad)[1].lower()
+    if uzanti not in motor.DESTEKLENEN_UZANTILAR:
+        raise IstekHatasi(f"Desteklenmeyen dosya türü: {ad} ({', '.join(motor.DESTEKLENEN_UZANTILAR)})")
+    try:
+        veri = base64.b64decode(oge.get('icerik') or '', validate=True)
+    except (binascii.Error, TypeError, ValueError):
+        raise IstekHatasi("'icerik' geçerli base64 olmalı")
+    if not veri:
+        raise IstekHatasi("'icerik' ya da 'metin' gerekli")
+
+    # dosya_oku dosya yolu bekler; biçimi uzantı belirler
+    fd, gecici = tempfile.mkstemp(prefix='tbb_servis_', suffix=uzanti)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(veri)
+    return ad, None, gecici
+
+
+def yazilari_isle(ogeler, musteri_listesi, belge=True, havuz=None):
+    """Yazıları çıkar, tek toplu sorguyla eşleştir ve yanıt belgelerini üret
+
+    Her yazı için JSON'a yazılabilir sonuç sözlüğü döndürür; işlenemeyen
+    yazılar {"ad", "hata"} olur. havuz (ProcessPoolExecutor) verilirse dosya
+    okuma ve çıkarma orada paralel yürür.
+    """
+    hazirliklar = []
+    for oge in ogeler:
+        try:
+            hazirliklar.append(_oge_hazirla(oge))
+        except Exception as e:
+            hazirliklar.append(e)
+
+    cikarimlar = []
+    try:
+        isler = [havuz.submit(motor.dosya_cikar, h[2])
+                 if havuz is not None and not isinstance(h, Exception) and h[2] is not None else None
+                 for h in hazirliklar]
+        for h, is_ in zip(hazirliklar, isler):
+            if isinstance(h, Exception):
+                cikarimlar.append(h)
+                continue
+            ad, icerik, gecici = h
+            try:
+                if gecici is None:
+                    bilgiler = motor.bilgi_cikar(icerik)
+                else:
+                    icerik, bilgiler, _ = is_.result() if is_ is not None else motor.dosya_cikar(gecici)
+            except Exception as e:
+                cikarimlar.append(e)
+            else:
+                cikarimlar.append((ad, icerik, bilgiler))
+    finally:
+        for h in hazirliklar:
+            if not isinstance(h, Exception) and h[2] is not None:
+                try:
+                    os.remove(h[2])
+                except OSError:
+                    pass
+
+    sonuclar = [motor.sonuc_olustur(c[0], c[2], None) for c in cikarimlar if not isinstance(c, Exception)]
+    motor.sonuclari_eslestir(sonuclar, musteri_listesi)
+
+    cikti = []
+    kalan = iter(sonuclar)
+    for oge, c in zip(ogeler, cikarimlar):
+        if isinstance(c, Exception):
+            ad = oge.get('ad') if isinstance(oge, dict) else None
+            cikti.append({'ad': ad, 'hata': str(c)})
+            continue
+        sonuc = next(kalan)
+        icerik, b = c[1], sonuc['bilgiler']
+        yanit = None
+        if belge and motor.yanit_bekliyor_mu(sonuc):
+            y = motor.yanit_olustur(sonuc)
+            yanit = {'dosya_adi': motor.yanit_dosya_adi(y), 'belge': base64.b64encode(y['belge']).decode('ascii')}
+        cikti.append({
+            'ad': sonuc['dosya_adi'],
+            'bilgiler': b,
+            'musteri_mi': sonuc['musteri_mi'],
+            'kimlik_durumlari': sonuc.get('kimlik_durumlari', []),
+            'okuma_hatasi': icerik if motor.okuma_hatasi_mi(icerik) else None,
+            'yanit': yanit,
+        })
+    return cikti
+
+
+class _Isleyici(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'TBBYanit'
+
+    def log_message(self, format, *args):
+        if self.server.ayrintili:
+            self.server.kayit(f"{self.address_string()} - {format % args}")
+
+    def _json(self, kod, veri, basliklar=()):
+        govde = json.dumps(veri, ensure_ascii=False).encode('utf-8')
+        self.send_response(kod)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(govde)))
+        for ad, deger in basliklar:
+            self.send_header(ad, deger)
+        self.end_headers()
+        self.wfile.write(govde)
+
+    def _govde(self):
+        uzunluk = self.headers.get('Content-Length')
+        if uzunluk is None or not uzunluk.isdigit():
+            raise IstekHatasi("Content-Length gerekli")
+        uzunluk = int(uzunluk)
+        if uzunluk > AZAMI_GOVDE:
+            self.close_connection = True
+            raise GovdeCokBuyuk()
+        try:
+            return json.loads(self.rfile.read(uzunluk))
+        except ValueError:
+            raise IstekHatasi("Gövde geçerli JSON olmalı")
+
+    def do_GET(self):
+        if urlsplit(self.path).path != '/saglik':
+            self._json(404, {'hata': "Bulunamadı"})
+            return
+        servis = self.server
+        self._json(200, {
+            'durum': 'hazir',
+            'musteri_sayisi': len(servis.musteri.guncel()),
+            'pdf_kutuphanesi': motor.PDF_LIB,
+            'is_sayisi': servis.is_sayisi,
+            'calisan': servis.calisan_sayisi,
+            'islenen': servis.islenen,
+            'reddedilen': servis.reddedilen,
+        })
+
+    def do_POST(self):
+        adres = urlsplit(self.path)
+        if adres.path not in ('/yazi', '/toplu'):
+            self._json(404, {'hata': "Bulunamadı"})
+            return
+        servis = self.server
+        try:
+            istek = self._govde()
+            if adres.path == '/toplu':
+                ogeler = istek.get('yazilar') if isinstance(istek, dict) else None
+                if not isinstance(ogeler, list):
+                    raise IstekHatasi("'yazilar' listesi gerekli")
+                if len(ogeler) > AZAMI_TOPLU:
+                    raise IstekHatasi(f"Tek istekte en çok {AZAMI_TOPLU} yazı gönderilebilir")
+            else:
+                ogeler = [istek]
+        except GovdeCokBuyuk:
+            self._json(413, {'hata': f"Gövde en çok {AZAMI_GOVDE // (1024 * 1024)} MB olabilir"})
+            return
+        except IstekHatasi as e:
+            self._json(400, {'hata': str(e)})
+            return
+
+        if not servis.yer.acquire(blocking=False):
+            with servis.sayac_kilidi:
+                servis.reddedilen += 1
+            self._json(503, {'hata': "Servis meşgul, daha sonra yeniden deneyin"}, [('Retry-After', '1')])
+            return
+        try:
+            with servis.calisan:
+                with servis.sayac_kilidi:
+                    servis.calisan_sayisi += 1
+                try:
+                    belge = parse_qs(adres.query).get('belge', ['1'])[0] not in ('0', 'hayir', 'false')
+                    sonuclar = yazilari_isle(ogeler, servis.musteri.guncel(), belge, servis.havuz)
+                finally:
+                    with servis.sayac_kilidi:
+                        servis.calisan_sayisi -= 1
+        except Exception as e:
+            self._json(500, {'hata': str(e)})
+            return
+        finally:
+            servis.yer.release()
+        with servis.sayac_kilidi:
+            servis.islenen += len(ogeler)
+
+        if adres.path == '/toplu':
+            self._json(200, {'sonuclar': sonuclar})
+        elif 'hata' in sonuclar[0]:
+            self._json(400, sonuclar[0])
+        else:
+            self._json(200, sonuclar[0])
+
+
+class YanitServisi(ThreadingHTTPServer):
+    """Müşteri listesini ve şablonu sıcak tutan, işlem sayısı sınırlı HTTP sunucusu"""
+
+    daemon_threads = True
+
+    def __init__(self, musteri_yolu, adres=VARSAYILAN_ADRES, port=VARSAYILAN_PORT, is_sayisi=None, surec=False,
+                 kuyruk=VARSAYILAN_KUYRUK, ayrintili=False, kayit=print):
+        self.kayit = kayit
+        self.ayrintili = ayrintili
+        self.is_sayisi = is_sayisi or motor.varsayilan_is_sayisi()
+        self.calisan = threading.BoundedSemaphore(self.is_sayisi)
+        self.yer = threading.BoundedSemaphore(self.is_sayisi + kuyruk)
+        self.sayac_kilidi = threading.Lock()
+        self.calisan_sayisi = 0
+        self.islenen = 0
+        self.reddedilen = 0
+
+        # İlk istek beklemesin: liste, şablon ve ağır kütüphaneler şimdi yüklenir
+        bas = time.perf_counter()
+        self.musteri = motor.MusteriListesiTakibi(musteri_yolu, kayit)
+        self.musteri.guncel()
+        motor.yanit_sablonu()
+        self.havuz = ProcessPoolExecutor(max_workers=self.is_sayisi) if surec else None
+        self.kayit(f"Hazırlık: {time.perf_counter() - bas:.2f} s")
+
+        super().__init__((adres, port), _Isleyici)
+
+    def handle_error(self, request, client_address):
+        # Yanıt beklemeden kopan istemciler olağandır; yığın dökümü basılmaz
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        if self.havuz is not None:
+            self.havuz.shutdown(cancel_futures=True)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Sonuç geçmişi: (dosya, sayı, tarih) üzerinden güncelleme ve arama"""
+
+import pytest
+
+import motor
+from gecmis import SonucDeposu
+
+
+def sonuc(dosya, metin, musteri_mi=False, **ek):
+    s = motor.sonuc_olustur(dosya, motor.bilgi_cikar(metin), None)
+    s['musteri_mi'] = musteri_mi
+    s.update(ek)
+    return s
+
+
+A = ("İstanbul Vergi Dairesi Başkanlığı\nTarih: 01.02.2025\nSayı: E-11111111-100\n"
+     "55555555550 T.C. Kimlik Numaralı Ali Veli ve 1234567890 Vergi Kimlik Numaralı firma")
+B = "ANKARA İCRA MÜDÜRLÜĞÜ\nTarih: 15.03.2025\nSayı: E-22222222-100\n12345678950 Kimlik Numaralı Ayşe Yılmaz"
+C = "ANKARA İCRA MÜDÜRLÜĞÜ\nTarih: 20.01.2025\nSayı: E-33333333-100\n98765432150 Kimlik Numaralı Can Demir"
+
+
+@pytest.fixture
+def depo(tmp_path):
+    depo = SonucDeposu(str(tmp_path / 'gecmis.db'))
+    yield depo
+    depo.kapat()
+
+
+def test_ayni_yazi_guncellenir_yanit_bilgisi_korunur(depo):
+    depo.kaydet([sonuc('/gelen/a.txt', A, yanit_durumu=motor.DURUM_TAMAM, cikti='/cikti/Yanit_a.docx')])
+    ilk = depo.ara()[0]['ilk_islem']
+    # Yeniden analiz: yanıt alanları boş, müşteri durumu değişmiş
+    depo.kaydet([sonuc('/gelen/a.txt', A, musteri_mi=True)])
+    assert depo.kayit_sayisi() == 1
+    s = depo.ara()[0]
+    assert s['musteri_mi'] is True
+    assert s['cikti'] == '/cikti/Yanit_a.docx' and s['yanit_durumu'] == motor.DURUM_TAMAM
+    assert s['ilk_islem'] == ilk and s['son_islem'] >= ilk
+
+    # Aynı dosyada başka sayı / başka dosyada aynı sayı ayrı kayıttır
+    depo.kaydet([sonuc('/gelen/a.txt', A.replace('E-11111111', 'E-11111112')), sonuc('/gelen/b.txt', A)])
+    assert depo.kayit_sayisi() == 3
+
+
+def test_ara(depo):
+    depo.kaydet([sonuc('/gelen/a.txt', A, yanit_durumu=motor.DURUM_TAMAM, cikti='/cikti/Yanit_a.docx'),
+                 sonuc('/gelen/b.txt', B, musteri_mi=True),
+                 sonuc('/gelen/c.txt', C)])
+
+    def adlar(**filtre):
+        return [s['dosya_adi'] for s in depo.ara(**filtre)]
+
+    # Yazı tarihine göre yeniden eskiye
+    assert adlar() == ['b.txt', 'a.txt', 'c.txt']
+    # Birincil olmayan kimlik de bulunur; tür ayrımı
+    assert adlar(kimlik='1234567890') == ['a.txt']
+    assert adlar(kimlik='1234567890', tur='tckn') == []
+    assert adlar(sayi=' E-22222222-100 ') == ['b.txt']
+    # Kurum araması büyük / küçük harf ve Türkçe İ / ı duyarsız
+    assert adlar(kurum='icra müdürlüğü') == ['b.txt', 'c.txt']
+    assert adlar(kurum='VERGİ DAİRESİ') == ['a.txt']
+    assert adlar(baslangic='01.02.2025', bitis='2025-03-01') == ['a.txt']
+    assert adlar(musteri_mi=True) == ['b.txt']
+    assert adlar(musteri_mi=False) == ['a.txt', 'c.txt']
+    assert adlar(yanitlanan=True) == ['a.txt']
+    assert adlar(sinir=1) == ['b.txt']
+
+    s = depo.ara(kimlik='55555555550')[0]
+    assert s['bilgiler']['sayi'] == 'E-11111111-100'
+    with pytest.raises(ValueError):
+        depo.ara(baslangic='2025/99/99')
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Gelen kutusu izleyici: durulma beklemesi ve islenen/ ya da hatali/ klasörüne taşıma"""
+
+import os
+
+import pytest
+
+from izleyici import GelenKutusuIzleyici
+
+
+@pytest.fixture
+def izleyici(tmp_path):
+    pytest.importorskip('docx')
+    liste = tmp_path / 'musteriler.csv'
+    liste.write_text('TCKN,VKN,Ad Soyad\n55555555550,,Şükrü Öztürk\n', encoding='utf-8')
+    gelen = tmp_path / 'gelen'
+    gelen.mkdir()
+    # calistir() yanıt klasörünü açar; testler turları doğrudan çalıştırır
+    (tmp_path / 'cikti').mkdir()
+    kayitlar = []
+    izleyici = GelenKutusuIzleyici(str(gelen), str(tmp_path / 'cikti'), str(liste), durulma=0, bildirim=False,
+                                   kayit=kayitlar.append)
+    izleyici.kayitlar = kayitlar
+    return izleyici
+
+
+def klasor_icerigi(klasor):
+    return sorted(os.listdir(klasor)) if os.path.isdir(klasor) else []
+
+
+def test_dosya_durulmadan_islenmez(izleyici):
+    yol = os.path.join(izleyici.klasor, 'yazi.txt')
+    with open(yol, 'w', encoding='utf-8') as f:
+        f.write('Sayı: E-11111111-100\n')
+    # İlk görülme: boyut / zaman kaydedilir
+    assert izleyici.tur(True) is True
+    # Hâlâ yazılıyor: değişiklik durulmayı baştan başlatır
+    with open(yol, 'a', encoding='utf-8') as f:
+        f.write('98765432150 T.C. Kimlik Numaralı Ayşe Yılmaz\n')
+    assert izleyici.tur(True) is True
+    assert os.path.exists(yol)
+
+    assert izleyici.tur(True) is False
+    assert not os.path.exists(yol)
+    assert klasor_icerigi(izleyici.islenen) == ['yazi.txt']
+    assert len(klasor_icerigi(izleyici.cikti)) == 1
+    assert izleyici.islenen_sayisi == 1
+
+
+def test_sonuca_gore_tasima(izleyici):
+    yazilar = {
+        'musteri.txt': 'Sayı: E-11111111-100\nT.C. Kimlik No: 55555555550\n',
+        'degil.txt': 'Sayı: E-22222222-100\n98765432150 T.C. Kimlik Numaralı Ayşe Yılmaz\n',
+        'kimliksiz.txt': 'Sayı: E-33333333-100\nkimlik numarası yok\n',
+        'bozuk.docx': 'docx değil',
+        'notlar.md': 'desteklenmeyen uzantı',
+    }
+    for ad, metin in yazilar.items():
+        with open(os.path.join(izleyici.klasor, ad), 'w', encoding='utf-8') as f:
+            f.write(metin)
+    izleyici.tur(True)
+    izleyici.tur(True)
+
+    assert klasor_icerigi(izleyici.islenen) == ['degil.txt', 'musteri.txt']
+    assert klasor_icerigi(izleyici.hatali) == ['bozuk.docx', 'kimliksiz.txt']
+    # Yalnızca müşteri olmayana yanıt yazılır
+    assert len(klasor_icerigi(izleyici.cikti)) == 1
+    assert (izleyici.islenen_sayisi, izleyici.hatali_sayisi) == (2, 2)
+    # Desteklenmeyen dosya ve alt klasörler yerinde kalır
+    assert klasor_icerigi(izleyici.klasor) == ['hatali', 'islenen', 'notlar.md']
+    assert any('kimliksiz.txt' in k and 'HATA' in k for k in izleyici.kayitlar)
+
+
+def test_ayni_adli_dosya_uzerine_yazilmaz(izleyici):
+    os.makedirs(izleyici.hatali)
+    with open(os.path.join(izleyici.hatali, 'yazi.txt'), 'w', encoding='utf-8') as f:
+        f.write('önceki')
+    with open(os.path.join(izleyici.klasor, 'yazi.txt'), 'w', encoding='utf-8') as f:
+        f.write('kimlik yok')
+    izleyici.tur(True)
+    izleyici.tur(True)
+    assert klasor_icerigi(izleyici.hatali) == ['yazi.txt', 'yazi_1.txt']
+
+
+def test_yanit_klasoru_gelen_klasoru_olamaz(tmp_path):
+    with pytest.raises(ValueError):
+        GelenKutusuIzleyici(str(tmp_path), str(tmp_path), str(tmp_path / 'liste.csv'), bildirim=False)
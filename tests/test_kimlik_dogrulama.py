@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""TCKN / VKN sağlama kuralları: bilinen değerler ve tekil / toplu sürümlerin uyumu"""
+
+import random
+
+import numpy as np
+import pytest
+
+from kimlik_dogrulama import tckn_gecerli, tckn_gecerli_mi, vkn_gecerli, vkn_gecerli_mi
+from musteri_indeksi import kimlik_anahtarlari
+
+GECERLI_TCKN = ['10000000146', '12345678950', '98765432150', '55555555550']
+GECERSIZ_TCKN = [
+    '10000000147',  # 11. hane yanlış
+    '10000000156',  # 10. hane yanlış
+    '02345678950',  # 0 ile başlıyor
+    '1234567895',   # 10 hane
+    '123456789500',  # 12 hane
+    '1234567895a',
+    '',
+]
+GECERLI_VKN = ['1234567890', '9876543217', '1111111114', '0123456789', '0000000019']
+GECERSIZ_VKN = ['1234567891', '9876543210', '0000000010', '123456789', '12345678901', '12345678a0', '']
+
+
+@pytest.mark.parametrize('tckn', GECERLI_TCKN)
+def test_gecerli_tckn(tckn):
+    assert tckn_gecerli_mi(tckn)
+
+
+@pytest.mark.parametrize('tckn', GECERSIZ_TCKN)
+def test_gecersiz_tckn(tckn):
+    assert not tckn_gecerli_mi(tckn)
+
+
+@pytest.mark.parametrize('vkn', GECERLI_VKN)
+def test_gecerli_vkn(vkn):
+    assert vkn_gecerli_mi(vkn)
+
+
+@pytest.mark.parametrize('vkn', GECERSIZ_VKN)
+def test_gecersiz_vkn(vkn):
+    assert not vkn_gecerli_mi(vkn)
+
+
+def test_toplu_surumler_bilinen_degerler():
+    tcknler = GECERLI_TCKN + GECERSIZ_TCKN
+    beklenen = [True] * len(GECERLI_TCKN) + [False] * len(GECERSIZ_TCKN)
+    assert tckn_gecerli(kimlik_anahtarlari(tcknler)).tolist() == beklenen
+
+    # Baştaki sıfırları anahtarda kaybolan VKN'ler de 10 haneye tamamlanıp denetlenir
+    vknler = [v for v in GECERLI_VKN + GECERSIZ_VKN if len(v) == 10 and v.isdigit()]
+    assert vkn_gecerli(kimlik_anahtarlari(vknler)).tolist() == [vkn_gecerli_mi(v) for v in vknler]
+
+
+def test_toplu_surumler_bos_ve_gecersiz_anahtar():
+    assert tckn_gecerli(np.array([-1, 0], dtype=np.int64)).tolist() == [False, False]
+    assert vkn_gecerli(np.array([-1], dtype=np.int64)).tolist() == [False]
+    assert tckn_gecerli(np.zeros(0, dtype=np.int64)).tolist() == []
+
+
+def test_tekil_ve_toplu_surumler_ayni_sonucu_verir():
+    rastgele = random.Random(7)
+    tcknler = [str(rastgele.randrange(10 ** 10, 10 ** 11)) for _ in range(20000)] + GECERLI_TCKN
+    vknler = [str(rastgele.randrange(10 ** 10)).zfill(10) for _ in range(20000)] + GECERLI_VKN
+
+    assert tckn_gecerli(kimlik_anahtarlari(tcknler)).tolist() == [tckn_gecerli_mi(t) for t in tcknler]
+    assert vkn_gecerli(kimlik_anahtarlari(vknler)).tolist() == [vkn_gecerli_mi(v) for v in vknler]
+    # Örneklemde her iki sonuç da bolca bulunmalı (yaklaşık %1 / %10 geçerli)
+    assert 50 < sum(map(tckn_gecerli_mi, tcknler)) < 1000
+    assert 1000 < sum(map(vkn_gecerli_mi, vknler)) < 3000
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""İşlem manifestosu: kaldığı yerden devam, atlama, sürüm uyuşmazlığı ve yanıt yolu"""
+
+import os
+import zipfile
+
+import pytest
+
+import motor
+from manifest import DURUM_HATA, DURUM_TAMAM, MANIFEST_DOSYASI, IslemManifesti
+
+YAZI = 'Sayı: E-11111111-100\nTarih: 01.02.2025\n55555555550 T.C. Kimlik Numaralı Ali Veli\n'
+
+
+@pytest.fixture
+def klasor(tmp_path):
+    for i in range(3):
+        (tmp_path / f'{i}.txt').write_text(YAZI, encoding='utf-8')
+    return tmp_path
+
+
+def test_kaldigi_yerden_devam(klasor):
+    dosyalar = [str(klasor / f'{i}.txt') for i in range(3)]
+    manifest = IslemManifesti(str(klasor), motor.CIKARICI_SURUMU)
+    analiz = motor.analiz_et(dosyalar, None, manifest=manifest)
+    next(analiz)
+    analiz.close()  # İlk dosyadan sonra yarıda kalan çalıştırma
+
+    manifest = IslemManifesti(str(klasor), motor.CIKARICI_SURUMU)
+    sonuclar = list(motor.analiz_et(dosyalar, None, manifest=manifest))
+    assert [bool(s.get('onceki')) for _, s, _ in sonuclar] == [True, False, False]
+    assert sonuclar[0][1]['bilgiler'] == sonuclar[1][1]['bilgiler']
+
+
+def test_degisen_hatali_ve_baska_surum_atlanmaz(klasor):
+    yol = str(klasor / '0.txt')
+    manifest = IslemManifesti(str(klasor), 1)
+    manifest.analiz_yaz(yol, DURUM_TAMAM, {'sayi': 'E-1'})
+    manifest.analiz_yaz(str(klasor / '1.txt'), DURUM_HATA, hata='okunamadı')
+
+    yeniden = IslemManifesti(str(klasor), 1)
+    assert yeniden.onceki_kayit(yol)['bilgiler'] == {'sayi': 'E-1'}
+    assert yeniden.onceki_kayit(str(klasor / '1.txt')) is None
+    assert yeniden.onceki_kayit(str(klasor / '2.txt')) is None
+    # Başka çıkarıcı sürümü
+    assert IslemManifesti(str(klasor), 2).onceki_kayit(yol) is None
+    # Dosya değişti
+    with open(yol, 'a', encoding='utf-8') as f:
+        f.write('ek satır\n')
+    assert yeniden.onceki_kayit(yol) is None
+
+
+def test_yarim_satir_yok_sayilir_ve_sifirla(klasor):
+    yol = str(klasor / '0.txt')
+    manifest = IslemManifesti(str(klasor), 1)
+    manifest.analiz_yaz(yol, DURUM_TAMAM, {'sayi': 'E-1'})
+    with open(klasor / MANIFEST_DOSYASI, 'a', encoding='utf-8') as f:
+        f.write('{"dosya": "1.txt", "dur')
+
+    manifest = IslemManifesti(str(klasor), 1)
+    assert list(manifest.kayitlar) == ['0.txt']
+    manifest.sifirla()
+    assert manifest.onceki_kayit(yol) is None
+
+
+def test_yerinde_olmayan_yanit_yanitlanmamis_sayilir(klasor, tmp_path_factory):
+    cikti_klasoru = tmp_path_factory.mktemp('cikti')
+    yanit = cikti_klasoru / 'Yanit_0.docx'
+    yanit.write_bytes(b'belge')
+    paket = cikti_klasoru / 'yanitlar.zip'
+    with zipfile.ZipFile(paket, 'w') as zf:
+        zf.writestr('yanitlar/Yanit_1.docx', b'belge')
+
+    dosyalar = [str(klasor / f'{i}.txt') for i in range(2)]
+    manifest = IslemManifesti(str(klasor), 1)
+    for dosya, cikti in zip(dosyalar, (str(yanit), os.path.join(str(paket), 'yanitlar/Yanit_1.docx'))):
+        manifest.analiz_yaz(dosya, DURUM_TAMAM, {})
+        manifest.cikti_yaz(dosya, cikti)
+    assert [manifest.onceki_kayit(d)['cikti'] for d in dosyalar] == [
+        str(yanit), os.path.join(str(paket), 'yanitlar/Yanit_1.docx')]
+
+    yanit.unlink()
+    paket.unlink()
+    assert [manifest.onceki_kayit(d)['cikti'] for d in dosyalar] == [None, None]
+    # Bellekteki kayıt değişmez; yanıt geri gelirse yine yanıtlanmış sayılır
+    yanit.write_bytes(b'belge')
+    assert manifest.onceki_kayit(dosyalar[0])['cikti'] == str(yanit)
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""İşlem motoru: müşteri eşleştirme yolları ve PDF erken durma"""
+
+import copy
+
+import pytest
+
+import motor
+
+
+@pytest.fixture
+def musteri_listesi(tmp_path):
+    yol = tmp_path / 'musteriler.csv'
+    yol.write_text('TCKN,VKN,Ad Soyad\n'
+                   '55555555550,,Şükrü Öztürk\n'
+                   ',1234567890,İğdır Gıda\n'
+                   '12345678950,,\n'
+                   '12345678901,,Sağlaması Bozuk\n', encoding='utf-8')
+    indeks = motor.musteri_listesi_oku(str(yol))
+    yield indeks
+    indeks.kapat()
+
+
+YAZILAR = [
+    # Tek TCKN, müşteri; ad listeden gelir
+    'Sayı: E-11111111-100\nTarih: 01.02.2025\nT.C. Kimlik No: 55555555550\n',
+    # Müşteri olmayan TCKN, ad yazıda
+    'Sayı: E-22222222-100\n98765432150 T.C. Kimlik Numaralı Ayşe Yılmaz hakkında',
+    # Birincil TCKN müşteri değil, ikinci kimlik (VKN) müşteri
+    'Sayı: E-33333333-100\n10000000146 Kimlik Numaralı Ali Veli ve 1234567890 Vergi Kimlik Numaralı firma',
+    # Sağlaması bozuk aday elenir, kimlik kalmaz
+    'Sayı: E-44444444-100\n10000000147 numaralı dosya',
+    # Birden fazla TCKN, ikisi müşteri (biri adsız)
+    'Sayı: E-55555555-100\n98765432150 Ayşe Yılmaz, 12345678950 ve 55555555550 Kimlik Numaralı kişiler',
+    # Sağlaması tutmayan tek aday listede var: müşteri; telefon numarası eşleşmez
+    'Sayı: E-66666666-100\nTel: 03121234567\n12345678901 T.C. Kimlik Numaralı kişi',
+]
+
+
+@pytest.mark.parametrize('liste', [True, False])
+def test_tekil_ve_toplu_eslestirme_ayni(musteri_listesi, liste):
+    musteri_listesi = musteri_listesi if liste else None
+    bilgiler = [motor.bilgi_cikar(y) for y in YAZILAR] * 3
+    tekil = [motor.sonuc_eslestir(motor.sonuc_olustur(f'{i}.txt', copy.deepcopy(b), None), musteri_listesi)
+             for i, b in enumerate(bilgiler)]
+    toplu = [motor.sonuc_olustur(f'{i}.txt', copy.deepcopy(b), None) for i, b in enumerate(bilgiler)]
+    # Eşiğin üstünde: vektörel sorgu yolu
+    assert len(toplu) >= motor.TOPLU_SORGU_ESIGI
+    motor.sonuclari_eslestir(toplu, musteri_listesi)
+    assert tekil == toplu
+
+    if liste:
+        # Tek yazının sonucu (tekil sorgu yolu) da aynı
+        assert motor.sonuc_olustur('0.txt', copy.deepcopy(bilgiler[0]), musteri_listesi) == tekil[0]
+        assert [s['musteri_mi'] for s in tekil[:6]] == [True, False, True, False, True, True]
+        assert tekil[0]['bilgiler']['adsoyad'] == 'Şükrü Öztürk'
+        assert [d['musteri_mi'] for d in tekil[4]['kimlik_durumlari']] == [False, True, True]
+        assert tekil[5]['kimlik_durumlari'] == [{'tur': 'tckn', 'kimlik': '12345678901', 'adsoyad': 'Sağlaması Bozuk',
+                                                 'musteri_mi': True, 'supheli': True}]
+    else:
+        assert all(s['musteri_mi'] is None for s in tekil)
+
+
+@pytest.mark.parametrize('metin', [
+    'x 12345678901 y', '123456789012', 'a12345678901', '12345678901a', '_1234567890', '1234567890-12345678901',
+    '(1234567890)', '12345678901\n98765432150', '٠١٢٣٤٥٦٧٨٩٠', '123456789',
+])
+def test_kimlik_deseni_kelime_sinirli_desenle_ayni(metin):
+    import re
+
+    beklenen = [m.group(1) for m in re.finditer(r'\b(\d{10,11})\b', metin)]
+    assert [m.group(1) for m in motor.KIMLIK_DESENI.finditer(metin)] == beklenen
+
+
+def test_kimliksiz_yaziya_otomatik_red_verilmez(musteri_listesi):
+    sonuclar = [motor.sonuc_olustur(f'{i}.txt', motor.bilgi_cikar(y), musteri_listesi) for i, y in enumerate(YAZILAR)]
+    kimliksiz = sonuclar[3]
+    assert motor.kimliksiz_mi(kimliksiz)
+    assert not motor.yanit_bekliyor_mu(kimliksiz)
+    assert motor.rapor_aksiyonu(kimliksiz).startswith('Manuel inceleme')
+    # Yalnızca kimliği okunan ve müşteri olmayan yazı yanıt bekler
+    assert [motor.yanit_bekliyor_mu(s) for s in sonuclar] == [False, True, False, False, False, False]
+
+
+def test_hazirlik_hatasi_yalnizca_o_dosyanin_hatasi(tmp_path, musteri_listesi):
+    from onbellek import CikarimOnbellegi, dosya_ozeti
+
+    dosyalar = []
+    for i, yazi in enumerate(YAZILAR[:3]):
+        yol = tmp_path / f'{i}.txt'
+        yol.write_text(yazi, encoding='utf-8')
+        dosyalar.append(str(yol))
+    bozuk = dosya_ozeti(dosyalar[1])
+
+    class BozukOnbellek(CikarimOnbellegi):
+        def getir(self, ozet):
+            if ozet == bozuk:
+                raise RuntimeError('önbellek okunamadı')
+            return super().getir(ozet)
+
+    onbellek = BozukOnbellek(str(tmp_path / 'onbellek.db'), motor.CIKARICI_SURUMU)
+    try:
+        sonuclar = list(motor.analiz_et(dosyalar, musteri_listesi, onbellek=onbellek))
+    finally:
+        onbellek.kapat()
+    assert [(d, h) for d, _, h in sonuclar] == [(dosyalar[0], None), (dosyalar[1], 'önbellek okunamadı'),
+                                                (dosyalar[2], None)]
+    assert [s['musteri_mi'] for _, s, h in sonuclar if h is None] == [True, True]
+
+
+def pdf_yaz(yol, sayfalar):
+    fitz = pytest.importorskip('fitz')
+    belge = fitz.open()
+    for metin in sayfalar:
+        belge.new_page().insert_text((72, 72), metin, fontsize=10)
+    belge.save(yol)
+    belge.close()
+
+
+@pytest.fixture
+def pdf_kutuphanesi():
+    if motor.PDF_LIB is None:
+        pytest.skip("PDF kütüphanesi yok")
+
+
+def test_erken_durma_sonraki_sayfalardaki_kimlikleri_kesmez(tmp_path, pdf_kutuphanesi):
+    yol = str(tmp_path / 'yazi.pdf')
+    pdf_yaz(yol, [
+        "ANKARA VERGI DAIRESI BASKANLIGI\nTarih: 01.02.2025\nSayi: E-12345678-100\n"
+        "Asagida kimlik numaralari belirtilen kisilerin\n55555555550 Kimlik Numarali Ali Veli",
+        "12345678950 Kimlik Numarali Ayse Yilmaz\n98765432150 Kimlik Numarali Mehmet Kaya",
+    ])
+    tam = motor.bilgi_cikar(motor.pdf_oku(yol))
+    erken = motor.bilgi_cikar(motor.pdf_oku(yol, erken_dur=True))
+    assert [k['kimlik'] for k in erken['kimlikler']] == ['55555555550', '12345678950', '98765432150']
+    assert erken == tam
+
+
+def test_erken_durma_kimlik_bolumu_bitince_durur(tmp_path, pdf_kutuphanesi):
+    yol = str(tmp_path / 'yazi.pdf')
+    pdf_yaz(yol, [
+        "Tarih: 01.02.2025\nSayi: E-12345678-100\n55555555550 Kimlik Numarali Ali Veli",
+        "12345678950 Kimlik Numarali Ayse Yilmaz",
+        "Bilgilerinize arz ederiz.",
+        "OKUNMAMASI GEREKEN SAYFA",
+    ])
+    metin = motor.pdf_oku(yol, erken_dur=True)
+    assert 'Bilgilerinize' in metin and 'OKUNMAMASI' not in metin
+    assert 'OKUNMAMASI' in motor.pdf_oku(yol)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Derlenmiş müşteri indeksi: derleme, tekil / toplu sorgu, eksik anahtarlar ve boş indeks"""
+
+import os
+
+import pytest
+
+import motor
+from kimlik_dogrulama import GECERSIZ
+from musteri_indeksi import INDEKS_UZANTISI, MusteriIndeksi
+
+MUSTERILER = [
+    # (TCKN, VKN, ad soyad)
+    ('55555555550', '', 'Şükrü Öztürk'),
+    ('10000000146', '', ''),
+    ('', '0000000019', 'Çağrı Lojistik A.Ş.'),
+    ('', '1234567890', 'İğdır Gıda'),
+    ('12345678950', '9876543217', 'Ayşe Yılmaz'),
+    ('55555555550', '', 'Sonraki Kayıt'),  # aynı TCKN: ilk satır geçerli
+    ('10000000147', '', 'Sağlaması Bozuk'),  # sağlaması tutmasa da listede olduğu için eşleşir
+]
+
+
+def csv_yaz(yol, satirlar):
+    with open(yol, 'w', encoding='utf-8') as f:
+        f.write('TCKN,VKN,Ad Soyad\n')
+        for satir in satirlar:
+            f.write(','.join(satir) + '\n')
+
+
+@pytest.fixture
+def indeks(tmp_path):
+    yol = str(tmp_path / 'musteriler.csv')
+    csv_yaz(yol, MUSTERILER)
+    indeks = motor.musteri_listesi_oku(yol)
+    yield indeks
+    indeks.kapat()
+
+
+def test_derleme_ve_tekil_sorgu(indeks):
+    assert len(indeks) == len(MUSTERILER)
+    assert indeks.sorgula('55555555550') == (True, 'Şükrü Öztürk')
+    assert indeks.sorgula('10000000146') == (True, None)
+    assert indeks.sorgula(vkn='1234567890') == (True, 'İğdır Gıda')
+    # Baştaki sıfırlar kaybolsa da VKN bulunur
+    assert indeks.sorgula(vkn='0000000019') == (True, 'Çağrı Lojistik A.Ş.')
+    assert indeks.sorgula(vkn='19') == (True, 'Çağrı Lojistik A.Ş.')
+    # TCKN bulunamazsa VKN'ye bakılır
+    assert indeks.sorgula('98765432150', '9876543217') == (True, 'Ayşe Yılmaz')
+
+
+def test_eksik_ve_gecersiz_anahtarlar(indeks):
+    assert indeks.sorgula('98765432150') == (False, None)
+    assert indeks.sorgula(vkn='1111111114') == (False, None)
+    assert indeks.sorgula('', '') == (False, None)
+    # Listede olmayan, sağlaması da tutmayan kimlik müşteri değil sayılmaz
+    assert indeks.sorgula('10000000148') == (GECERSIZ, None)
+    assert indeks.sorgula(vkn='1111111111') == (GECERSIZ, None)
+    assert indeks.sorgula('abc', None) == (GECERSIZ, None)
+    # Sağlaması tutan diğer kimlik bulunamadıysa müşteri değil
+    assert indeks.sorgula('10000000148', '1111111114') == (False, None)
+    # Dizinin iki ucunun dışındaki anahtarlar
+    assert indeks.sorgula('99999999990') == (False, None)
+    assert indeks.satir_bul('tckn', '1') is None
+
+
+def test_sagla_tutmayan_liste_kaydi_eslesir(indeks):
+    assert indeks.sorgula('10000000147') == (True, 'Sağlaması Bozuk')
+    assert indeks.toplu_sorgula(['10000000147'], ['']) == ([True], ['Sağlaması Bozuk'])
+
+
+def test_toplu_sorgu_tekil_sorguyla_ayni(indeks):
+    tcknler = ['55555555550', '', '98765432150', '10000000147', 'abc', '10000000146', '12345678950', '',
+               '10000000148', '10000000148', '', '98765432150']
+    vknler = ['', '1234567890', '9876543217', '', '', '', '', '0000000019',
+              '', '1111111114', '1111111111', '1111111111']
+    musteri, adlar = indeks.toplu_sorgula(tcknler, vknler)
+    assert list(zip(musteri, adlar)) == [indeks.sorgula(t, v) for t, v in zip(tcknler, vknler)]
+    assert musteri == [True, True, True, True, GECERSIZ, True, True, True, GECERSIZ, False, GECERSIZ, False]
+
+
+def test_bos_indeks(tmp_path):
+    yol = str(tmp_path / 'bos.csv')
+    csv_yaz(yol, [])
+    indeks = motor.musteri_listesi_oku(yol)
+    try:
+        assert len(indeks) == 0
+        assert indeks.sorgula('55555555550', '1234567890') == (False, None)
+        assert indeks.toplu_sorgula(['55555555550', ''], ['', '1234567890']) == ([False, False], [None, None])
+        assert indeks.toplu_sorgula([], []) == ([], [])
+    finally:
+        indeks.kapat()
+
+
+def test_indeks_yeniden_kullanilir_ve_kaynak_degisince_derlenir(tmp_path):
+    yol = str(tmp_path / 'musteriler.csv')
+    csv_yaz(yol, MUSTERILER)
+    motor.musteri_listesi_oku(yol).kapat()
+    assert os.path.exists(yol + INDEKS_UZANTISI)
+
+    indeks = MusteriIndeksi.dosyadan(yol + INDEKS_UZANTISI)
+    assert indeks.sorgula('55555555550') == (True, 'Şükrü Öztürk')
+    indeks.kapat()
+
+    csv_yaz(yol, [('98765432150', '', 'Yeni Müşteri')])
+    indeks = motor.musteri_listesi_oku(yol)
+    try:
+        assert len(indeks) == 1
+        assert indeks.sorgula('98765432150') == (True, 'Yeni Müşteri')
+        assert indeks.sorgula('55555555550') == (False, None)
+    finally:
+        indeks.kapat()
+
+
+def test_paketteki_ornek_listenin_tum_satirlari_eslesir(tmp_path):
+    openpyxl = pytest.importorskip('openpyxl')
+    kaynak = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'musteri_listesi.xlsx')
+    yol = str(tmp_path / 'musteri_listesi.xlsx')
+    with open(kaynak, 'rb') as f, open(yol, 'wb') as g:
+        g.write(f.read())
+    sayfa = openpyxl.load_workbook(yol, read_only=True).active
+    satirlar = sayfa.iter_rows(values_only=True)
+    basliklar = [str(b).strip().upper() for b in next(satirlar)]
+    kayitlar = [dict(zip(basliklar, satir)) for satir in satirlar]
+    assert kayitlar
+    indeks = motor.musteri_listesi_oku(yol)
+    try:
+        for kayit in kayitlar:
+            for tur in ('tckn', 'vkn'):
+                if kayit.get(tur.upper()):
+                    assert indeks.sorgula(**{tur: str(kayit[tur.upper()])})[0] is True, kayit
+    finally:
+        indeks.kapat()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Çıkarım önbelleği: toplu yazma, LRU tahliyesi ve sürüm temizliği"""
+
+import itertools
+
+import pytest
+
+import onbellek
+from onbellek import CikarimOnbellegi
+
+
+@pytest.fixture
+def saat(monkeypatch):
+    """time.time yerine her çağrıda bir artan sayaç: erişim sırası belirli olsun"""
+    sayac = itertools.count(1)
+    monkeypatch.setattr(onbellek.time, 'time', lambda: float(next(sayac)))
+
+
+def test_kaydet_getir_ve_yaz(tmp_path):
+    yol = str(tmp_path / 'onbellek.db')
+    ob = CikarimOnbellegi(yol, 1)
+    ob.kaydet('a', 'metin', {'tckn': '55555555550'})
+    # Yazılmadan önce de bekleyenlerden döner
+    assert ob.getir('a') == ('metin', {'tckn': '55555555550'})
+    assert ob.getir('b') is None
+    assert (ob.isabet, ob.iskalama) == (1, 1)
+    ob.kapat()
+
+    ob = CikarimOnbellegi(yol, 1)
+    try:
+        assert ob.getir('a') == ('metin', {'tckn': '55555555550'})
+        assert ob.toplam_boyut > 0
+    finally:
+        ob.kapat()
+
+
+def test_parti_dolunca_kendiliginden_yazar(tmp_path, monkeypatch):
+    monkeypatch.setattr(onbellek, 'ONBELLEK_PARTI', 2)
+    ob = CikarimOnbellegi(str(tmp_path / 'onbellek.db'), 1)
+    try:
+        ob.kaydet('a', 'x', {})
+        assert ob.bekleyen
+        ob.kaydet('b', 'y', {})
+        assert not ob.bekleyen
+        assert ob.baglanti.execute("SELECT COUNT(*) FROM cikarim").fetchone()[0] == 2
+    finally:
+        ob.kapat()
+
+
+def test_lru_tahliyesi(tmp_path, saat):
+    boyut = len('x' * 100) + len('{}')
+    ob = CikarimOnbellegi(str(tmp_path / 'onbellek.db'), 1, azami_boyut=3 * boyut)
+    try:
+        for ozet in 'abc':
+            ob.kaydet(ozet, 'x' * 100, {})
+        ob.yaz()
+        # 'a' yeniden kullanıldı; en eski erişilen artık 'b'
+        assert ob.getir('a') is not None
+        ob.kaydet('d', 'x' * 100, {})
+        ob.yaz()
+        assert ob.toplam_boyut == 3 * boyut
+        assert [o for o in 'abcd' if ob.getir(o) is not None] == ['a', 'c', 'd']
+        # Sınırdan büyük kayıt hiç saklanmaz
+        ob.kaydet('e', 'x' * 1000, {})
+        assert ob.getir('e') is None
+    finally:
+        ob.kapat()
+
+
+def test_surum_degisince_eski_kayitlar_silinir(tmp_path):
+    yol = str(tmp_path / 'onbellek.db')
+    ob = CikarimOnbellegi(yol, 1)
+    ob.kaydet('a', 'metin', {})
+    ob.kapat()
+
+    ob = CikarimOnbellegi(yol, 2)
+    try:
+        assert ob.getir('a') is None
+        assert ob.toplam_boyut == 0
+    finally:
+        ob.kapat()
+    # Silinen kayıt eski sürüme dönünce de gelmez
+    ob = CikarimOnbellegi(yol, 1)
+    try:
+        assert ob.getir('a') is None
+    finally:
+        ob.kapat()
+
+
+def test_temizle(tmp_path):
+    ob = CikarimOnbellegi(str(tmp_path / 'onbellek.db'), 1)
+    try:
+        ob.kaydet('a', 'metin', {})
+        ob.yaz()
+        ob.kaydet('b', 'metin', {})
+        ob.temizle()
+        assert ob.getir('a') is None and ob.getir('b') is None
+        assert ob.toplam_boyut == 0
+    finally:
+        ob.kapat()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""DOCX şablonu: şablondan üretilen belge python-docx çıktısıyla aynı olmalı"""
+
+import io
+import zipfile
+
+import pytest
+
+docx = pytest.importorskip('docx')
+
+import motor  # noqa: E402
+from sablon import BELGE_PARCASI, DocxSablonu  # noqa: E402
+
+BILGILER = {
+    'muhatap_kurum': 'Ankara Vergi Dairesi Başkanlığı', 'muhatap_alt1': 'Çankaya Vergi Dairesi Müdürlüğü',
+    'muhatap_alt2': '', 'tarih': '05.03.2025', 'sayi': 'E-12345678-120.01-999',
+    'tckn': '10000000146', 'vkn': '', 'adsoyad': 'Şükrü Öztürk & Oğulları <Ltd>',
+}
+
+
+def paragraflar(veri):
+    """Belgenin karşılaştırılacak yapısı: (metin, hizalama, run metinleri ve kalınlıkları)"""
+    belge = docx.Document(io.BytesIO(veri))
+    return [(p.text, p.alignment, [(r.text, r.bold) for r in p.runs]) for p in belge.paragraphs]
+
+
+def python_docx_baytlari(bilgiler, durum, kimlikler=None):
+    tampon = io.BytesIO()
+    motor.belge_olustur(*(bilgiler[k] for k in ('muhatap_kurum', 'muhatap_alt1', 'muhatap_alt2', 'tarih', 'sayi',
+                                                 'tckn', 'vkn', 'adsoyad')), durum, kimlikler).save(tampon)
+    return tampon.getvalue()
+
+
+def sablon_baytlari(bilgiler, durum, kimlikler=None):
+    return motor.belge_baytlari(*(bilgiler[k] for k in ('muhatap_kurum', 'muhatap_alt1', 'muhatap_alt2', 'tarih',
+                                                         'sayi', 'tckn', 'vkn', 'adsoyad')), durum, kimlikler)
+
+
+@pytest.mark.parametrize('durum', ["Müşterimiz DEĞİL", "Müşterimiz - Manuel işlem"])
+def test_sablon_python_docx_ile_ayni(durum):
+    # Şablon yolu gerçekten kullanılmalı (python-docx yoluna düşmemeli)
+    metinler = motor.yanit_metinleri(*(BILGILER[k] for k in ('muhatap_kurum', 'muhatap_alt1', 'muhatap_alt2',
+                                                              'tarih', 'sayi', 'tckn', 'vkn', 'adsoyad')), durum)
+    assert motor.yanit_sablonu().belge_xml({'METIN': metinler['metin'], 'ILGI': metinler['ilgi']}) is not None
+    # XML'de kaçış gerektiren karakterler ve boş kurum (paragrafı çıkarılır) dahil
+    assert len(paragraflar(sablon_baytlari(BILGILER, durum))) > 10
+    assert paragraflar(sablon_baytlari(BILGILER, durum)) == paragraflar(python_docx_baytlari(BILGILER, durum))
+
+
+def test_cok_kimlikli_metin_python_docx_yoluna_duser():
+    kimlikler = [{'tur': 'tckn', 'kimlik': '10000000146', 'adsoyad': 'Ali Veli'},
+                 {'tur': 'vkn', 'kimlik': '1234567890', 'adsoyad': ''}]
+    sablon = motor.yanit_sablonu()
+    assert sablon.doldur({'METIN': "satır\nsatır"}) is None
+    assert paragraflar(sablon_baytlari(BILGILER, "Müşterimiz DEĞİL", kimlikler)) == \
+        paragraflar(python_docx_baytlari(BILGILER, "Müşterimiz DEĞİL", kimlikler))
+
+
+def test_sablon_arsivi_gecerli_ve_diger_parcalar_aynen_kopyalanir():
+    sablon = motor.yanit_sablonu()
+    veri = sablon.doldur({'KURUM1': 'A', 'TARIH': 't', 'ILGI': 'i', 'METIN': ' baştaki boşluk'})
+    with zipfile.ZipFile(io.BytesIO(veri)) as zf:
+        assert zf.testzip() is None
+        xml = zf.read(BELGE_PARCASI).decode('utf-8')
+        assert 'xml:space="preserve"> baştaki boşluk<' in xml
+        assert '{{' not in xml
+        uretilen = {ad: zf.read(ad) for ad in zf.namelist() if ad != BELGE_PARCASI}
+
+    tampon = io.BytesIO()
+    motor._belge_iskeleti(['{{KURUM1}}'], '{{TARIH}}', '{{ILGI}}', '{{METIN}}').save(tampon)
+    ham = DocxSablonu(tampon.getvalue())
+    assert ham.yer_tutucular == {'KURUM1', 'TARIH', 'ILGI', 'METIN'}
+    with zipfile.ZipFile(tampon) as zf:
+        assert uretilen == {ad: zf.read(ad) for ad in zf.namelist() if ad != BELGE_PARCASI}
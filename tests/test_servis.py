@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Yerel HTTP servisi: başarılı istek, 400 / 413 / 503 yolları"""
+
+import http.client
+import json
+import threading
+
+import pytest
+
+import servis
+
+
+@pytest.fixture
+def sunucu(tmp_path):
+    pytest.importorskip('docx')
+    yol = tmp_path / 'musteriler.csv'
+    yol.write_text('TCKN,VKN,Ad Soyad\n55555555550,,Şükrü Öztürk\n', encoding='utf-8')
+    sunucu = servis.YanitServisi(str(yol), port=0, is_sayisi=1, kuyruk=0, kayit=lambda mesaj: None)
+    is_parcacigi = threading.Thread(target=sunucu.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    is_parcacigi.start()
+    yield sunucu
+    sunucu.shutdown()
+    sunucu.server_close()
+    is_parcacigi.join()
+
+
+def istek(sunucu, yol, govde=None, yontem='POST'):
+    """(durum kodu, başlıklar, JSON) döndür; govde baytsa olduğu gibi gönderilir"""
+    baglanti = http.client.HTTPConnection(*sunucu.server_address[:2], timeout=30)
+    try:
+        if govde is not None and not isinstance(govde, bytes):
+            govde = json.dumps(govde).encode('utf-8')
+        baglanti.request(yontem, yol, body=govde)
+        yanit = baglanti.getresponse()
+        return yanit.status, dict(yanit.getheaders()), json.loads(yanit.read())
+    finally:
+        baglanti.close()
+
+
+def test_yazi_ve_toplu(sunucu):
+    kod, _, veri = istek(sunucu, '/yazi', {'ad': 'a.txt', 'metin': 'Sayı: E-1-100\nT.C. Kimlik No: 55555555550\n'})
+    assert kod == 200
+    assert veri['musteri_mi'] is True and veri['yanit'] is None
+    assert veri['bilgiler']['adsoyad'] == 'Şükrü Öztürk'
+
+    kod, _, veri = istek(sunucu, '/toplu', {'yazilar': [
+        {'ad': 'b.txt', 'metin': 'Sayı: E-2-100\n98765432150 T.C. Kimlik Numaralı Ayşe Yılmaz'},
+        {'ad': 'c.txt', 'metin': 'Sayı: E-3-100\nkimlik yok'},
+        {'ad': 'd.exe', 'icerik': 'AAAA'},
+    ]})
+    assert kod == 200
+    b, c, d = veri['sonuclar']
+    assert b['musteri_mi'] is False and b['yanit']['belge']
+    # Kimliksiz yazıya yanıt üretilmez
+    assert c['musteri_mi'] is False and c['yanit'] is None
+    assert 'Desteklenmeyen' in d['hata']
+
+    kod, _, veri = istek(sunucu, '/saglik', yontem='GET')
+    assert kod == 200 and veri['musteri_sayisi'] == 1 and veri['islenen'] == 4
+
+
+@pytest.mark.parametrize('govde', [b'null', b'{bozuk', b'[]', json.dumps({'ad': 'a.pdf', 'icerik': '!'}).encode()])
+def test_gecersiz_istek_400(sunucu, govde):
+    kod, _, veri = istek(sunucu, '/yazi', govde)
+    assert kod == 400 and veri['hata']
+
+
+@pytest.mark.parametrize('govde', [b'null', b'{}', json.dumps({'yazilar': [{}] * (servis.AZAMI_TOPLU + 1)}).encode()])
+def test_gecersiz_toplu_istek_400(sunucu, govde):
+    kod, _, _ = istek(sunucu, '/toplu', govde)
+    assert kod == 400
+
+
+def test_buyuk_govde_413(sunucu, monkeypatch):
+    monkeypatch.setattr(servis, 'AZAMI_GOVDE', 16)
+    kod, _, veri = istek(sunucu, '/yazi', {'ad': 'a.txt', 'metin': 'x' * 100})
+    assert kod == 413 and veri['hata']
+
+
+def test_kuyruk_doluysa_503(sunucu):
+    # is_sayisi=1, kuyruk=0: tek yer tutulunca yeni istek beklemeden geri çevrilir
+    assert sunucu.yer.acquire(blocking=False)
+    try:
+        kod, basliklar, _ = istek(sunucu, '/yazi', {'ad': 'a.txt', 'metin': 'x'})
+    finally:
+        sunucu.yer.release()
+    assert kod == 503 and basliklar['Retry-After'] == '1'
+    assert sunucu.reddedilen == 1
+    kod, _, _ = istek(sunucu, '/yazi', {'ad': 'a.txt', 'metin': 'x'})
+    assert kod == 200
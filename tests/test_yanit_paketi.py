@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""YanitPaketi: yanıtlar, rapor ve paket manifestosu tek ZIP arşivinde"""
+
+import json
+import os
+import zipfile
+
+import pytest
+
+pytest.importorskip('docx')
+
+import motor  # noqa: E402
+from test_sablon import BILGILER, paragraflar, sablon_baytlari  # noqa: E402
+
+
+def sonuc(klasor, ad, musteri_mi=False):
+    yol = os.path.join(klasor, ad)
+    s = motor.sonuc_olustur(yol, dict(BILGILER, kimlikler=[
+        {'tur': 'tckn', 'kimlik': BILGILER['tckn'], 'adsoyad': BILGILER['adsoyad']}]), None)
+    s['musteri_mi'] = musteri_mi
+    return s
+
+
+def test_yanit_paketi(tmp_path):
+    yol = str(tmp_path / 'paket.zip')
+    sonuclar = [sonuc(str(tmp_path), 'a.txt'), sonuc(str(tmp_path), 'b.pdf'),
+                sonuc(str(tmp_path), 'c.docx', musteri_mi=True)]
+    paket = motor.YanitPaketi(yol)
+    for y in motor.toplu_yanit_olustur(sonuclar):
+        motor.yanit_kaydet_ve_isle(y, paket)
+    assert not os.path.exists(yol)
+    paket.kapat(sonuclar, [(str(tmp_path / 'bozuk.pdf'), 'okunamadı')])
+
+    assert os.path.exists(yol) and not os.path.exists(yol + '.tmp')
+    with zipfile.ZipFile(yol) as zf:
+        assert zf.testzip() is None
+        yanitlar = [b for b in zf.infolist() if b.filename.startswith('yanitlar/')]
+        assert len(yanitlar) == 2
+        # DOCX zaten sıkıştırılmış: yeniden sıkıştırılmadan saklanır
+        assert all(b.compress_type == zipfile.ZIP_STORED for b in yanitlar)
+        assert paragraflar(zf.read(yanitlar[0])) == paragraflar(sablon_baytlari(BILGILER, "Müşterimiz DEĞİL"))
+        satirlar = [json.loads(s) for s in zf.read('manifest.jsonl').decode('utf-8').splitlines()]
+        if motor.PANDAS_AVAILABLE:
+            assert 'rapor.xlsx' in zf.namelist()
+
+    assert [s['dosya'] for s in satirlar] == ['a.txt', 'b.pdf', 'c.docx', 'bozuk.pdf']
+    assert [s['yanit_durumu'] for s in satirlar[:3]] == [motor.DURUM_TAMAM, motor.DURUM_TAMAM, None]
+    assert satirlar[0]['yanit'] in {b.filename for b in yanitlar}
+    assert satirlar[3] == {'dosya': 'bozuk.pdf', 'analiz_durumu': motor.DURUM_HATA, 'hata': 'okunamadı'}
+    assert sonuclar[0]['cikti'] == os.path.join(yol, satirlar[0]['yanit'])
+
+
+def test_yanit_paketi_iptal(tmp_path):
+    yol = str(tmp_path / 'paket.zip')
+    paket = motor.YanitPaketi(yol)
+    paket.ekle(motor.yanit_olustur(sonuc(str(tmp_path), 'a.txt')))
+    paket.iptal()
+    assert not os.path.exists(yol) and not os.path.exists(yol + '.tmp')